@@ -0,0 +1,4 @@
+# birdie
+"""Golf club sensor ingestion, dashboard and mini-golf game."""
+
+__version__ = "0.2.0"
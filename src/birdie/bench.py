@@ -0,0 +1,350 @@
+# bench.py
+"""
+Benchmarks behind `birdie bench <name>`. Only the standard library is
+imported at module level; each benchmark imports its own dependencies.
+"""
+import contextlib
+import os
+import re
+import sys
+import time
+
+# Import-time budget for the ingestion-only server (`birdie serve`), measured
+# with `python -X importtime` as the cumulative time of the birdie modules it
+# loads. Measured at ~16 ms (mostly argparse, socket and json; importtime
+# itself inflates the numbers). pygame alone costs well over 100 ms, so the
+# budget leaves headroom for slower kiosk hardware but catches a heavy import.
+SERVE_IMPORT_BUDGET_MS = 40.0
+SERVE_IMPORTS = "import birdie.cli, birdie.server.sensor"
+# Modules that must never be pulled in by the ingestion-only path
+SERVE_FORBIDDEN_MODULES = ("pygame", "numpy", "flask", "flask_socketio", "eventlet")
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+def measure_import_time(statement):
+    """
+    Runs `statement` in a fresh interpreter under -X importtime.
+    Returns (cumulative_ms of top-level birdie imports, set of all imported module names).
+    """
+    import subprocess
+    env = dict(os.environ)
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = src_dir + os.pathsep + env.get('PYTHONPATH', '')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                          capture_output=True, text=True, env=env, check=True)
+    total_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_LINE.match(line)
+        if not m:
+            continue
+        cumulative_us, indent, name = int(m.group(2)), m.group(3), m.group(4)
+        modules.add(name.split('.')[0])
+        # Top-level entries are indented by exactly one space in the importtime output
+        if len(indent) <= 1 and name.startswith('birdie'):
+            total_us += cumulative_us
+    return total_us / 1000.0, modules
+
+
+def bench_imports(args):
+    runs = [measure_import_time(SERVE_IMPORTS) for _ in range(args.runs)]
+    best_ms = min(ms for ms, _ in runs)
+    modules = runs[0][1]
+    forbidden = sorted(m for m in SERVE_FORBIDDEN_MODULES if m in modules)
+
+    print(f"serve import time: {best_ms:.2f} ms (best of {args.runs}), budget {args.budget:.1f} ms")
+    if forbidden:
+        print(f"FAIL: ingestion server imports {', '.join(forbidden)}")
+        return 1
+    if best_ms > args.budget:
+        print("FAIL: over budget")
+        return 1
+    print("OK")
+    return 0
+
+
+def bench_detector(args):
+    import numpy as np
+    from birdie.server.recording import iter_recording
+    from birdie.game import shot_data
+    from birdie.game.fusion import MahonyFilter, mahony_batch
+
+    samples = [(t, data) for t, data in iter_recording(args.recording)]
+    if not samples:
+        print(f"No samples in {args.recording}")
+        return 1
+
+    # Full detector (fusion, baselines, swing state), one packet at a time as the game drains them
+    shot_data.reset_bias(use_cache=False)
+    shot_data.start_new_swing()
+    steps = [(data, shot_data._sample_dt(t, data)) for t, data in samples]
+    shots = 0
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for data, dt in steps:
+            if shot_data.process_sample(data, dt)[0]:
+                shots += 1
+        elapsed = time.perf_counter() - start
+    print(f"{len(samples)} samples in {elapsed * 1000:.1f} ms "
+          f"({elapsed / len(samples) * 1e6:.1f} us/sample), {shots} shots")
+
+    # Fusion alone: scalar filter vs. the batched NumPy variant over the same samples
+    gyro = np.radians([[d['gyroscope_rate'][k] for k in 'xyz'] for d, _ in steps])
+    accel = np.array([[d['accelerometer'][k] for k in 'xyz'] for d, _ in steps])
+    dts = np.array([dt for _, dt in steps])
+    fusion = MahonyFilter()
+    rows = list(zip(gyro.tolist(), accel.tolist(), dts.tolist()))
+    start = time.perf_counter()
+    for (gx, gy, gz), (ax, ay, az), dt in rows:
+        fusion.update(gx, gy, gz, ax, ay, az, dt)
+    scalar = time.perf_counter() - start
+    batch = args.batch
+    start = time.perf_counter()
+    mahony_batch(np.broadcast_to(gyro, (batch,) + gyro.shape), np.broadcast_to(accel, (batch,) + accel.shape), dts)
+    batched = time.perf_counter() - start
+    print(f"fusion: {scalar / len(rows) * 1e6:.2f} us/sample scalar, "
+          f"{batched / (len(rows) * batch) * 1e6:.2f} us/sample batched over {batch} recordings")
+    return 0
+
+
+def reference_impacts(times, accel, min_rise_g=0.8, span_s=0.01, min_gap_s=1.0):
+    """
+    Impact times estimated offline (non-causally) from a recording: the first
+    sample of each burst where |a| rises by `min_rise_g` within `span_s`.
+    times: (N,) seconds; accel: (N, 3) in g.
+    """
+    import numpy as np
+    mag = np.linalg.norm(accel, axis=1)
+    ahead = np.minimum(np.searchsorted(times, times + span_s, side='right') - 1, len(times) - 1)
+    impacts = []
+    for i in np.flatnonzero(mag[ahead] - mag >= min_rise_g):
+        t = float(times[i])
+        if not impacts or t - impacts[-1] >= min_gap_s:
+            impacts.append(t)
+    return impacts
+
+
+def match_triggers(triggers, impacts, early_s, late_s):
+    """Pairs each impact with the first trigger in [impact - early_s, impact + late_s]. Returns (latencies, false, missed)."""
+    latencies = []
+    used = set()
+    for impact in impacts:
+        for j, t in enumerate(triggers):
+            if j not in used and impact - early_s <= t <= impact + late_s:
+                used.add(j)
+                latencies.append(t - impact)
+                break
+    return latencies, len(triggers) - len(used), len(impacts) - len(latencies)
+
+
+def bench_impact(args):
+    """Shot latency and false triggers of the impact detector, with and without the spectral burst
+    check, vs. the settle-only fallback."""
+    import json
+    import numpy as np
+    from birdie.server.recording import iter_recording
+    from birdie.game import shot_data
+
+    samples = list(iter_recording(args.recording))
+    if not samples:
+        print(f"No samples in {args.recording}")
+        return 1
+    t0 = samples[0][0]
+    times = np.array([t - t0 for t, _ in samples])
+    if args.impacts:
+        with open(args.impacts, 'r') as f:
+            impacts = [float(t) for t in json.load(f)]
+        source = args.impacts
+    else:
+        accel = np.array([[d['accelerometer'][k] for k in 'xyz'] for _, d in samples])
+        impacts = reference_impacts(times, accel, args.ref_rise)
+        source = f"offline, |a| rising {args.ref_rise:g} g in 10 ms"
+    minutes = (times[-1] - times[0]) / 60.0
+    print(f"{len(samples)} samples, {len(impacts)} reference impacts ({source})")
+
+    saved = shot_data.IMPACT_DETECTION, shot_data.SPECTRAL_ANALYSIS
+    try:
+        for label, impact, spectral in (("settle only", False, False), ("impact", True, False),
+                                        ("+ spectral", True, True)):
+            shot_data.IMPACT_DETECTION, shot_data.SPECTRAL_ANALYSIS = impact, spectral
+            triggers, kinds = [], {}
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                shot_data.reset_bias(use_cache=False)
+                shot_data._spectrum = None
+                shot_data.start_new_swing()
+                for (t, data), rel in zip(samples, times):
+                    judged = shot_data.last_mishit
+                    if shot_data.process_sample(data, shot_data._sample_dt(t, data))[0]:
+                        triggers.append(rel)
+                        kinds[shot_data.last_trigger] = kinds.get(shot_data.last_trigger, 0) + 1
+                        shot_data.start_new_swing()
+                    elif shot_data.last_mishit and judged is None:
+                        kinds['mis-hit'] = kinds.get('mis-hit', 0) + 1
+            latencies, false, missed = match_triggers(triggers, impacts, args.early, args.late)
+            lat = np.array(latencies) * 1000.0
+            lat_text = (f"latency median {np.median(lat):.0f} ms, p90 {np.percentile(lat, 90):.0f} ms, "
+                        f"max {lat.max():.0f} ms") if len(lat) else "no hits"
+            print(f"  {label:<12} {len(latencies)}/{len(impacts)} hit, {missed} missed, "
+                  f"{false} false ({false / max(minutes, 1e-9):.1f}/min); {lat_text}; "
+                  + ", ".join(f"{k} {v}" for k, v in sorted(kinds.items())))
+    finally:
+        shot_data.IMPACT_DETECTION, shot_data.SPECTRAL_ANALYSIS = saved
+    return 0
+
+
+def bench_jitter(args):
+    """Replays a recording through a JitterBuffer over a simulated bad link, pulled at the game's frame rate."""
+    import random
+    import numpy as np
+    from birdie.server.recording import iter_recording
+    from birdie.server.jitter import JitterBuffer
+
+    samples = [data for _, data in iter_recording(args.recording)]
+    if not samples or not isinstance(samples[0].get('t_us'), int):
+        print(f"No samples with seq/t_us in {args.recording}")
+        return 1
+    rng = random.Random(args.seed)
+    t_src = np.array([((d['t_us'] - samples[0]['t_us']) % (1 << 32)) / 1e6 for d in samples])
+    truth = np.array([[d['accelerometer'][k] for k in 'xyz'] for d in samples])
+
+    # Arrival = send time + exponential jitter, with occasional bursts (Wi-Fi retries) and losses
+    arrivals = []
+    for t, data in zip(t_src, samples):
+        if rng.random() < args.loss:
+            continue
+        delay = rng.expovariate(1000.0 / args.jitter_ms) if args.jitter_ms > 0 else 0.0
+        if rng.random() < args.burst:
+            delay += args.burst_ms / 1000.0
+        arrivals.append((t + delay, data))
+    arrivals.sort(key=lambda a: a[0])
+
+    buffer = JitterBuffer('bench', rate_hz=args.rate)
+    times, values, delays = [], [], []
+    pull_s = 0.0
+    j = 0
+    frame = 1.0 / args.fps
+    for f in range(int((arrivals[-1][0] + 1.0) / frame)):
+        now = f * frame
+        while j < len(arrivals) and arrivals[j][0] <= now:
+            buffer.push(*reversed(arrivals[j]))
+            j += 1
+        start = time.perf_counter()
+        ts, vals = buffer.pull(now)
+        pull_s += time.perf_counter() - start
+        times.append(ts)
+        values.append(vals)
+        delays.append(buffer.delay_s)
+    times = np.concatenate(times)
+    values = np.concatenate(values)
+    spacing = np.diff(times)
+    error = values[:, 0:3] - np.column_stack([np.interp(times, t_src, truth[:, c]) for c in range(3)])
+    delays = np.array(delays) * 1000.0
+
+    print(f"{len(samples)} packets, {len(samples) - len(arrivals)} dropped, jitter ~{args.jitter_ms:g} ms, "
+          f"{args.burst:.1%} bursts of {args.burst_ms:g} ms")
+    print(f"  out: {len(times)} samples at {args.rate:g} Hz, spacing {spacing.min() * 1000:.3f}-"
+          f"{spacing.max() * 1000:.3f} ms; error vs. clean stream RMS {np.sqrt(np.mean(error ** 2)):.4f} g, "
+          f"max {np.abs(error).max():.3f} g")
+    print(f"  added delay median {np.median(delays):.0f} ms, p95 {np.percentile(delays, 95):.0f} ms; "
+          + ", ".join(f"{k} {v}" for k, v in buffer.stats().items() if k != 'delay_s'))
+    print(f"  pull cost {pull_s / max(1, len(times)) * 1e6:.2f} us/sample")
+    return 0
+
+
+def bench_dashboard(args):
+    """
+    Server-side cost and bytes per client of the dashboard stream as DashboardBridge sends it:
+    the `sensor_data` / `processed_data` JSON pair per emit tick vs. binary `sample_frame`s.
+    """
+    import json
+    import math
+    from birdie.server.dashboard import BINARY_ROOM, JSON_ROOM, DashboardBridge
+    from birdie.server.ring import FRAME_HEADER
+
+    n = int(args.rate * args.seconds)
+    packets = [{"accelerometer": {"x": 0.01 * math.sin(i * 0.01), "y": 0.02, "z": 1.0 + 0.1 * math.sin(i * 0.003)},
+                "gyroscope_rate": {"x": math.cos(i * 0.02), "y": 0.5, "z": -0.25}, "temperature": 30.0}
+               for i in range(n)]
+    per_tick = max(1, int(round(args.rate / args.emit_hz)))
+
+    class BenchSocketIO:
+        """Stands in for Flask-SocketIO: each sleep() delivers one tick of packets, each emit() is encoded and counted."""
+        def __init__(self):
+            self.bridge = None
+            self.sent = 0
+            self.bytes = {JSON_ROOM: 0, BINARY_ROOM: 0}
+            self.samples = {JSON_ROOM: 0, BINARY_ROOM: 0}
+
+        def sleep(self, _seconds):
+            batch = packets[self.sent:self.sent + per_tick]
+            if not batch:
+                self.bridge.stop()
+            for packet in batch:
+                self.bridge(packet)
+            self.sent += len(batch)
+
+        def emit(self, event, payload, to=None):
+            if isinstance(payload, (bytes, bytearray)):
+                # Binary event: a placeholder packet plus the attachment
+                size = len(f'451-["{event}",{{"_placeholder":true,"num":0}}]') + len(payload)
+                self.samples[to] += FRAME_HEADER.unpack_from(payload)[3]
+            else:
+                size = 2 + len(json.dumps([event, payload]))   # Socket.IO '42' event prefix
+                if event == 'sensor_data':
+                    self.samples[to] += 1
+            for room in ((to,) if to else self.bytes):
+                self.bytes[room] += size
+
+    print(f"{n} samples at {args.rate:.0f} Hz, emit ticks at {args.emit_hz:.0f} Hz")
+    for name, room in (("json", JSON_ROOM), ("binary", BINARY_ROOM)):
+        socketio = BenchSocketIO()
+        bridge = socketio.bridge = DashboardBridge(socketio, args.emit_hz)
+        if room == BINARY_ROOM:
+            bridge.binary_clients.add('bench')
+        bridge._running = True
+        cpu = time.process_time()
+        bridge._emit_loop()
+        cpu_s = time.process_time() - cpu
+        print(f"  {name:<7} {socketio.bytes[room] / args.seconds / 1024:8.1f} KiB/s per client   "
+              f"{socketio.samples[room] / args.seconds:6.0f} samples/s delivered   "
+              f"{cpu_s / args.seconds * 100:5.1f}% of one core (ingest + emit)")
+    return 0
+
+
+def register_benchmarks(subparsers):
+    p = subparsers.add_parser('imports', help="Check the import-time budget of `birdie serve`")
+    p.add_argument('--budget', type=float, default=SERVE_IMPORT_BUDGET_MS, help="Budget in ms")
+    p.add_argument('--runs', type=int, default=5)
+    p.set_defaults(bench_func=bench_imports)
+
+    p = subparsers.add_parser('detector', help="Per-sample cost of the shot detector over a recording")
+    p.add_argument('recording')
+    p.add_argument('--batch', type=int, default=64, help="Recordings fused at once by the NumPy variant")
+    p.set_defaults(bench_func=bench_detector)
+
+    p = subparsers.add_parser('impact', help="Swing-to-shot latency and false triggers on a recording")
+    p.add_argument('recording')
+    p.add_argument('--impacts', help="JSON list of true impact times (s from the first sample); "
+                                     "estimated offline from the accelerometer if omitted")
+    p.add_argument('--ref-rise', type=float, default=0.8, help="Rise of |a| within 10 ms marking an impact offline (g)")
+    p.add_argument('--early', type=float, default=0.05, help="Trigger may precede the impact by this much (s)")
+    p.add_argument('--late', type=float, default=0.6, help="Trigger may follow the impact by this much (s)")
+    p.set_defaults(bench_func=bench_impact)
+
+    p = subparsers.add_parser('jitter', help="Jitter buffer latency, underruns and resampling error on a recording")
+    p.add_argument('recording')
+    p.add_argument('--rate', type=float, default=100.0, help="Resample rate in Hz")
+    p.add_argument('--fps', type=float, default=60.0, help="Game frames per second pulling from the buffer")
+    p.add_argument('--jitter-ms', type=float, default=8.0, help="Mean extra transit delay")
+    p.add_argument('--loss', type=float, default=0.02, help="Fraction of packets dropped")
+    p.add_argument('--burst', type=float, default=0.005, help="Fraction of packets delayed by --burst-ms")
+    p.add_argument('--burst-ms', type=float, default=100.0)
+    p.add_argument('--seed', type=int, default=0)
+    p.set_defaults(bench_func=bench_jitter)
+
+    p = subparsers.add_parser('dashboard', help="Dashboard stream per client: JSON events vs. binary frames, bytes/s and CPU")
+    p.add_argument('--rate', type=float, default=1000.0, help="Sensor rate in Hz")
+    p.add_argument('--seconds', type=float, default=10.0)
+    p.add_argument('--emit-hz', type=float, default=20.0)
+    p.set_defaults(bench_func=bench_dashboard)
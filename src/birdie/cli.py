@@ -0,0 +1,367 @@
+# cli.py
+"""
+Command line entry point: `birdie <command>`.
+
+Each subcommand imports what it needs inside its handler so that, e.g.,
+`birdie serve` never pays for pygame or numpy.
+"""
+import argparse
+import os
+import sys
+import time
+
+
+def _make_server(args):
+    from birdie.server.sensor import SensorServer
+    if getattr(args, 'metrics_port', 0):
+        from birdie.server.metrics import start_metrics_server
+        start_metrics_server(args.metrics_port)
+    return SensorServer(host=args.host, port=args.port, device=getattr(args, 'device', None),
+                        forward_to=_parse_addr(getattr(args, 'venue', None), 50000))
+
+
+def _parse_addr(value, default_port):
+    """'host[:port]' -> (host, port), or None for an empty value."""
+    if not value:
+        return None
+    host, _, port = value.partition(':')
+    return host, int(port or default_port)
+
+
+def _wait_until_interrupted(duration=None):
+    deadline = time.time() + duration if duration else None
+    try:
+        while deadline is None or time.time() < deadline:
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        pass
+
+
+def cmd_serve(args):
+    """Receive sensor packets; with --dashboard also serve the web dashboard."""
+    server = _make_server(args)
+    server.start()
+    try:
+        if args.dashboard:
+            from birdie.server.dashboard import create_dashboard
+            kwargs = {'session_dir': args.sessions} if args.sessions else {}
+            kwargs['spectator_port'] = args.spectator_port
+            app, socketio, bridge = create_dashboard(server, **kwargs)
+            print(f"[DASHBOARD] http://localhost:{args.http_port}")
+            socketio.run(app, host=args.host, port=args.http_port, allow_unsafe_werkzeug=True)
+            bridge.stop()
+        else:
+            _wait_until_interrupted()
+    finally:
+        server.stop()
+
+
+def cmd_play(args):
+    server = _make_server(args)
+    recorder = None
+    if args.record:
+        from birdie.server.recording import Recorder
+        recorder = Recorder(args.record)
+        server.add_listener(recorder)
+    server.start()
+    try:
+        from birdie.game.game import Game
+        Game(server, spectator_addr=_parse_addr(args.broadcast, 50003), recorder=recorder).run()
+    finally:
+        server.stop()
+        if recorder is not None:
+            recorder.close()
+            print(f"[RECORD] {recorder.count} samples recorded to {args.record}.")
+
+
+def cmd_record(args):
+    from birdie.server.recording import Recorder
+    server = _make_server(args)
+    recorder = Recorder(args.output)
+    server.add_listener(recorder)
+    server.start()
+    print(f"[RECORD] Writing samples to {args.output} (Ctrl-C to stop)")
+    try:
+        _wait_until_interrupted(args.duration)
+    finally:
+        server.stop()
+        recorder.close()
+        print(f"[RECORD] {recorder.count} samples recorded.")
+
+
+def cmd_replay(args):
+    from birdie.server.recording import replay_recording
+    sent = replay_recording(args.recording, host=args.host, port=args.port, speed=args.speed)
+    print(f"[REPLAY] Sent {sent} packets to {args.host}:{args.port}")
+
+
+def cmd_archive(args):
+    from birdie.server.archive import convert_recording
+    output = args.output or os.path.splitext(args.recording)[0] + '.brda'
+    count = convert_recording(args.recording, output)
+    src_size, dst_size = os.path.getsize(args.recording), os.path.getsize(output)
+    print(f"[ARCHIVE] {count} samples -> {output} "
+          f"({dst_size / 1024:.1f} KiB, {src_size / max(1, dst_size):.1f}x smaller)")
+
+
+def cmd_train(args):
+    """Fits the swing classifier to the triggers of labelled recordings (<recording>.labels.json)."""
+    import numpy as np
+    from birdie.game.classifier import CLASSES, collect_swings, cross_validate, load_labels, save_model, train
+    from birdie.game.shot_data import SWING_FEATURES, SWING_MODEL_PATH
+
+    if args.labels and len(args.recordings) > 1:
+        print("--labels only applies to a single recording")
+        return 1
+    vectors, labels = [], []
+    for recording in args.recordings:
+        events = load_labels(args.labels or recording + '.labels.json')
+        x, y = collect_swings(recording, events, args.early, args.late)
+        print(f"[TRAIN] {recording}: {len(events)} labelled events, {len(x)} triggers")
+        vectors.extend(x)
+        labels.extend(y)
+    classes = list(CLASSES) + sorted(set(labels) - set(CLASSES))
+    present = [c for c in classes if c in labels]
+    if len(present) < 2:
+        print(f"Need triggers of at least two classes to train, got {present or 'none'}")
+        return 1
+    x = np.array(vectors)
+    y = np.array([classes.index(label) for label in labels])
+    options = {'epochs': args.epochs, 'l2': args.l2}
+    print("[TRAIN] triggers per class: " + ", ".join(f"{c} {labels.count(c)}" for c in classes))
+    if len(x) >= 2 * args.folds:
+        print(f"[TRAIN] {args.folds}-fold accuracy {cross_validate(x, y, classes, SWING_FEATURES, args.folds, **options):.1%}")
+    model = train(x, y, classes, SWING_FEATURES, **options)
+    accuracy = float(np.mean(np.argmax(model.predict_proba(x), axis=1) == y))
+    output = args.output or SWING_MODEL_PATH
+    save_model(model, output)
+    print(f"[TRAIN] training accuracy {accuracy:.1%}; model written to {output}")
+
+
+def cmd_corpus(args):
+    """Converts labelled JSON-lines recordings to corpus entries (.npy sample arrays with labels)."""
+    from birdie.corpus import labels_path, recording_to_array, save_entry
+    from birdie.game.classifier import load_labels
+
+    os.makedirs(args.output, exist_ok=True)
+    for recording in args.recordings:
+        events = load_labels(labels_path(recording))
+        samples = recording_to_array(recording)
+        path = os.path.join(args.output, os.path.splitext(os.path.basename(recording))[0] + '.npy')
+        save_entry(samples, events, path)
+        print(f"[CORPUS] {recording}: {len(samples)} samples, {len(events)} labelled swings -> {path}")
+
+
+def cmd_eval(args):
+    """Replays a labelled corpus through the detector and scores its shots."""
+    import json
+    from birdie.corpus import evaluate, summarize
+
+    start = time.perf_counter()
+    results = evaluate(args.paths, args.early, args.late, use_model=not args.no_model, jobs=args.jobs)
+    wall = time.perf_counter() - start
+    if not results:
+        print("No corpus entries found")
+        return 1
+    s = summarize(results)
+    minutes = sum(r['duration_s'] for r in results) / 60.0
+    print(f"[EVAL] {s['entries']} entries, {s['samples']} samples ({minutes:.1f} min) in {wall:.1f} s "
+          f"({s['samples'] / max(s['elapsed_s'], 1e-9) / 1000:.0f}k samples/s per process)")
+    print(f"  precision {s['precision']:.1%}, recall {s['recall']:.1%}: {s['hits']}/{s['strikes']} strikes, "
+          f"{s['false']} false ({s['unmatched']} unlabelled, {s['false_per_min']:.1f}/min)")
+    print("  fired: " + ", ".join(f"{label} {n}/{total}" for label, (n, total) in s['fired'].items()))
+    if s['latency_ms']:
+        lat = s['latency_ms']
+        print(f"  latency median {round(lat['median'])} ms, p90 {round(lat['p90'])} ms, "
+              f"p99 {round(lat['p99'])} ms, max {round(lat['max'])} ms; {s['early']} fired before the strike")
+    if s['power_error']:
+        err = s['power_error']
+        print(f"  power error mean abs {err['mae']:.3f}, bias {err['bias']:+.3f}, p90 {err['p90']:.3f}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"summary": s, "entries": results}, f, indent=1)
+
+
+def cmd_sweep(args):
+    """Searches detector thresholds on a labelled corpus; writes the latency / false-shot Pareto front as configs."""
+    import json
+    import math
+    import tempfile
+    from birdie.game.config import CONFIG
+    from birdie.sweep import MAX_GRID_SETS, SWEEP_SPACE, candidates, pareto_front, parse_param, prepare_entries, sweep
+
+    try:
+        space = dict(parse_param(p) for p in args.param) if args.param else dict(SWEEP_SPACE)
+    except ValueError as e:
+        print(f"--param: {e}")
+        return 1
+    unknown = sorted(key for key in space if key not in CONFIG)
+    if unknown:
+        print(f"Not config keys: {', '.join(unknown)}")
+        return 1
+    if not args.samples:
+        size = math.prod(args.steps if isinstance(spec, tuple) else len(spec) for spec in space.values())
+        if size > MAX_GRID_SETS:
+            print(f"The grid has {size} parameter sets (limit {MAX_GRID_SETS}): search fewer --param keys "
+                  f"or draw --samples at random")
+            return 1
+    base = dict(CONFIG)
+    sets = candidates(space, base, args.samples, args.steps, args.seed)
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix='birdie-sweep-') as tmp:
+        entries = prepare_entries(args.paths, tmp)
+        if not entries:
+            print("No corpus entries found")
+            return 1
+        print(f"[SWEEP] {len(sets)} parameter sets over {len(entries)} entries...")
+        summaries = sweep(entries, sets, base, args.early, args.late, not args.no_model, args.jobs)
+    print(f"[SWEEP] done in {time.perf_counter() - start:.1f} s")
+
+    eligible = [i for i, s in enumerate(summaries) if s['recall'] >= args.min_recall and s['timing_error_ms']]
+    # Ranked on |latency|: firing before contact is as wrong as firing after it, not faster
+    points = [(summaries[i]['timing_error_ms'][args.latency], summaries[i]['false_per_min']) for i in eligible]
+    front = [eligible[k] for k in pareto_front(points)]
+    os.makedirs(args.output, exist_ok=True)
+    with open(os.path.join(args.output, 'sweep.json'), 'w') as f:
+        json.dump({"space": space, "latency": args.latency, "min_recall": args.min_recall,
+                   "results": [{"params": p, "summary": s, "front": i in front}
+                               for i, (p, s) in enumerate(zip(sets, summaries))]}, f, indent=1)
+
+    def describe(s):
+        lat = f"{s['timing_error_ms'][args.latency]:.0f} ms" if s['timing_error_ms'] else "-"
+        return (f"{args.latency} |latency| {lat:>6}, {s['early']} early, {s['false_per_min']:5.1f} false/min, "
+                f"recall {s['recall']:.1%}, precision {s['precision']:.1%}")
+
+    print(f"  current config: {describe(summaries[0])}")
+    if not front:
+        print(f"  no parameter set reached recall {args.min_recall:.0%}")
+        return 1
+    print(f"  Pareto front ({len(front)} of {len(eligible)} sets with recall >= {args.min_recall:.0%}):")
+    for rank, i in enumerate(front, 1):
+        path = os.path.join(args.output, f"config-{rank}.json")
+        with open(path, 'w') as f:
+            json.dump(dict(base, **sets[i]), f, indent=2)
+        print(f"  {path}: {describe(summaries[i])}")
+        print("      " + (" ".join(f"{k}={v}" for k, v in sets[i].items()) or "(current config)"))
+    print(f"  all results in {os.path.join(args.output, 'sweep.json')}; use one with `birdie --config`")
+
+
+def cmd_bench(args):
+    return args.bench_func(args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='birdie', description="Birdie golf club sensor tools.")
+    parser.add_argument('--config', help="Path to a config.json overriding the packaged one")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add_net_args(p, host):
+        p.add_argument('--host', default=host)
+        p.add_argument('--port', type=int, default=50000)
+
+    def add_metrics_arg(p):
+        p.add_argument('--metrics-port', type=int, default=0,
+                       help="Serve Prometheus metrics at http://0.0.0.0:PORT/metrics (0 = off)")
+
+    p = sub.add_parser('serve', help="Run the UDP ingestion server (optionally with the dashboard)")
+    add_net_args(p, '0.0.0.0')
+    p.add_argument('--dashboard', action='store_true', help="Also serve the web dashboard")
+    p.add_argument('--http-port', type=int, default=8080)
+    p.add_argument('--sessions', help="Directory of recordings served by /api/sessions "
+                                      "(default: session_dir from the config)")
+    p.add_argument('--spectator-port', type=int, default=50003,
+                   help="UDP port for game snapshots relayed to /spectate (with --dashboard)")
+    add_metrics_arg(p)
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser('play', help="Run the game with the sensor server")
+    add_net_args(p, '0.0.0.0')
+    add_metrics_arg(p)
+    p.add_argument('--device', help="Only use this club (its MAC, or IP for older firmware)")
+    p.add_argument('--venue', metavar='HOST[:PORT]',
+                   help="Relay this bay's club and game status to a venue server (birdie serve --dashboard)")
+    p.add_argument('--broadcast', metavar='HOST[:PORT]',
+                   help="Send spectator snapshots to a dashboard server (default port 50003)")
+    p.add_argument('--record', metavar='FILE',
+                   help="Also record the session's samples; each stored shot notes its place in the file")
+    p.set_defaults(func=cmd_play)
+
+    p = sub.add_parser('record', help="Record incoming sensor packets to a JSON-lines file")
+    add_net_args(p, '0.0.0.0')
+    p.add_argument('output')
+    p.add_argument('--duration', type=float, default=None, help="Stop after this many seconds")
+    p.set_defaults(func=cmd_record)
+
+    p = sub.add_parser('replay', help="Re-send a recording over UDP")
+    add_net_args(p, '127.0.0.1')
+    p.add_argument('recording')
+    p.add_argument('--speed', type=float, default=1.0, help="Playback speed; 0 sends as fast as possible")
+    p.set_defaults(func=cmd_replay)
+
+    p = sub.add_parser('archive', help="Convert a JSON-lines recording to a compressed .brda archive")
+    p.add_argument('recording')
+    p.add_argument('output', nargs='?', help="Defaults to the recording name with .brda")
+    p.set_defaults(func=cmd_archive)
+
+    p = sub.add_parser('train', help="Train the swing classifier from labelled recordings")
+    p.add_argument('recordings', nargs='+', help="JSON-lines recordings, each with <recording>.labels.json")
+    p.add_argument('--labels', help="Labels file, if not next to a single recording")
+    p.add_argument('--output', help="Model path (default: swing_model_path from the config)")
+    p.add_argument('--epochs', type=int, default=3000)
+    p.add_argument('--l2', type=float, default=1e-3, help="Weight decay")
+    p.add_argument('--folds', type=int, default=5, help="Cross-validation folds reported before training")
+    p.add_argument('--early', type=float, default=0.05, help="Trigger may precede its event by this much (s)")
+    p.add_argument('--late', type=float, default=0.6, help="Trigger may follow its event by this much (s)")
+    p.set_defaults(func=cmd_train)
+
+    p = sub.add_parser('corpus', help="Convert labelled recordings to corpus entries for `birdie eval`")
+    p.add_argument('recordings', nargs='+', help="JSON-lines recordings, each with <recording>.labels.json")
+    p.add_argument('--output', '-o', default='.', help="Directory the .npy entries are written to")
+    p.set_defaults(func=cmd_corpus)
+
+    p = sub.add_parser('eval', help="Score the shot detector on a labelled corpus")
+    p.add_argument('paths', nargs='+', help="Corpus directories, .npy entries or labelled JSON-lines recordings")
+    p.add_argument('--early', type=float, default=0.05, help="Shot may precede its strike by this much (s)")
+    p.add_argument('--late', type=float, default=0.6, help="Shot may follow its strike by this much (s)")
+    p.add_argument('--jobs', '-j', type=int, default=0, help="Worker processes (default: one per CPU)")
+    p.add_argument('--no-model', action='store_true', help="Don't gate shots with the swing classifier")
+    p.add_argument('--json', help="Also write the summary and per-entry results here")
+    p.set_defaults(func=cmd_eval)
+
+    p = sub.add_parser('sweep', help="Tune detector thresholds on a labelled corpus (latency vs. false shots)")
+    p.add_argument('paths', nargs='+', help="Corpus directories, .npy entries or labelled JSON-lines recordings")
+    p.add_argument('--param', action='append', metavar='KEY=LO:HI|KEY=A,B,..',
+                   help="Config key to search, over a range or a list of values (repeatable); "
+                        "default: the detector thresholds in birdie.sweep.SWEEP_SPACE")
+    p.add_argument('--samples', type=int, default=64, help="Random parameter sets to try; 0 searches the full grid")
+    p.add_argument('--steps', type=int, default=3, help="Grid points across each LO:HI range (with --samples 0)")
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--min-recall', type=float, default=0.95, help="Sets that miss more strikes are left off the front")
+    p.add_argument('--latency', choices=('median', 'p90', 'p99', 'max'), default='p90',
+                   help="Statistic of |latency| traded against false shots")
+    p.add_argument('--early', type=float, default=0.05, help="Shot may precede its strike by this much (s)")
+    p.add_argument('--late', type=float, default=0.6, help="Shot may follow its strike by this much (s)")
+    p.add_argument('--jobs', '-j', type=int, default=0, help="Worker processes (default: one per CPU)")
+    p.add_argument('--no-model', action='store_true', help="Don't gate shots with the swing classifier")
+    p.add_argument('--output', '-o', default='sweep', help="Directory for config-N.json and sweep.json")
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser('bench', help="Performance benchmarks")
+    bench_sub = p.add_subparsers(dest='bench', required=True)
+    from birdie.bench import register_benchmarks
+    register_benchmarks(bench_sub)
+    p.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.config:
+        # Read by birdie.game.config at import time, which the handlers trigger lazily
+        os.environ['BIRDIE_CONFIG'] = os.path.abspath(args.config)
+    return args.func(args) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
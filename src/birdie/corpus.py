@@ -0,0 +1,239 @@
+# corpus.py
+"""
+Labelled swing corpus and the offline evaluation behind `birdie eval`.
+
+A corpus entry is a raw sample array saved with NumPy, `<name>.npy`, of
+shape (N, 7) and dtype float64, one row per packet:
+
+    t, ax, ay, az, gx, gy, gz
+
+t is seconds from the first sample (the club's t_us clock when the packets
+carry it), acceleration is in g and the gyro rate is as the club sent it.
+Next to it is the labels sidecar the classifier trains from,
+`<name>.npy.labels.json`: one {"t", "label", "power"} per swing, where t is
+the strike time. Swings labelled with one of `shot_classes` should fire a
+shot; any other label (a practice swing, a waggle) should not. `power` is
+the intended shot power, 0..1, and may be left out. JSON-lines recordings
+with a sidecar can be evaluated as they are, or converted with `birdie corpus`.
+
+Evaluation replays each array through the detector as fast as it runs:
+straight into shot_data's per-sample path from the memory-mapped array,
+without packets, sockets or sleeps, with recordings spread over a process pool.
+The samples are first resampled to `jitter_resample_hz` as the jitter buffer
+does in play (birdie.server.jitter.resample), so thresholds and the swing
+classifier are tuned at the rate the detector runs at live.
+"""
+import contextlib
+import glob
+import json
+import os
+import time
+
+import numpy as np
+
+COLUMNS = ('t', 'ax', 'ay', 'az', 'gx', 'gy', 'gz')
+LABELS_SUFFIX = '.labels.json'
+
+
+def labels_path(path):
+    return path + LABELS_SUFFIX
+
+
+def recording_to_array(recording):
+    """(N, 7) sample array of a JSON-lines recording; malformed packets are skipped."""
+    from birdie.server.recording import iter_recording
+    rows = []
+    t0 = last_t_us = None
+    clock = 0.0
+    for t, data in iter_recording(recording):
+        try:
+            accel = data['accelerometer']
+            gyro = data.get('gyroscope_rate')
+            if not isinstance(gyro, dict):
+                gyro = data['gyroscope']
+            values = [float(accel[k]) for k in 'xyz'] + [float(gyro.get(k, 0.0)) for k in 'xyz']
+        except (KeyError, TypeError, ValueError):
+            continue
+        t_us = data.get('t_us')
+        if isinstance(t_us, int):
+            if last_t_us is not None:
+                clock += ((t_us - last_t_us) & 0xFFFFFFFF) / 1e6
+            last_t_us = t_us
+        else:
+            t0 = t if t0 is None else t0
+            clock = t - t0
+        rows.append([clock] + values)
+    return np.array(rows, dtype=float).reshape(-1, len(COLUMNS))
+
+
+def save_entry(samples, events, path):
+    """Writes a corpus entry: `path` (.npy) and its labels sidecar."""
+    np.save(path, np.asarray(samples, dtype=float))
+    with open(labels_path(path), 'w') as f:
+        json.dump([{"t": t, "label": label, **({} if power is None else {"power": power})}
+                   for t, label, power in events], f, indent=0)
+
+
+def load_entry(path):
+    """(samples, events) of a corpus entry or a labelled JSON-lines recording. Arrays are memory-mapped."""
+    from birdie.game.classifier import load_labels
+    if path.endswith('.npy'):
+        samples = np.load(path, mmap_mode='r')
+    else:
+        samples = recording_to_array(path)
+    return samples, load_labels(labels_path(path))
+
+
+def find_entries(paths):
+    """Corpus entries named by `paths`: files as given, directories expanded to their labelled files."""
+    entries = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(glob.glob(os.path.join(path, '*' + LABELS_SUFFIX))):
+                entries.append(name[:-len(LABELS_SUFFIX)])
+        else:
+            entries.append(path)
+    return entries
+
+
+def replay(samples, features=False):
+    """
+    Runs a sample array through the detector at the live rate, restarting the swing after every
+    shot as `birdie bench impact` does. Returns the shots as [(t, power)], or with `features`
+    [(t, power, swing feature vector)].
+    """
+    from birdie.game import shot_data
+    from birdie.server.jitter import RESAMPLE_HZ, resample
+
+    samples = np.asarray(samples, dtype=float)
+    times, values = resample(samples[:, 0], samples[:, 1:7], RESAMPLE_HZ)
+    if shot_data.GYRO_RATE_IS_RAD_PER_S:
+        values[:, 3:6] = np.degrees(values[:, 3:6])
+    dt = 1.0 / RESAMPLE_HZ
+    process = shot_data._process
+    shots = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        shot_data.reset_bias(use_cache=False)
+        shot_data._spectrum = None
+        shot_data.start_new_swing()
+        for t, (ax, ay, az, gx, gy, gz) in zip(times.tolist(), values.tolist()):
+            fired, _, power = process(ax, ay, az, (gx, gy, gz), dt, None, None)
+            if fired:
+                shots.append((t, power, shot_data.last_swing_features) if features else (t, power))
+                shot_data.start_new_swing()
+    return shots
+
+
+def score(samples, events, early_s=0.05, late_s=0.6):
+    """Replays a sample array and scores its shots against the labelled events. Returns a JSON-ready dict."""
+    from birdie.game import shot_data
+    from birdie.game.classifier import match_events
+
+    start = time.perf_counter()
+    shots = replay(samples) if len(samples) else []
+    elapsed = time.perf_counter() - start
+
+    latencies, power_errors, fired = [], [], {}
+    unmatched = 0
+    for (t, power), i in zip(shots, match_events([t for t, _ in shots], events, early_s, late_s)):
+        if i is None:
+            unmatched += 1
+            continue
+        t_event, label, target = events[i]
+        fired[label] = fired.get(label, 0) + 1
+        if label in shot_data.SHOT_CLASSES:
+            latencies.append(t - t_event)
+            if target is not None:
+                power_errors.append(power - target)
+    labels = {}
+    for _, label, _ in events:
+        labels[label] = labels.get(label, 0) + 1
+    return {
+        "samples": int(len(samples)),
+        "duration_s": float(samples[-1, 0] - samples[0, 0]) if len(samples) else 0.0,
+        "elapsed_s": elapsed,
+        "strikes": sum(n for label, n in labels.items() if label in shot_data.SHOT_CLASSES),
+        "hits": len(latencies),
+        "false": len(shots) - len(latencies),
+        "unmatched": unmatched,
+        "labels": labels,
+        "fired": fired,
+        "latencies_s": latencies,
+        "power_errors": power_errors,
+    }
+
+
+def evaluate_entry(path, early_s=0.05, late_s=0.6, use_model=True):
+    """score() of one corpus entry, optionally with the swing classifier off."""
+    from birdie.game import shot_data
+
+    samples, events = load_entry(path)
+    saved = None if use_model else shot_data.set_swing_model(None)
+    try:
+        result = score(samples, events, early_s, late_s)
+    finally:
+        if not use_model:
+            shot_data.set_swing_model(saved)
+    return {"path": path, **result}
+
+
+def _evaluate_task(task):
+    return evaluate_entry(*task)
+
+
+def evaluate(paths, early_s=0.05, late_s=0.6, use_model=True, jobs=None):
+    """evaluate_entry over every entry, on `jobs` worker processes (default: one per CPU)."""
+    tasks = [(path, early_s, late_s, use_model) for path in find_entries(paths)]
+    jobs = min(len(tasks), jobs or os.cpu_count() or 1)
+    if jobs <= 1:
+        return [_evaluate_task(task) for task in tasks]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(jobs) as pool:
+        return list(pool.map(_evaluate_task, tasks))
+
+
+def summarize(results):
+    """
+    Totals over evaluate_entry results: precision/recall, latency percentiles and power error.
+    Latency is signed (negative: the shot fired before the labelled strike); `timing_error_ms`
+    has the same percentiles of its magnitude, so an early shot never ranks as a fast one.
+    """
+    hits = sum(r['hits'] for r in results)
+    false = sum(r['false'] for r in results)
+    strikes = sum(r['strikes'] for r in results)
+    minutes = sum(r['duration_s'] for r in results) / 60.0
+    latencies = np.array([x for r in results for x in r['latencies_s']]) * 1000.0
+    power_errors = np.array([x for r in results for x in r['power_errors']])
+    labels, fired = {}, {}
+    for r in results:
+        for label, n in r['labels'].items():
+            labels[label] = labels.get(label, 0) + n
+        for label, n in r['fired'].items():
+            fired[label] = fired.get(label, 0) + n
+    summary = {
+        "entries": len(results),
+        "samples": sum(r['samples'] for r in results),
+        "elapsed_s": sum(r['elapsed_s'] for r in results),
+        "strikes": strikes,
+        "hits": hits,
+        "false": false,
+        "unmatched": sum(r['unmatched'] for r in results),
+        "false_per_min": false / minutes if minutes > 0 else 0.0,
+        "precision": hits / (hits + false) if hits + false else 1.0,
+        "recall": hits / strikes if strikes else 1.0,
+        "fired": {label: [fired.get(label, 0), n] for label, n in sorted(labels.items())},
+        "early": int(np.count_nonzero(latencies < 0.0)),
+        "latency_ms": None,
+        "timing_error_ms": None,
+        "power_error": None,
+    }
+    if len(latencies):
+        summary["latency_ms"] = {"median": float(np.median(latencies)), "p90": float(np.percentile(latencies, 90)),
+                                 "p99": float(np.percentile(latencies, 99)), "max": float(latencies.max())}
+        errors = np.abs(latencies)
+        summary["timing_error_ms"] = {"median": float(np.median(errors)), "p90": float(np.percentile(errors, 90)),
+                                      "p99": float(np.percentile(errors, 99)), "max": float(errors.max())}
+    if len(power_errors):
+        summary["power_error"] = {"mae": float(np.mean(np.abs(power_errors))), "bias": float(np.mean(power_errors)),
+                                  "p90": float(np.percentile(np.abs(power_errors), 90))}
+    return summary
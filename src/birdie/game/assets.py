@@ -0,0 +1,141 @@
+# assets.py
+import os
+import pygame
+from .config import CONFIG
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+
+# Logical asset name -> (file name, default draw size)
+ASSET_SPECS = {
+    'hole': ('hole.png', (36, 36)),
+    'flag': ('flag.png', (30, 64)),
+}
+
+ATLAS_PAGE_SIZE = 512
+ATLAS_MAX_SPRITE = int(CONFIG.get('atlas_max_sprite', 128))  # larger images stay standalone
+
+# --- Colors for procedural fallbacks ---
+HOLE_RIM = (20, 20, 20)
+HOLE_INNER = (0, 0, 0)
+FLAG_POLE = (230, 230, 230)
+FLAG_CLOTH = (220, 30, 30)
+
+
+def _draw_hole(size):
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    r = min(size) // 2
+    pygame.draw.circle(surf, HOLE_RIM, (size[0] // 2, size[1] // 2), r)
+    pygame.draw.circle(surf, HOLE_INNER, (size[0] // 2, size[1] // 2), max(1, r - 3))
+    return surf
+
+
+def _draw_flag(size):
+    w, h = size
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    pole_x = w // 4
+    pygame.draw.line(surf, FLAG_POLE, (pole_x, 0), (pole_x, h), 3)
+    pygame.draw.polygon(surf, FLAG_CLOTH, [(pole_x + 2, 2), (w - 1, h // 6), (pole_x + 2, h // 3)])
+    return surf
+
+
+# Used when an image file is missing so enhanced mode still works out of the box
+FALLBACK_RENDERERS = {
+    'hole': _draw_hole,
+    'flag': _draw_flag,
+}
+
+
+class SpriteAtlas:
+    """Packs small surfaces into shared pages using a simple shelf packer."""
+    def __init__(self, page_size=ATLAS_PAGE_SIZE):
+        self.page_size = page_size
+        self.pages = []
+        self._shelf_x = 0
+        self._shelf_y = 0
+        self._shelf_h = 0
+
+    def _new_page(self):
+        page = pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA).convert_alpha()
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self._shelf_x = self._shelf_y = self._shelf_h = 0
+
+    def add(self, surface: pygame.Surface) -> pygame.Surface:
+        """Copies the surface into the atlas and returns a subsurface view of it."""
+        w, h = surface.get_size()
+        if not self.pages:
+            self._new_page()
+        if self._shelf_x + w > self.page_size:
+            self._shelf_x = 0
+            self._shelf_y += self._shelf_h
+            self._shelf_h = 0
+        if self._shelf_y + h > self.page_size:
+            self._new_page()
+
+        page = self.pages[-1]
+        rect = pygame.Rect(self._shelf_x, self._shelf_y, w, h)
+        page.blit(surface, rect)
+        self._shelf_x += w
+        self._shelf_h = max(self._shelf_h, h)
+        return page.subsurface(rect)
+
+
+class AssetManager:
+    """
+    Lazily loads images, converts them to the display format once, and caches
+    pre-scaled variants. Small sprites live in a shared atlas. Requires the
+    display mode to be set before the first load.
+    """
+    def __init__(self, asset_dir=ASSET_DIR):
+        self.asset_dir = asset_dir
+        self.atlas = SpriteAtlas()
+        self._originals = {}   # name -> converted surface at native size
+        self._variants = {}    # (name, size) -> converted, scaled surface
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    def get(self, name, size=None) -> pygame.Surface:
+        """Returns the named asset at `size` (or its default size), loading it on first use."""
+        if size is None:
+            size = ASSET_SPECS.get(name, (None, None))[1]
+        key = (name, tuple(size) if size else None)
+        surf = self._variants.get(key)
+        if surf is None:
+            surf = self._load(name)
+            if size and surf.get_size() != tuple(size):
+                surf = pygame.transform.smoothscale(surf, size)
+            if max(surf.get_size()) <= ATLAS_MAX_SPRITE:
+                surf = self.atlas.add(surf)
+            self._variants[key] = surf
+        return surf
+
+    def preload(self, names):
+        """Loads only the given assets, e.g. the ones a level declares."""
+        for name in names:
+            self.get(name)
+
+    def clear(self):
+        self._originals.clear()
+        self._variants.clear()
+        self.atlas = SpriteAtlas()
+
+    def _load(self, name) -> pygame.Surface:
+        surf = self._originals.get(name)
+        if surf is not None:
+            return surf
+
+        filename, size = ASSET_SPECS.get(name, (f"{name}.png", None))
+        path = os.path.join(self.asset_dir, filename)
+        if os.path.exists(path):
+            raw = pygame.image.load(path)
+            # convert() drops per-pixel alpha, so only use it for opaque images
+            has_alpha = raw.get_flags() & pygame.SRCALPHA or raw.get_colorkey() is not None
+            surf = raw.convert_alpha() if has_alpha else raw.convert()
+        elif name in FALLBACK_RENDERERS:
+            surf = FALLBACK_RENDERERS[name](size).convert_alpha()
+        else:
+            raise KeyError(f"Unknown asset '{name}' (no file at {path})")
+
+        self._originals[name] = surf
+        return surf
@@ -1,6 +1,6 @@
 # ball.py
 import pygame
-from config import CONFIG # Import the config object
+from .config import CONFIG # Import the config object
 
 # --- Colors for Simple Mode ---
 BALL_WHITE = (255, 255, 255)
@@ -32,14 +32,14 @@ class Ball:
                     else: self.vel.y *= -1
         self.rect.center = self.pos
 
-    def draw(self, surface: pygame.Surface, is_active: bool):
-        """Draws the ball. If inactive, it's semi-transparent."""
+    def draw(self, surface: pygame.Surface, is_active: bool, offset=(0, 0)):
+        """Draws the ball, shifted by the camera offset. If inactive, it's semi-transparent."""
         if not is_active:
             temp_surf = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
             pygame.draw.circle(temp_surf, (*self.color, 128), (self.radius, self.radius), self.radius)
-            surface.blit(temp_surf, self.rect.topleft)
+            surface.blit(temp_surf, self.rect.move(-offset[0], -offset[1]).topleft)
         else:
-            pygame.draw.circle(surface, self.color, self.pos, self.radius)
+            pygame.draw.circle(surface, self.color, self.pos - pygame.Vector2(offset), self.radius)
 
     def shoot(self, velocity: pygame.Vector2):
         self.vel = velocity
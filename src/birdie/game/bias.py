@@ -0,0 +1,105 @@
+# bias.py
+"""
+Continuous per-device gyro bias estimation, cached on disk so a club that
+was calibrated recently (at a similar temperature) is ready at once.
+
+While the club is steady, the estimate is a running mean of the gyro rate
+until BIAS_MAX_SAMPLES samples, then an exponential average with time
+constant BIAS_TIME_CONSTANT_S that follows slow drift. The cache is a JSON
+object keyed by device id:
+
+    {"<device>": {"bias_dps": [x, y, z], "temperature": C, "saved": unix time, "samples": n}}
+"""
+import json
+import math
+import os
+import time
+
+from .config import CONFIG
+
+BIAS_MAX_SAMPLES = int(CONFIG.get('bias_max_samples', 60))
+BIAS_GYRO_STEADY_DPS = float(CONFIG.get('bias_gyro_steady_dps', 3.0))
+BIAS_ACCEL_STEADY_G = float(CONFIG.get('bias_accel_steady_g', 0.12))
+BIAS_TIME_CONSTANT_S = float(CONFIG.get('bias_time_constant_s', 5.0))
+BIAS_CACHE_PATH = os.path.expanduser(CONFIG.get('bias_cache_path', '~/.cache/birdie/bias.json'))
+# A cached bias is only trusted this long and this close to the temperature it was measured at
+BIAS_CACHE_MAX_AGE_S = float(CONFIG.get('bias_cache_max_age_s', 7 * 24 * 3600))
+BIAS_CACHE_MAX_TEMP_DELTA_C = float(CONFIG.get('bias_cache_max_temp_delta_c', 5.0))
+BIAS_SAVE_INTERVAL_S = float(CONFIG.get('bias_save_interval_s', 30.0))
+
+
+def load_bias_cache(path=BIAS_CACHE_PATH):
+    try:
+        with open(path, 'r') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_bias_cache(cache, path=BIAS_CACHE_PATH):
+    """Writes the cache atomically (temp file + rename) so a crash can't leave it half-written."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(cache, f, indent=1)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[WARNING] Could not save gyro bias cache: {e}")
+
+
+class GyroBiasEstimator:
+    """Bias of one club's gyro in deg/s, per axis."""
+    def __init__(self, device=None):
+        self.device = device
+        self.bias_dps = (0.0, 0.0, 0.0)
+        self.samples = 0
+        self.temperature = None   # last reading from the club, stored with the bias
+        self.warm = False      # started from the disk cache
+
+    @property
+    def ready(self):
+        return self.warm or self.samples >= BIAS_MAX_SAMPLES
+
+    def update(self, gyro_dps, hp_mag, dt_s):
+        """Feeds one raw gyro sample; only steady samples (club at rest) move the estimate."""
+        bx, by, bz = self.bias_dps
+        gx, gy, gz = gyro_dps
+        dx, dy, dz = gx - bx, gy - by, gz - bz
+        # Before the first estimate the residual is the whole rate, so judge steadiness on that
+        if math.sqrt(dx * dx + dy * dy + dz * dz) > BIAS_GYRO_STEADY_DPS or abs(hp_mag) > BIAS_ACCEL_STEADY_G:
+            return
+        self.samples += 1
+        if self.ready:
+            k = 1.0 - math.exp(-dt_s / BIAS_TIME_CONSTANT_S) if dt_s > 0 else 0.0
+        else:
+            k = 1.0 / self.samples
+        self.bias_dps = (bx + k * dx, by + k * dy, bz + k * dz)
+
+    def warm_start(self, entry, temperature=None, now=None):
+        """Adopts a cache entry if it is recent and was measured near `temperature`. Returns True if used."""
+        now = time.time() if now is None else now
+        try:
+            bias = tuple(float(v) for v in entry['bias_dps'])
+            age = now - float(entry['saved'])
+            cached_temp = entry.get('temperature')
+            cached_temp = None if cached_temp is None else float(cached_temp)
+        except (KeyError, TypeError, ValueError):
+            return False
+        if len(bias) != 3 or not 0 <= age <= BIAS_CACHE_MAX_AGE_S:
+            return False
+        if temperature is not None and cached_temp is not None \
+                and abs(temperature - cached_temp) > BIAS_CACHE_MAX_TEMP_DELTA_C:
+            return False
+        self.bias_dps = bias
+        self.warm = True
+        return True
+
+    def entry(self, now=None):
+        return {
+            "bias_dps": list(self.bias_dps),
+            "temperature": self.temperature,
+            "saved": time.time() if now is None else now,
+            "samples": self.samples,
+        }
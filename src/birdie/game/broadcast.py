@@ -0,0 +1,109 @@
+# broadcast.py
+"""
+Spectator snapshots of the running game, sent over UDP (localhost by
+default) to the server, which relays them to browsers (server/spectator.py).
+
+A snapshot is a flat list of ints (see Game.snapshot_values). Frames are:
+
+    b'BG' u8 kind u16 seq, then LEB128 varints
+    keyframe (kind 1): n, then n zigzag values
+    delta    (kind 2): k, then k pairs of (index gap, zigzag change) against frame seq - 1
+
+A keyframe goes out every KEYFRAME_INTERVAL_S and whenever the layout
+changes (new hole, player count), so late joiners and lost packets resync.
+"""
+import socket
+import struct
+import time
+
+from .config import CONFIG
+
+BROADCAST_HZ = float(CONFIG.get('spectator_hz', 30.0))
+KEYFRAME_INTERVAL_S = float(CONFIG.get('spectator_keyframe_s', 2.0))
+
+FRAME_MAGIC = b'BG'
+FRAME_HEADER = struct.Struct('<2sBH')
+KEYFRAME = 1
+DELTA = 2
+
+# Positions are sent in quarter pixels, angles in milliradians, power in 1/1000
+POS_SCALE = 4
+ANGLE_SCALE = 1000
+POWER_SCALE = 1000
+
+GAME_STATES = {'START_MENU': 0, 'PLAYING': 1, 'SCORE_SCREEN': 2}
+
+
+def _varint(out, z):
+    while z >= 0x80:
+        out.append((z & 0x7F) | 0x80)
+        z >>= 7
+    out.append(z)
+
+
+def _zigzag(v):
+    return (v << 1) if v >= 0 else ((-v << 1) - 1)
+
+
+def encode_keyframe(seq, values):
+    out = bytearray(FRAME_HEADER.pack(FRAME_MAGIC, KEYFRAME, seq & 0xFFFF))
+    _varint(out, len(values))
+    for v in values:
+        _varint(out, _zigzag(v))
+    return bytes(out)
+
+
+def encode_delta(seq, previous, values):
+    """Returns the delta frame, or None when nothing changed."""
+    changes = [(i, v - p) for i, (p, v) in enumerate(zip(previous, values)) if v != p]
+    if not changes:
+        return None
+    out = bytearray(FRAME_HEADER.pack(FRAME_MAGIC, DELTA, seq & 0xFFFF))
+    _varint(out, len(changes))
+    last = -1
+    for i, d in changes:
+        _varint(out, i - last - 1)
+        _varint(out, _zigzag(d))
+        last = i
+    return bytes(out)
+
+
+class SpectatorBroadcaster:
+    """Sends keyframes and deltas of the game snapshot to `addr` at BROADCAST_HZ."""
+    def __init__(self, addr, hz=BROADCAST_HZ):
+        self.addr = addr
+        self.period = 1.0 / hz
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.seq = 0
+        self.bytes_sent = 0
+        self._previous = None
+        self._next_send = 0.0
+        self._last_keyframe = 0.0
+
+    def publish(self, values, now=None):
+        """Call every frame; sends at most once per period."""
+        now = time.time() if now is None else now
+        if now < self._next_send:
+            return
+        # Fixed cadence rather than "period since last send", which aliases against the frame rate;
+        # after a stall, skip ahead instead of bursting
+        self._next_send = max(self._next_send + self.period, now)
+        if (self._previous is None or len(values) != len(self._previous)
+                or now - self._last_keyframe >= KEYFRAME_INTERVAL_S):
+            frame = encode_keyframe(self.seq, values)
+            self._last_keyframe = now
+        else:
+            frame = encode_delta(self.seq, self._previous, values)
+            if frame is None:
+                return
+        self._previous = values
+        self.seq += 1
+        try:
+            self.sock.sendto(frame, self.addr)
+            self.bytes_sent += len(frame)
+        except OSError:
+            pass   # nobody listening / buffer full; the next keyframe resyncs
+
+    def close(self):
+        self.sock.close()
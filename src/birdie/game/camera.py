@@ -0,0 +1,51 @@
+# camera.py
+import pygame
+
+# Fraction of the remaining distance covered per second while following
+CAMERA_FOLLOW_SPEED = 6.0
+# Closer than this to its target the camera snaps there and counts as settled
+CAMERA_SETTLE_PX = 0.5
+
+
+class Camera:
+    """A viewport into a level that follows a target and stays inside the level bounds."""
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.offset = pygame.Vector2(0, 0)   # world position of the screen's top-left corner
+        self.world_rect = pygame.Rect(0, 0, width, height)
+
+    @property
+    def view_rect(self) -> pygame.Rect:
+        return pygame.Rect(int(self.offset.x), int(self.offset.y), self.width, self.height)
+
+    def set_world(self, world_rect: pygame.Rect):
+        self.world_rect = pygame.Rect(world_rect)
+
+    def _target_offset(self, pos):
+        x = pos[0] - self.width / 2
+        y = pos[1] - self.height / 2
+        x = max(self.world_rect.left, min(x, self.world_rect.right - self.width))
+        y = max(self.world_rect.top, min(y, self.world_rect.bottom - self.height))
+        return pygame.Vector2(x, y)
+
+    def snap_to(self, pos):
+        self.offset = self._target_offset(pos)
+
+    def follow(self, pos, dt):
+        """Eases toward centering `pos`, framerate-independently."""
+        alpha = min(CAMERA_FOLLOW_SPEED * dt, 1.0)
+        target = self._target_offset(pos)
+        self.offset = self.offset.lerp(target, alpha)
+        if self.offset.distance_to(target) < CAMERA_SETTLE_PX:
+            self.offset = target
+
+    def is_settled(self, pos) -> bool:
+        """True once following `pos` would no longer move the view."""
+        return self.offset.distance_to(self._target_offset(pos)) < CAMERA_SETTLE_PX
+
+    def to_screen(self, pos) -> pygame.Vector2:
+        return pygame.Vector2(pos) - pygame.Vector2(int(self.offset.x), int(self.offset.y))
+
+    def to_world(self, pos) -> pygame.Vector2:
+        return pygame.Vector2(pos) + pygame.Vector2(int(self.offset.x), int(self.offset.y))
@@ -0,0 +1,187 @@
+# classifier.py
+"""
+Swing classifier: tells real strokes from practice swings and waggles when
+the detector triggers, so only strokes fire a ball.
+
+The model is multinomial logistic regression over the fixed feature vector
+the detector builds at each trigger (shot_data.swing_feature_vector):
+standardize, one (classes x features) product, softmax. It is trained
+offline by `birdie train` from recordings with a labels sidecar,
+`<recording>.labels.json`:
+
+    [{"t": seconds from the first sample, "label": "putt", "power": 0.6}, ...]
+
+`power` (the intended shot power, 0..1) is optional. A trigger takes the
+label of the event it matches (see match_events); triggers that match no
+event are labelled UNLABELLED_CLASS. The model file is JSON:
+
+    {"classes": [...], "features": [...], "mean": [...], "scale": [...],
+     "weights": [[...] per class], "bias": [...], "trained": {...}}
+"""
+import json
+import os
+
+import numpy as np
+
+CLASSES = ('putt', 'chip', 'practice', 'waggle')
+UNLABELLED_CLASS = 'waggle'
+
+
+class SwingClassifier:
+    def __init__(self, classes, features, mean, scale, weights, bias, trained=None):
+        self.classes = tuple(classes)
+        self.features = tuple(features)
+        self.mean = np.asarray(mean, dtype=float)
+        self.scale = np.asarray(scale, dtype=float)
+        self.weights = np.asarray(weights, dtype=float)   # (classes, features)
+        self.bias = np.asarray(bias, dtype=float)
+        self.trained = trained or {}
+        n_features = (len(self.features),)
+        if self.weights.shape != (len(self.classes), len(self.features)) or self.mean.shape != n_features \
+                or self.scale.shape != n_features or self.bias.shape != (len(self.classes),):
+            raise ValueError("swing model arrays don't match its classes and features")
+        # Standardization folded into the weights: z = x @ _w.T + _b
+        self._w = self.weights / self.scale
+        self._b = self.bias - self._w @ self.mean
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['classes'], d['features'], d['mean'], d['scale'], d['weights'], d['bias'], d.get('trained'))
+
+    def to_dict(self):
+        return {
+            "classes": list(self.classes),
+            "features": list(self.features),
+            "mean": self.mean.tolist(),
+            "scale": self.scale.tolist(),
+            "weights": self.weights.tolist(),
+            "bias": self.bias.tolist(),
+            "trained": self.trained,
+        }
+
+    def predict_proba(self, x):
+        """Class probabilities for one feature vector (features,) or a batch (n, features)."""
+        z = np.asarray(x, dtype=float) @ self._w.T + self._b
+        z = np.exp(z - z.max(axis=-1, keepdims=True))
+        return z / z.sum(axis=-1, keepdims=True)
+
+    def classify(self, x):
+        """(label, confidence) for one feature vector."""
+        p = self.predict_proba(x)
+        i = int(np.argmax(p))
+        return self.classes[i], float(p[i])
+
+
+def load_model(path):
+    """The model at `path`, or None if there is none (a damaged file is reported, not raised)."""
+    try:
+        with open(path, 'r') as f:
+            return SwingClassifier.from_dict(json.load(f))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"[WARNING] Ignoring swing model {path}: {e}")
+        return None
+
+
+def save_model(model, path):
+    """Writes the model atomically (temp file + rename)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(model.to_dict(), f, indent=1)
+    os.replace(tmp, path)
+
+
+def train(x, y, classes, features, epochs=3000, learning_rate=0.5, l2=1e-3):
+    """
+    Fits softmax regression by full-batch gradient descent on standardized features.
+    `y` holds class indices. Classes are weighted by inverse frequency so rare ones still count.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=int)
+    n, k = len(x), len(classes)
+    mean = x.mean(axis=0)
+    scale = x.std(axis=0)
+    scale[scale < 1e-9] = 1.0
+    xs = (x - mean) / scale
+    onehot = np.zeros((n, k))
+    onehot[np.arange(n), y] = 1.0
+    counts = onehot.sum(axis=0)
+    sample_weight = (n / (k * np.maximum(counts, 1.0)))[y] / n
+
+    weights = np.zeros((k, x.shape[1]))
+    bias = np.zeros(k)
+    for _ in range(epochs):
+        z = xs @ weights.T + bias
+        p = np.exp(z - z.max(axis=1, keepdims=True))
+        p /= p.sum(axis=1, keepdims=True)
+        g = (p - onehot) * sample_weight[:, None]
+        weights -= learning_rate * (g.T @ xs + l2 * weights)
+        bias -= learning_rate * g.sum(axis=0)
+    return SwingClassifier(classes, features, mean, scale, weights, bias,
+                           trained={"samples": int(n), "per_class": {c: int(m) for c, m in zip(classes, counts)}})
+
+
+def cross_validate(x, y, classes, features, folds=5, seed=0, **train_args):
+    """Accuracy of `train` on held-out folds."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=int)
+    order = np.random.default_rng(seed).permutation(len(x))
+    correct = 0
+    for fold in np.array_split(order, folds):
+        held = np.zeros(len(x), dtype=bool)
+        held[fold] = True
+        if held.all() or not held.any():
+            continue
+        model = train(x[~held], y[~held], classes, features, **train_args)
+        correct += int(np.sum(np.argmax(model.predict_proba(x[held]), axis=1) == y[held]))
+    return correct / max(1, len(x))
+
+
+def load_labels(path):
+    """Events of a labels sidecar as [(t, label, power or None)], sorted by time."""
+    with open(path, 'r') as f:
+        entries = json.load(f)
+    events = []
+    for e in entries:
+        power = e.get('power')
+        events.append((float(e['t']), str(e['label']), None if power is None else float(power)))
+    return sorted(events)
+
+
+def match_events(triggers, events, early_s, late_s):
+    """
+    Pairs each trigger time with the first unmatched event it may belong to: one at most `late_s`
+    before it or `early_s` after it. Returns, per trigger, the event's index or None.
+    """
+    matched, used = [], set()
+    for t in triggers:
+        hit = None
+        for i, (te, _, _) in enumerate(events):
+            if i not in used and -early_s <= t - te <= late_s:
+                hit = i
+                break
+        if hit is not None:
+            used.add(hit)
+        matched.append(hit)
+    return matched
+
+
+def collect_swings(recording, events, early_s=0.05, late_s=0.6):
+    """
+    Replays a recording through the detector with the classifier off, at the rate it runs
+    at live (see corpus.replay), and returns (feature vectors, labels) of every trigger.
+    """
+    from birdie.corpus import recording_to_array, replay
+    from birdie.game import shot_data
+
+    samples = recording_to_array(recording)
+    saved = shot_data.set_swing_model(None)
+    try:
+        shots = replay(samples, features=True) if len(samples) else []
+    finally:
+        shot_data.set_swing_model(saved)
+    triggers = [t for t, _, _ in shots]
+    vectors = [vector for _, _, vector in shots]
+    labels = [UNLABELLED_CLASS if i is None else events[i][1] for i in match_events(triggers, events, early_s, late_s)]
+    return vectors, labels
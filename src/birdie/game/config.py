@@ -0,0 +1,127 @@
+# config.py
+import json
+import os
+
+# Resolved next to this module so the game works from any working directory.
+# BIRDIE_CONFIG (set by `birdie --config`) points at an alternative file.
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+
+DEFAULT_CONFIG = {
+    "manual_sensitivity": 1.0,
+    "socket_max_power": 800,
+    "simulator_angle_cycle_seconds": 10.0,
+    "simulator_power_cycle_seconds": 3.0,
+    "friction": 0.992,
+    "graphics_mode": "simple",
+
+    # ===== Idle rendering =====
+    "idle_fps": 4.0,
+    "idle_after_s": 1.0,
+    "idle_aim_threshold_deg": 0.5,
+    "idle_power_threshold": 0.01,
+
+    # ===== Sensitivity and IMU controls =====
+    "aim_axis": "x",
+    "gyro_rate_is_rad_per_s": False,
+    "aim_deadzone_dps": 4.0,
+    "aim_wrap_deg": 180.0,
+    "aim_gain": 5.73,
+    "aim_prediction": True,
+    "aim_rate_time_constant_s": 0.03,
+    "aim_base_latency_s": 0.01,
+    "aim_predict_max_s": 0.15,
+    "aim_predict_max_deg": 12.0,
+    'power_yaw_axis': 'y',
+
+    "bias_max_samples": 60,
+    "bias_gyro_steady_dps": 3.0,
+    "bias_accel_steady_g": 0.12,
+    "bias_time_constant_s": 5.0,
+    "bias_cache_path": "~/.cache/birdie/bias.json",
+    "bias_cache_max_age_s": 604800,
+    "bias_cache_max_temp_delta_c": 5.0,
+    "bias_save_interval_s": 30.0,
+
+    "jitter_resample_hz": 100.0,
+    "jitter_min_delay_s": 0.01,
+    "jitter_max_delay_s": 0.25,
+    "jitter_decay_s": 5.0,
+    "jitter_max_gap_s": 0.5,
+
+    "accel_baseline_alpha": 0.10,
+    "mag_baseline_alpha": 0.10,
+    "alpha_reference_hz": 60.0,
+
+    "fusion_kp": 1.0,
+    "fusion_ki": 0.0,
+    "fusion_accel_trust_g": 0.15,
+
+    "accel_swing_axis": "y",
+    "swing_down_trig_axis_g": -0.35,
+    "swing_down_trig_mag_g": -0.25,
+    "swing_end_threshold_g": 0.12,
+    "swing_max_window_s": 0.50,
+    "swing_holdoff_s": 0.3,
+    "impact_detection": True,
+    "impact_window_s": 0.03,
+    "impact_rise_g": 0.6,
+    "impact_cross_rise_g": 0.3,
+    "impact_min_depth_g": 0.35,
+    "impact_min_armed_s": 0.03,
+    "swing_feature_window_s": 0.5,
+    "spectral_analysis": "auto",
+    "spectral_min_top_bins": 4,
+    "spectral_window_s": 0.032,
+    "spectral_hop_s": 0.004,
+    "spectral_bands_hz": [[1.0, 10.0], [10.0, 40.0], [40.0, 500.0]],
+    "spectral_impact_g": 0.3,
+    "mishit_axis": "x",
+    "mishit_twist_dps_per_g": 100.0,
+    "mishit_delay_s": 0.025,
+    "swing_model_path": "~/.config/birdie/swing_model.json",
+    "shot_classes": ["putt", "chip"],
+    "swing_min_confidence": 0.6,
+
+    "power_peak_min_g": 0.25,
+    "power_peak_max_g": 1.80,
+    "power_smoothing_alpha": 0.25,
+    "snap_power_on_shoot": True,
+
+    # ===== Dashboard =====
+    "dashboard_emit_hz": 20.0,
+    "dashboard_swing_accel_g": 0.5,
+    "dashboard_swing_gyro_dps": 150.0,
+    "dashboard_swing_hold_s": 1.0,
+    "dashboard_rolling_window_s": 2.0,
+    "session_dir": "~/birdie-sessions",
+
+    # ===== Venue (multi-bay) =====
+    "venue_summary_hz": 2.0,
+    "venue_status_interval_s": 2.0,
+    "bays": {},
+
+    # ===== Spectators =====
+    "spectator_hz": 30.0,
+    "spectator_keyframe_s": 2.0,
+
+    # ===== Shot history =====
+    "shot_db_path": "~/.birdie/shots.sqlite",
+}
+
+def load_config(filepath: str) -> dict:
+    """
+    Loads the configuration from a JSON file.
+    Returns default settings if the file is missing or invalid.
+    """
+    try:
+        with open(filepath, 'r') as f:
+            user_config = json.load(f)
+            config = DEFAULT_CONFIG.copy()
+            config.update(user_config)
+            return config
+    except (FileNotFoundError, json.JSONDecodeError):
+        print(f"INFO: '{filepath}' not found or invalid. Using default settings.")
+        return DEFAULT_CONFIG
+
+# Load the configuration once when the module is imported
+CONFIG = load_config(os.environ.get('BIRDIE_CONFIG', DEFAULT_CONFIG_PATH))
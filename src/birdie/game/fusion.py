@@ -0,0 +1,165 @@
+# fusion.py
+"""
+Mahony orientation filter: gyro integration with a proportional-integral
+correction toward gravity measured by the accelerometer.
+
+`MahonyFilter.update` is plain float arithmetic on slots (no vectors or
+containers per call), so the per-sample cost is fixed and small enough for
+1 kHz streams. `mahony_batch` runs the same recursion over many recordings
+at once with NumPy, vectorized across recordings, for replays and sweeps.
+
+Quaternions are (w, x, y, z), rotating body-frame vectors into the world
+frame; gyro rates are rad/s in the body frame, accel in any unit.
+"""
+import math
+
+import numpy as np
+
+from .config import CONFIG
+
+FUSION_KP = float(CONFIG.get('fusion_kp', 1.0))
+FUSION_KI = float(CONFIG.get('fusion_ki', 0.0))
+# Only trust the accelerometer as a gravity reference when |a| is this close to 1 g
+FUSION_ACCEL_TRUST_G = float(CONFIG.get('fusion_accel_trust_g', 0.15))
+
+_AXIS_INDEX = {'x': 1, 'y': 2, 'z': 3}
+
+
+def quat_from_accel(ax, ay, az):
+    """Orientation with zero heading whose gravity direction matches the accelerometer."""
+    roll = math.atan2(ay, az)
+    pitch = math.atan2(-ax, math.sqrt(ay * ay + az * az))
+    cr, sr = math.cos(roll * 0.5), math.sin(roll * 0.5)
+    cp, sp = math.cos(pitch * 0.5), math.sin(pitch * 0.5)
+    return cr * cp, sr * cp, cr * sp, -sr * sp
+
+
+def twist_deg(q, ref, axis):
+    """
+    Rotation in degrees about body `axis` ('x', 'y' or 'z') from orientation
+    `ref` to `q` (both (w, x, y, z)): the twist part of conj(ref) * q.
+    """
+    w0, x0, y0, z0 = ref
+    w1, x1, y1, z1 = q
+    # conj(ref) * q
+    w = w0 * w1 + x0 * x1 + y0 * y1 + z0 * z1
+    i = _AXIS_INDEX[axis]
+    if i == 1:
+        v = w0 * x1 - x0 * w1 - y0 * z1 + z0 * y1
+    elif i == 2:
+        v = w0 * y1 + x0 * z1 - y0 * w1 - z0 * x1
+    else:
+        v = w0 * z1 - x0 * y1 + y0 * x1 - z0 * w1
+    angle = math.degrees(2.0 * math.atan2(v, w))
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+class MahonyFilter:
+    __slots__ = ('kp', 'ki', 'trust_g', 'q0', 'q1', 'q2', 'q3', 'ix', 'iy', 'iz', 'initialized')
+
+    def __init__(self, kp=FUSION_KP, ki=FUSION_KI, trust_g=FUSION_ACCEL_TRUST_G):
+        self.kp = kp
+        self.ki = ki
+        self.trust_g = trust_g
+        self.reset()
+
+    def reset(self):
+        self.q0, self.q1, self.q2, self.q3 = 1.0, 0.0, 0.0, 0.0
+        self.ix = self.iy = self.iz = 0.0   # integral feedback (rad/s), i.e. the gyro bias estimate
+        self.initialized = False
+
+    @property
+    def quaternion(self):
+        return self.q0, self.q1, self.q2, self.q3
+
+    def update(self, gx, gy, gz, ax, ay, az, dt):
+        """Advances the orientation by one sample. Gyro in rad/s, accel in g."""
+        norm = math.sqrt(ax * ax + ay * ay + az * az)
+        if not self.initialized:
+            if norm > 0.0:
+                self.q0, self.q1, self.q2, self.q3 = quat_from_accel(ax, ay, az)
+                self.initialized = True
+            return
+        q0, q1, q2, q3 = self.q0, self.q1, self.q2, self.q3
+
+        if norm > 0.0 and abs(norm - 1.0) <= self.trust_g:
+            ax /= norm
+            ay /= norm
+            az /= norm
+            # Gravity direction predicted by the current orientation, in the body frame
+            vx = 2.0 * (q1 * q3 - q0 * q2)
+            vy = 2.0 * (q0 * q1 + q2 * q3)
+            vz = q0 * q0 - q1 * q1 - q2 * q2 + q3 * q3
+            # Error is the cross product between measured and predicted gravity
+            ex = ay * vz - az * vy
+            ey = az * vx - ax * vz
+            ez = ax * vy - ay * vx
+            if self.ki > 0.0:
+                self.ix += self.ki * ex * dt
+                self.iy += self.ki * ey * dt
+                self.iz += self.ki * ez * dt
+            gx += self.kp * ex
+            gy += self.kp * ey
+            gz += self.kp * ez
+        gx += self.ix
+        gy += self.iy
+        gz += self.iz
+
+        h = 0.5 * dt
+        gx *= h
+        gy *= h
+        gz *= h
+        n0 = q0 - q1 * gx - q2 * gy - q3 * gz
+        n1 = q1 + q0 * gx + q2 * gz - q3 * gy
+        n2 = q2 + q0 * gy - q1 * gz + q3 * gx
+        n3 = q3 + q0 * gz + q1 * gy - q2 * gx
+        inv = 1.0 / math.sqrt(n0 * n0 + n1 * n1 + n2 * n2 + n3 * n3)
+        self.q0, self.q1, self.q2, self.q3 = n0 * inv, n1 * inv, n2 * inv, n3 * inv
+
+
+def mahony_batch(gyro, accel, dt, kp=FUSION_KP, ki=FUSION_KI, trust_g=FUSION_ACCEL_TRUST_G):
+    """
+    Runs MahonyFilter over B recordings of N samples at once.
+
+    gyro, accel: (B, N, 3) or (N, 3); dt: (B, N), (N,) or a scalar.
+    Returns quaternions with shape (B, N, 4) (or (N, 4)), each recording
+    initialized from its first accelerometer sample like MahonyFilter.
+    """
+    gyro = np.asarray(gyro, dtype=np.float64)
+    accel = np.asarray(accel, dtype=np.float64)
+    single = gyro.ndim == 2
+    if single:
+        gyro, accel = gyro[None], accel[None]
+    b, n, _ = gyro.shape
+    dt = np.broadcast_to(np.asarray(dt, dtype=np.float64), (b, n))
+
+    out = np.empty((b, n, 4))
+    a0 = accel[:, 0]
+    roll = np.arctan2(a0[:, 1], a0[:, 2])
+    pitch = np.arctan2(-a0[:, 0], np.hypot(a0[:, 1], a0[:, 2]))
+    cr, sr, cp, sp = np.cos(roll / 2), np.sin(roll / 2), np.cos(pitch / 2), np.sin(pitch / 2)
+    q = np.stack((cr * cp, sr * cp, cr * sp, -sr * sp), axis=1)
+    integral = np.zeros((b, 3))
+    out[:, 0] = q
+
+    norms = np.linalg.norm(accel, axis=2)
+    trusted = (np.abs(norms - 1.0) <= trust_g) & (norms > 0)
+    unit = accel / np.where(norms > 0, norms, 1.0)[..., None]
+    for k in range(1, n):
+        q0, q1, q2, q3 = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+        a = unit[:, k]
+        v = np.stack((2.0 * (q1 * q3 - q0 * q2), 2.0 * (q0 * q1 + q2 * q3), q0 * q0 - q1 * q1 - q2 * q2 + q3 * q3),
+                     axis=1)
+        e = np.cross(a, v) * trusted[:, k, None]
+        step = dt[:, k, None]
+        if ki > 0.0:
+            integral += ki * e * step
+        g = (gyro[:, k] + kp * e + integral) * (0.5 * step)
+        gx, gy, gz = g[:, 0], g[:, 1], g[:, 2]
+        q = np.stack((q0 - q1 * gx - q2 * gy - q3 * gz,
+                      q1 + q0 * gx + q2 * gz - q3 * gy,
+                      q2 + q0 * gy - q1 * gz + q3 * gx,
+                      q3 + q0 * gz + q1 * gy - q2 * gx), axis=1)
+        q /= np.linalg.norm(q, axis=1, keepdims=True)
+        out[:, k] = q
+    return out[0] if single else out
@@ -3,12 +3,21 @@ import pygame
 import sys
 import time
 from collections import deque
-from level import Level, LEVEL_DATA
-from ball import Ball
+from .level import Level, LEVEL_DATA
+from .ball import Ball
 import math
-from shot_data import get_latest_shot_data, start_new_swing
-from config import CONFIG
-from player import PlayerManager
+import sqlite3
+import uuid
+from .shot_data import get_latest_shot_data, save_bias, start_new_swing
+from .config import CONFIG
+from .player import PlayerManager
+from .assets import AssetManager
+from .camera import Camera
+from .prefetch import LevelPrefetcher
+from .store import ShotStore
+from .heatmap import ShotHeatmap
+from .broadcast import ANGLE_SCALE, GAME_STATES, POS_SCALE, POWER_SCALE, SpectatorBroadcaster
+from ..server.metrics import DETECTOR_TIME, FPS, PHYSICS_STEPS, SHOTS_FIRED
 
 # --- Constants ---
 SCREEN_WIDTH = 1280
@@ -35,15 +44,54 @@ POWER_BAR_FILL = (255, 255, 0)
 # Preview floor so path dots appear before strike in socket mode (configurable)
 PREVIEW_MIN_POWER = float(CONFIG.get("preview_min_power", 0.35))
 
+# Idle mode: drop to a low redraw rate when nothing on screen can change
+IDLE_FPS = float(CONFIG.get("idle_fps", 4.0))
+IDLE_AFTER_S = float(CONFIG.get("idle_after_s", 1.0))
+IDLE_AIM_THRESHOLD_RAD = math.radians(float(CONFIG.get("idle_aim_threshold_deg", 0.5)))
+IDLE_POWER_THRESHOLD = float(CONFIG.get("idle_power_threshold", 0.01))
+
+# Bay status sent to the venue dashboard (when the sensor server relays to one)
+VENUE_STATUS_INTERVAL_S = float(CONFIG.get("venue_status_interval_s", 2.0))
+
+# Ball path kept for the shot history: one point every N physics steps (240 Hz / 8 = 30 Hz)
+SHOT_PATH_EVERY_STEPS = 8
+
+# Posted from the sensor thread to wake an idle loop
+SENSOR_SAMPLE_EVENT = pygame.USEREVENT + 1
+# Posted by the heatmap loader so an idle loop redraws with the finished overlay
+HEATMAP_READY_EVENT = pygame.USEREVENT + 2
+
 class Game:
-    def __init__(self, sensor_server):
-        pygame.init()
+    def __init__(self, sensor_server, spectator_addr=None, recorder=None):
+        # Only the subsystems the game uses; pygame.init() would also start audio, joystick, etc.
+        pygame.display.init()
+        pygame.font.init()
         self.sensor_server = sensor_server
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("2D Mini-Golf")
         self.clock = pygame.time.Clock()
+        self.sensor_server.add_listener(self._on_sensor_sample)
         self.font = pygame.font.Font(None, 36)
         self.title_font = pygame.font.Font(None, 96)
+        self.assets = AssetManager()
+        self.graphics_mode = CONFIG.get('graphics_mode', 'simple')
+        self.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.prefetcher = LevelPrefetcher((SCREEN_WIDTH, SCREEN_HEIGHT))
+        try:
+            self.shot_store = ShotStore()
+            self.shot_store.start()
+        except (OSError, sqlite3.Error) as e:
+            print(f"[WARNING] Shot history disabled: {e}")
+            self.shot_store = None
+        self.session_id = None
+        self.recorder = recorder   # Recorder of this session's samples, so shots can point into it
+        # Spectator snapshots (see broadcast.py), off unless an address is given
+        self.broadcaster = SpectatorBroadcaster(spectator_addr) if spectator_addr else None
+        self.pending_shot = None   # shot in flight, saved once the ball stops or drops
+        self.show_heatmap = False
+        self.heatmaps = {}         # hole -> ShotHeatmap, built the first time it is shown
+        self.last_shot_power = None
+        self._last_status_time = 0.0
         self.is_running = True
         
         # --- State Management ---
@@ -63,6 +111,7 @@ class Game:
         self.mouse_down_pos = None
 
         self.current_shot_angle = 0.0
+        self.display_shot_angle = 0.0       # aim extrapolated to display time, drawn in socket mode
         self.current_shot_power = 0.0       # smoothed/final power for actual shot
         self.current_shot_power_raw = 0.0   # instantaneous preview power for UI/path
         self.direction_vector = pygame.Vector2(0)
@@ -86,9 +135,18 @@ class Game:
         
         self.current_level_index = 1
 
+        # Idle tracking
+        self.is_idle = False
+        self._sensor_wake_armed = False
+        self._last_activity_time = time.time()
+        self._last_render_time = 0.0
+        self._idle_ref_angle = 0.0
+        self._idle_ref_power = 0.0
+
     def start_game(self, num_players):
         """Initializes game state for a new game."""
         self.player_manager.setup_new_game(num_players)
+        self.session_id = uuid.uuid4().hex
         self.current_level_index = 1
         self.load_level(self.current_level_index)
         self.game_state = 'PLAYING'
@@ -98,10 +156,18 @@ class Game:
         if level_index not in LEVEL_DATA: level_index = 1
         
         self.current_level_index = level_index
-        level_info = LEVEL_DATA[self.current_level_index]
-        self.level = Level(level_info)
+        # Swap in the hole prepared during the score screen when there is one
+        self.level = self.prefetcher.take(level_index)
+        if self.level is None:
+            self.level = Level(LEVEL_DATA[self.current_level_index])
+        if self.graphics_mode == 'enhanced':
+            self.assets.preload(self.level.asset_names)
         
         self.player_manager.prepare_for_level(self.level.start_pos)
+        self.camera.set_world(self.level.bounds.union(pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)))
+        self.camera.snap_to(self.level.start_pos)
+        self.pending_shot = None
+        self.send_bay_status()
         start_new_swing()  # reset aim/swing detector for new level
         self._last_shoot_flag = False
         self.aim_locked = False
@@ -109,19 +175,29 @@ class Game:
 
     def run(self):
         while self.is_running:
-            self.frame_dt = min(self.clock.tick(TARGET_FPS) / 1000.0, MAX_DELTA_TIME)
+            self.is_idle = self._can_idle()
+            if self.is_idle:
+                self._wait_while_idle()
+                self.frame_dt = min(self.clock.tick() / 1000.0, MAX_DELTA_TIME)
+            else:
+                self.frame_dt = min(self.clock.tick(TARGET_FPS) / 1000.0, MAX_DELTA_TIME)
             self.accumulator += self.frame_dt
 
             self.process_input()
 
             if self.game_state == 'PLAYING':
                 if self.control_mode == 'socket':
-                    shot_data = get_latest_shot_data(self.sensor_server)
+                    detect_start = time.perf_counter()
+                    # Frame reaches the screen about one frame after it's drawn
+                    shot_data = get_latest_shot_data(self.sensor_server, display_latency_s=self.frame_dt)
+                    DETECTOR_TIME.observe(time.perf_counter() - detect_start)
                     # Use locked angle when armed
                     self.aim_locked = bool(shot_data.get("aim_locked", False))
                     self.lock_angle = float(shot_data.get("angle_locked", self.lock_angle))
                     current_angle = float(shot_data.get("angle", 0.0))
                     self.current_shot_angle = self.lock_angle if self.aim_locked else current_angle
+                    self.display_shot_angle = self.lock_angle if self.aim_locked \
+                        else float(shot_data.get("angle_display", current_angle))
 
                     # Power
                     self.current_shot_power = float(shot_data.get("power", 0.0))
@@ -130,18 +206,84 @@ class Game:
                     # Auto-shoot only on rising edge of shoot flag
                     shoot_flag = bool(shot_data.get("shoot", False))
                     if shoot_flag and not self._last_shoot_flag:
-                        self.try_auto_shoot()
+                        self.try_auto_shoot(shot_data.get("device"))
                     self._last_shoot_flag = shoot_flag
 
+                    self._note_sensor_change()
+
+                steps = 0
                 while self.accumulator >= self.dt:
                     self.update(self.dt)
                     self.accumulator -= self.dt
-            
-            self.render(self.screen)
+                    steps += 1
+                    if self.game_state != 'PLAYING':
+                        # The hole ended on this step; the remaining steps belong to no hole
+                        self.accumulator = 0.0
+                        break
+                PHYSICS_STEPS.observe(steps)
+            else:
+                self.accumulator = 0.0
+
+            # While idle, only redraw on activity or at the idle rate
+            now = time.time()
+            if not self.is_idle or self._last_activity_time > self._last_render_time \
+                    or (now - self._last_render_time) >= 1.0 / IDLE_FPS:
+                self.render(self.screen)
+                self._last_render_time = now
+            FPS.set(self.clock.get_fps())
+            if self.broadcaster is not None:
+                self.broadcaster.publish(self.snapshot_values(), now)
+            if now - self._last_status_time >= VENUE_STATUS_INTERVAL_S:
+                self.send_bay_status()
         self.cleanup()
 
+    # --- Idle mode ---
+    def _on_sensor_sample(self, _data):
+        """Sensor thread callback: wakes the loop if it is blocked while idle."""
+        if self._sensor_wake_armed:
+            self._sensor_wake_armed = False
+            pygame.event.post(pygame.event.Event(SENSOR_SAMPLE_EVENT))
+
+    def _can_idle(self):
+        """True when nothing on screen can change without input or a sensor change."""
+        if (time.time() - self._last_activity_time) < IDLE_AFTER_S:
+            return False
+        if self.game_state == 'PLAYING':
+            view = self.camera.view_rect
+            if self.is_aiming or any(mw.rect.colliderect(view) for mw in self.level.moving_walls):
+                return False
+            # The camera eases after the ball for a while once it stops; at IDLE_FPS it would crawl
+            if not self.camera.is_settled(self.player_manager.get_active_ball().pos):
+                return False
+            for ball in self.player_manager.balls.values():
+                if not ball.in_hole and not ball.is_stationary():
+                    return False
+        return True
+
+    def _wait_while_idle(self):
+        """Blocks until input, a new sensor sample or the next idle redraw is due."""
+        next_render = self._last_render_time + 1.0 / IDLE_FPS
+        timeout_ms = max(1, int((next_render - time.time()) * 1000))
+        self._sensor_wake_armed = self.game_state == 'PLAYING' and self.control_mode == 'socket'
+        event = pygame.event.wait(timeout_ms)
+        self._sensor_wake_armed = False
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)  # leave it for process_input
+
+    def _note_sensor_change(self):
+        """Counts aim/power movement beyond the idle thresholds as activity."""
+        if abs(self.current_shot_angle - self._idle_ref_angle) > IDLE_AIM_THRESHOLD_RAD \
+                or abs(self.current_shot_power_raw - self._idle_ref_power) > IDLE_POWER_THRESHOLD:
+            self._idle_ref_angle = self.current_shot_angle
+            self._idle_ref_power = self.current_shot_power_raw
+            self._last_activity_time = time.time()
+
     def process_input(self):
         for event in pygame.event.get():
+            if event.type == SENSOR_SAMPLE_EVENT:
+                continue
+            self._last_activity_time = time.time()
+
             if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
                 self.is_running = False; return
 
@@ -160,6 +302,9 @@ class Game:
             self.game_state = 'PLAYING'
 
     def handle_playing_input(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+            self.show_heatmap = not self.show_heatmap; return
+
         active_ball = self.player_manager.get_active_ball()
         if not active_ball.is_stationary(): return
 
@@ -186,6 +331,7 @@ class Game:
                 velocity = direction_vector.normalize() * final_power
                 active_ball.shoot(velocity)
                 self.player_manager.record_shot()
+                self._begin_shot(math.atan2(-direction_vector.y, direction_vector.x), min(power_normalized, 1.0))
     
     def handle_socket_input(self, event):
         # Manual override with keyboard for testing
@@ -197,12 +343,13 @@ class Game:
                 vel_y = -power * math.sin(self.current_shot_angle)
                 active_ball.shoot(pygame.Vector2(vel_x, vel_y))
                 self.player_manager.record_shot()
+                self._begin_shot(self.current_shot_angle, self.current_shot_power)
                 start_new_swing()
                 self._last_shoot_flag = False
                 self.aim_locked = False
                 self.lock_angle = 0.0
 
-    def try_auto_shoot(self):
+    def try_auto_shoot(self, device=None):
         now = time.time()
         if (now - self.last_auto_shot_time) < self.auto_shot_cooldown_s:
             return
@@ -216,6 +363,7 @@ class Game:
         vel_y = -power * math.sin(self.current_shot_angle)
         active_ball.shoot(pygame.Vector2(vel_x, vel_y))
         self.player_manager.record_shot()
+        self._begin_shot(self.current_shot_angle, self.current_shot_power, ts=now, device=device)
         self.last_auto_shot_time = now
         start_new_swing()
         self._last_shoot_flag = False
@@ -224,29 +372,131 @@ class Game:
 
     def update(self, dt: float):
         self.level.update()
-        all_walls = self.level.get_all_walls()
         
         active_ball = self.player_manager.get_active_ball()
         was_moving = not active_ball.is_stationary()
 
         for ball in self.player_manager.balls.values():
             if not ball.in_hole:
-                ball.update(dt, all_walls)
+                # Only walls the ball can reach this step
+                reach = int(ball.vel.length() * dt) + ball.radius
+                ball.update(dt, self.level.walls_near(ball.rect.inflate(reach * 2, reach * 2)))
         
         stopped_moving = was_moving and active_ball.is_stationary()
+        holed = False
 
         if self.level.hole_rect.colliderect(active_ball.rect) and active_ball.vel.length() < 20:
             self.player_manager.finish_turn_for_player()
-            stopped_moving = True
+            stopped_moving = holed = True
+
+        if self.pending_shot is not None:
+            if stopped_moving:
+                self._finish_shot(active_ball, holed)
+                self.send_bay_status()
+            else:
+                self.pending_shot["steps"] += 1
+                if self.pending_shot["steps"] % SHOT_PATH_EVERY_STEPS == 0:
+                    self.pending_shot["path"].append((active_ball.pos.x, active_ball.pos.y))
 
         if self.player_manager.all_players_finished():
-            self.final_scores = self.player_manager.scores.copy()
-            self.next_level_index = self.current_level_index + 1
-            if self.next_level_index > len(LEVEL_DATA): self.next_level_index = 1
-            self.game_state = 'SCORE_SCREEN'
+            self._finish_hole()
         elif stopped_moving:
             self.player_manager.next_turn()
 
+    def _finish_hole(self):
+        """PLAYING -> SCORE_SCREEN, once per hole: saves the scores and starts building the next hole."""
+        if self.game_state != 'PLAYING':
+            return
+        self.final_scores = self.player_manager.scores.copy()
+        self._save_hole_scores()
+        self.next_level_index = self.current_level_index + 1
+        if self.next_level_index not in LEVEL_DATA: self.next_level_index = 1
+        self.game_state = 'SCORE_SCREEN'
+        self.prefetcher.start(self.next_level_index, LEVEL_DATA[self.next_level_index], self.graphics_mode)
+
+    # --- Shot history ---
+    def _begin_shot(self, angle, power, ts=None, device=None):
+        """Remembers the shot just fired by the active player until the ball comes to rest."""
+        SHOTS_FIRED.inc((self.control_mode,))
+        self.last_shot_power = power
+        pos = self.player_manager.get_active_ball().pos
+        self.pending_shot = {
+            "ts": ts if ts is not None else time.time(),
+            "player": self.player_manager.current_player_idx,
+            "stroke": self.player_manager.scores[self.player_manager.current_player_idx],
+            "control_mode": self.control_mode,
+            "angle": angle,
+            "power": power,
+            "start": (pos.x, pos.y),
+            "path": [(pos.x, pos.y)],
+            "steps": 0,
+            "device": device,
+            "recording": self.recorder.path if self.recorder is not None else None,
+            "recording_offset": self.recorder.count if self.recorder is not None else None,
+        }
+        self.send_bay_status()
+
+    def _finish_shot(self, ball, holed):
+        shot, self.pending_shot = self.pending_shot, None
+        rest = (ball.pos.x, ball.pos.y)
+        shot["path"].append(rest)
+        heatmap = self.heatmaps.get(self.current_level_index)
+        if heatmap is not None:
+            heatmap.add_shot(rest, shot["path"])
+        if self.shot_store is None:
+            return
+        self.shot_store.record_shot(
+            self.session_id, shot["player"], self.current_level_index, shot["stroke"], shot["control_mode"],
+            shot["angle"], shot["power"], shot["start"], rest, holed, shot["path"], ts=shot["ts"],
+            device=shot["device"], recording=shot["recording"], recording_offset=shot["recording_offset"])
+
+    def heatmap_for_hole(self, hole):
+        """The hole's heatmap; on first use its history loads in the background and live shots add on top."""
+        heatmap = self.heatmaps.get(hole)
+        if heatmap is None:
+            heatmap = self.heatmaps[hole] = ShotHeatmap(self.level.bounds)
+            if self.shot_store is not None:
+                # Shots from here on (including one still rolling) are added live; load only those fired before
+                before_ts = self.pending_shot["ts"] if self.pending_shot else time.time()
+                heatmap.load(self.shot_store, hole, before_ts,
+                             on_ready=lambda: pygame.event.post(pygame.event.Event(HEATMAP_READY_EVENT)))
+        return heatmap
+
+    def _save_hole_scores(self):
+        if self.shot_store is None:
+            return
+        for player, strokes in self.player_manager.scores.items():
+            self.shot_store.record_hole(self.session_id, player, self.current_level_index, strokes, self.level.par)
+
+    def snapshot_values(self):
+        """Flat int state for spectators, in the order spectator.html reads it."""
+        state = GAME_STATES.get(self.game_state, 0)
+        if self.game_state == 'START_MENU':
+            return [0, state]
+        pm = self.player_manager
+        active_ball = pm.get_active_ball()
+        show_aim = self.game_state == 'PLAYING' and active_ball.is_stationary() and self.direction_vector.length() > 0
+        angle = math.atan2(-self.direction_vector.y, self.direction_vector.x) if show_aim else 0.0
+        values = [self.current_level_index, state, pm.current_player_idx, int(show_aim),
+                  round(angle * ANGLE_SCALE), round(self.ui_power_preview * POWER_SCALE), len(pm.balls)]
+        for idx in sorted(pm.balls):
+            ball = pm.balls[idx]
+            values += [round(ball.pos.x * POS_SCALE), round(ball.pos.y * POS_SCALE), int(ball.in_hole)]
+        values.append(len(self.level.moving_walls))
+        for wall in self.level.moving_walls:
+            values += [wall.rect.x, wall.rect.y]
+        return values
+
+    def send_bay_status(self):
+        """Reports hole, turn and last shot power to the venue dashboard."""
+        self._last_status_time = time.time()
+        status = {"type": "bay_status", "state": self.game_state, "last_power": self.last_shot_power}
+        if self.game_state != 'START_MENU':
+            player = self.player_manager.current_player_idx
+            status.update(hole=self.current_level_index, par=self.level.par, player=player,
+                          strokes=self.player_manager.scores.get(player, 0))
+        self.sensor_server.send_message(status)
+
     def render(self, surface: pygame.Surface):
         if self.game_state == 'START_MENU': self.draw_start_menu(surface)
         elif self.game_state == 'PLAYING': self.draw_playing_state(surface)
@@ -268,10 +518,15 @@ class Game:
         self.draw_button(surface, self.p2_button_rect, "2 Players", p2_color)
 
     def draw_playing_state(self, surface: pygame.Surface):
+        active_ball = self.player_manager.get_active_ball()
+        if self.game_state == 'PLAYING':
+            self.camera.follow(active_ball.pos, self.frame_dt)
+
         self.draw_background(surface)
-        self.level.draw(surface, None, 'simple')
+        self.level.draw(surface, self.assets, self.graphics_mode, self.camera)
+        if self.show_heatmap:
+            self.heatmap_for_hole(self.current_level_index).draw(surface, self.camera)
         
-        active_ball = self.player_manager.get_active_ball()
         if active_ball.is_stationary():
             self.draw_aiming_elements(surface, active_ball)
         else:
@@ -280,7 +535,7 @@ class Game:
         for player_num, ball in self.player_manager.balls.items():
             if not ball.in_hole:
                 is_active = (player_num == self.player_manager.current_player_idx)
-                ball.draw(surface, is_active)
+                ball.draw(surface, is_active, self.camera.view_rect.topleft)
         
         self.draw_hud(surface)
 
@@ -320,7 +575,7 @@ class Game:
             lerp_speed = 100.0 
             alpha = min(lerp_speed * self.frame_dt, 1.0)
 
-            angle_for_draw = self.current_shot_angle
+            angle_for_draw = self.display_shot_angle
             direction_x = math.cos(angle_for_draw)
             direction_y = -math.sin(angle_for_draw)
             self.direction_vector_goal = pygame.Vector2(direction_x, direction_y)
@@ -341,8 +596,9 @@ class Game:
             self.ui_power_preview = 0.0
 
         if self.direction_vector.length() > 0:
-            line_end = active_ball.pos - self.direction_vector * (50 + (power_normalized * 150))
-            pygame.draw.line(surface, AIM_LINE_COLOR, active_ball.pos, line_end, 3)
+            ball_screen_pos = self.camera.to_screen(active_ball.pos)
+            line_end = ball_screen_pos - self.direction_vector * (50 + (power_normalized * 150))
+            pygame.draw.line(surface, AIM_LINE_COLOR, ball_screen_pos, line_end, 3)
 
             if self.show_path:
                 # Use a preview floor in socket mode so dots appear before the strike
@@ -352,14 +608,14 @@ class Game:
                 sim_vel = self.direction_vector * power
                 sim_pos = active_ball.pos.copy()
                 path_points = []
-                all_current_walls = self.level.get_all_walls()
 
                 for i in range(150):
                     sim_vel *= CONFIG['friction']
                     if sim_vel.length() < 1:
                         break
                     sim_pos += sim_vel * self.dt
-                    for wall in all_current_walls:
+                    probe = pygame.Rect(int(sim_pos.x), int(sim_pos.y), 1, 1)
+                    for wall in self.level.walls_near(probe):
                         if wall.collidepoint(int(sim_pos.x), int(sim_pos.y)):
                             if sim_pos.x < wall.left + active_ball.radius or sim_pos.x > wall.right - active_ball.radius:
                                 sim_vel.x *= -1
@@ -370,6 +626,7 @@ class Game:
 
                 if len(path_points) > 1:
                     for point in path_points:
+                        point = self.camera.to_screen(point)
                         pygame.draw.circle(surface, PATH_COLOR, (int(point.x), int(point.y)), 2)
 
     def draw_hud(self, surface: pygame.Surface):
@@ -440,5 +697,10 @@ class Game:
         surface.blit(text_surf, text_rect)
 
     def cleanup(self):
+        save_bias()
+        if self.shot_store is not None:
+            self.shot_store.close()
+        if self.broadcaster is not None:
+            self.broadcaster.close()
         pygame.quit()
         sys.exit()
@@ -0,0 +1,120 @@
+# heatmap.py
+import threading
+import numpy as np
+import pygame
+
+# Grid resolution of the histograms, in world pixels per cell
+HEATMAP_CELL_PX = 16
+PATH_COLOR = (0, 170, 255)
+REST_COLOR = (255, 70, 0)
+PATH_MAX_ALPHA = 120
+REST_MAX_ALPHA = 210
+
+
+class ShotHeatmap:
+    """
+    Per-hole 2D histograms of where balls came to rest and where they
+    travelled, over a fixed grid covering the hole. Adding shots costs
+    O(new points) whatever the total. The overlay is rebuilt at grid
+    resolution (O(cells)) only when the counts changed and it is drawn, and
+    only the cells in view are scaled up to world size, again only when the
+    view reaches other cells.
+    """
+    def __init__(self, bounds: pygame.Rect, cell=HEATMAP_CELL_PX):
+        self.bounds = pygame.Rect(bounds)
+        self.cell = cell
+        nx = max(1, -(-self.bounds.width // cell))
+        ny = max(1, -(-self.bounds.height // cell))
+        self.x_edges = self.bounds.left + cell * np.arange(nx + 1, dtype=np.float64)
+        self.y_edges = self.bounds.top + cell * np.arange(ny + 1, dtype=np.float64)
+        self.rest = np.zeros((nx, ny), dtype=np.int64)
+        self.path = np.zeros((nx, ny), dtype=np.int64)
+        self.shots = 0
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._grid = None          # one pixel per cell
+        self._scaled = None        # (cell rect, that part of _grid scaled to world size)
+        self._dirty = True
+
+    def _histogram(self, x, y):
+        counts, _, _ = np.histogram2d(x, y, bins=(self.x_edges, self.y_edges))
+        return counts.astype(np.int64)
+
+    def add_points(self, rest_xy, path_xy, shots):
+        """Adds (N, 2) rest positions and (M, 2) path points from `shots` shots."""
+        rest = self._histogram(rest_xy[:, 0], rest_xy[:, 1]) if len(rest_xy) else 0
+        path = self._histogram(path_xy[:, 0], path_xy[:, 1]) if len(path_xy) else 0
+        with self._lock:
+            self.rest += rest
+            self.path += path
+            self.shots += shots
+            self._dirty = True
+
+    def add_shot(self, rest_pos, path_points):
+        self.add_points(np.array([rest_pos], dtype=np.float64),
+                        np.asarray(path_points, dtype=np.float64).reshape(-1, 2), 1)
+
+    def add_rows(self, rows):
+        """Adds ShotStore.iter_hole_outcomes rows: (rest_x, rest_y, float32 path blob)."""
+        if not rows:
+            return
+        rest_xy = np.array([(r[0], r[1]) for r in rows], dtype=np.float64)
+        path_xy = np.frombuffer(b''.join(r[2] or b'' for r in rows), dtype=np.float32).reshape(-1, 2)
+        self.add_points(rest_xy, path_xy, len(rows))
+
+    def load(self, store, hole, before_ts, on_ready=None):
+        """Fills the histograms from stored shots fired before `before_ts` on a worker thread."""
+        def _load():
+            try:
+                # Shots fired just before may still be queued in the writer
+                store.flush(timeout=5.0)
+                for rows in store.iter_hole_outcomes(hole, before_ts=before_ts):
+                    self.add_rows(rows)
+            except Exception as e:
+                print(f"[WARNING] Could not load shot history for hole {hole}: {e}")
+            self.loaded = True
+            if on_ready is not None:
+                on_ready()
+        threading.Thread(target=_load, daemon=True).start()
+
+    def _render(self):
+        with self._lock:
+            rest, path = self.rest.copy(), self.path.copy()
+            self._dirty = False
+        # Log scale so a few popular spots don't wash out the rest
+        p = np.log1p(path) / np.log1p(max(1, path.max()))
+        r = np.log1p(rest) / np.log1p(max(1, rest.max()))
+        rgb = np.where((r > 0)[..., None], REST_COLOR, PATH_COLOR).astype(np.uint8)
+        alpha = np.maximum(p * PATH_MAX_ALPHA, r * REST_MAX_ALPHA).astype(np.uint8)
+
+        grid = pygame.Surface(rest.shape, pygame.SRCALPHA)
+        pygame.surfarray.pixels3d(grid)[...] = rgb
+        pygame.surfarray.pixels_alpha(grid)[...] = alpha
+        return grid
+
+    def _visible_cells(self, camera):
+        """Grid cells under the camera's view, plus one on each side so the scaled edges stay off-screen."""
+        view = camera.view_rect.clip(self.bounds)
+        if not view.width or not view.height:
+            return None
+        nx, ny = self.rest.shape
+        c = self.cell
+        x0 = max(0, (view.left - self.bounds.left) // c - 1)
+        y0 = max(0, (view.top - self.bounds.top) // c - 1)
+        x1 = min(nx, -(-(view.right - self.bounds.left) // c) + 1)
+        y1 = min(ny, -(-(view.bottom - self.bounds.top) // c) + 1)
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+
+    def draw(self, surface, camera):
+        if self._dirty or self._grid is None:
+            self._grid = self._render()
+            self._scaled = None
+        cells = self._visible_cells(camera)
+        if cells is None:
+            return
+        if self._scaled is None or self._scaled[0] != cells:
+            part = pygame.transform.smoothscale(self._grid.subsurface(cells),
+                                                (cells.width * self.cell, cells.height * self.cell))
+            self._scaled = (cells, part.convert_alpha() if pygame.display.get_surface() else part)
+        origin = (self.bounds.left + cells.left * self.cell, self.bounds.top + cells.top * self.cell)
+        surface.blit(self._scaled[1], camera.to_screen(origin))
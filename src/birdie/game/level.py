@@ -0,0 +1,140 @@
+# level.py
+import pygame
+import json
+import os
+import time
+import math
+from .spatial import SpatialGrid
+
+# --- Colors for Simple Mode ---
+WALL_COLOR = (139, 69, 19)
+HOLE_BLACK = (0, 0, 0)
+# --- Colors for Enhanced Mode ---
+WALL_SHADOW_COLOR = (0, 0, 0, 100)
+HOLE_RADIUS = 18
+# Static walls are pre-rendered into square tiles of this size
+TILE_SIZE = 256
+TILE_COLORKEY = (255, 0, 255)
+DEFAULT_LEVEL_ASSETS = ['hole', 'flag']
+
+class MovingWall:
+    """Represents a single wall that moves between two points."""
+    def __init__(self, rect_data, end_pos_data, speed):
+        self.start_pos = pygame.Vector2(rect_data[0], rect_data[1])
+        self.end_pos = pygame.Vector2(end_pos_data)
+        self.speed = speed
+        self.rect = pygame.Rect(rect_data)
+    
+    def update(self):
+        """Updates the wall's position using a smooth sine wave oscillation."""
+        lerp_t = (math.sin(time.time() * self.speed) + 1) / 2
+        new_pos = self.start_pos.lerp(self.end_pos, lerp_t)
+        self.rect.topleft = new_pos
+
+def load_level_data(filepath: str) -> dict:
+    try:
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+            return {int(k): v for k, v in data.items()}
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error loading level data: {e}")
+        return {}
+
+class Level:
+    """Stores and draws the layout for a single golf hole."""
+    def __init__(self, level_data: dict):
+        self.walls = [pygame.Rect(r) for r in level_data["walls"]]
+        self.wall_grid = SpatialGrid()
+        for wall in self.walls:
+            self.wall_grid.insert(wall)
+        self.moving_walls = []
+        if "moving_walls" in level_data:
+            for mw_data in level_data["moving_walls"]:
+                self.moving_walls.append(
+                    MovingWall(mw_data["rect"], mw_data["end_pos"], mw_data["speed"])
+                )
+
+        self.start_pos = pygame.Vector2(level_data["start"])
+        self.hole_pos = pygame.Vector2(level_data["hole"])
+        self.hole_rect = pygame.Rect(self.hole_pos.x - HOLE_RADIUS, self.hole_pos.y - HOLE_RADIUS, HOLE_RADIUS * 2, HOLE_RADIUS * 2)
+        self.par = level_data["par"]
+        # Images the enhanced mode needs for this hole, loaded on demand
+        self.asset_names = level_data.get("assets", DEFAULT_LEVEL_ASSETS)
+
+        # World extent covers every wall (including full moving-wall travel), the tee and the hole
+        self.bounds = self.hole_rect.union(pygame.Rect(self.start_pos, (1, 1)))
+        self.bounds.unionall_ip(self.walls)
+        for mw in self.moving_walls:
+            self.bounds.union_ip(mw.rect.union(mw.rect.move(mw.end_pos - mw.start_pos)))
+
+        self._tiles = {}  # (tx, ty, graphics_mode) -> Surface
+
+    def update(self):
+        """Update all moving elements in the level."""
+        for wall in self.moving_walls:
+            wall.update()
+
+    def get_all_walls(self):
+        """Return a combined list of static and moving wall rects for physics."""
+        return self.walls + [mw.rect for mw in self.moving_walls]
+
+    def walls_near(self, rect: pygame.Rect):
+        """Return static walls from the spatial grid plus moving walls that overlap `rect`."""
+        return self.wall_grid.query(rect) + [mw.rect for mw in self.moving_walls if mw.rect.colliderect(rect)]
+
+    def _draw_walls(self, surface, wall_rects, graphics_mode, offset):
+        if graphics_mode == 'enhanced':
+            for wall_rect in wall_rects:
+                pygame.draw.rect(surface, WALL_SHADOW_COLOR, wall_rect.move(5 - offset[0], 5 - offset[1]))
+        for wall_rect in wall_rects:
+            pygame.draw.rect(surface, WALL_COLOR, wall_rect.move(-offset[0], -offset[1]))
+
+    def _get_tile(self, tx, ty, graphics_mode):
+        """Renders (once) the static walls that fall inside one tile."""
+        key = (tx, ty, graphics_mode)
+        tile = self._tiles.get(key)
+        if tile is None:
+            tile_rect = pygame.Rect(tx * TILE_SIZE, ty * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+            tile = pygame.Surface(tile_rect.size)
+            tile.fill(TILE_COLORKEY)
+            shadow_margin = tile_rect.inflate(10, 10)  # shadows are offset by 5px
+            self._draw_walls(tile, self.wall_grid.query(shadow_margin), graphics_mode, tile_rect.topleft)
+            tile.set_colorkey(TILE_COLORKEY, pygame.RLEACCEL)
+            self._tiles[key] = tile
+        return tile
+
+    def prerender(self, view_rect: pygame.Rect, graphics_mode: str):
+        """Renders the static tiles covering `view_rect` ahead of the first draw."""
+        for tx in range(view_rect.left // TILE_SIZE, (view_rect.right - 1) // TILE_SIZE + 1):
+            for ty in range(view_rect.top // TILE_SIZE, (view_rect.bottom - 1) // TILE_SIZE + 1):
+                self._get_tile(tx, ty, graphics_mode)
+
+    def draw(self, surface: pygame.Surface, assets: dict, graphics_mode: str, camera=None):
+        """Draws the part of the level visible through `camera` (or the whole surface)."""
+        if graphics_mode != 'enhanced' or not assets:
+            graphics_mode = 'simple'
+        view = camera.view_rect if camera else surface.get_rect()
+        offset = view.topleft
+
+        # --- Static walls from cached tiles ---
+        for tx in range(view.left // TILE_SIZE, (view.right - 1) // TILE_SIZE + 1):
+            for ty in range(view.top // TILE_SIZE, (view.bottom - 1) // TILE_SIZE + 1):
+                surface.blit(self._get_tile(tx, ty, graphics_mode),
+                             (tx * TILE_SIZE - offset[0], ty * TILE_SIZE - offset[1]))
+
+        # --- Moving walls, culled to the view ---
+        visible_moving = [mw.rect for mw in self.moving_walls if mw.rect.colliderect(view)]
+        self._draw_walls(surface, visible_moving, graphics_mode, offset)
+
+        hole_screen_pos = self.hole_pos - pygame.Vector2(offset)
+        if graphics_mode == 'enhanced':
+            hole_rect = assets['hole'].get_rect(center=hole_screen_pos)
+            surface.blit(assets['hole'], hole_rect)
+            
+            flag_rect = assets['flag'].get_rect(midbottom=hole_screen_pos + pygame.Vector2(0, 5))
+            surface.blit(assets['flag'], flag_rect)
+        else:
+            pygame.draw.circle(surface, HOLE_BLACK, hole_screen_pos, HOLE_RADIUS)
+
+LEVELS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'levels.json')
+LEVEL_DATA = load_level_data(LEVELS_PATH)
\ No newline at end of file
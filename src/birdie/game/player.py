@@ -1,5 +1,5 @@
 # player.py
-from ball import Ball
+from .ball import Ball
 
 PLAYER_COLORS = {
     1: (255, 255, 255),    # White
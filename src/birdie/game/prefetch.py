@@ -0,0 +1,55 @@
+# prefetch.py
+import threading
+import pygame
+from .level import Level
+from .camera import Camera
+
+
+class LevelPrefetcher:
+    """
+    Builds the next hole on a worker thread while the score screen is shown:
+    parses the geometry, builds the wall index and renders the static tiles
+    around the tee off-screen, so the transition only swaps objects in.
+    """
+    def __init__(self, view_size):
+        self.view_size = view_size
+        self._lock = threading.Lock()
+        self._generation = 0      # bumped by cancel(); a worker's result only counts for its own generation
+        self._thread = None
+        self._level_index = None
+        self._level = None
+
+    def start(self, level_index, level_info, graphics_mode):
+        """Begins preparing `level_info` in the background."""
+        self.cancel()
+        self._level_index = level_index
+        self._thread = threading.Thread(target=self._prepare, args=(self._generation, level_info, graphics_mode),
+                                        daemon=True)
+        self._thread.start()
+
+    def _prepare(self, generation, level_info, graphics_mode):
+        level = Level(level_info)
+        camera = Camera(*self.view_size)
+        camera.set_world(level.bounds.union(pygame.Rect((0, 0), self.view_size)))
+        camera.snap_to(level.start_pos)
+        level.prerender(camera.view_rect, graphics_mode)
+        with self._lock:
+            if generation == self._generation:
+                self._level = level
+
+    def take(self, level_index):
+        """Returns the prepared Level for `level_index`, waiting for the worker if needed, or None."""
+        if self._thread is None or self._level_index != level_index:
+            return None
+        self._thread.join()
+        level = self._level
+        self.cancel()
+        return level
+
+    def cancel(self):
+        # The worker only builds objects, so an abandoned one runs to the end and its level is dropped
+        with self._lock:
+            self._generation += 1
+        self._thread = None
+        self._level_index = None
+        self._level = None
@@ -0,0 +1,626 @@
+# shot_data.py
+import os
+import time
+import math
+from .config import CONFIG
+from .fusion import MahonyFilter, twist_deg
+from .spectral import SPECTRAL_BANDS_HZ, SlidingSpectrum, band_bins
+from .classifier import load_model
+from ..server.jitter import JitterBuffer
+from ..server.metrics import AIM_LATENCY, SENSOR_WINDOW
+from ..server.rolling import RollingStats, RollingWindow
+from .bias import BIAS_CACHE_PATH, BIAS_MAX_SAMPLES, BIAS_SAVE_INTERVAL_S, GyroBiasEstimator, load_bias_cache, save_bias_cache
+# =========================
+#     CONFIG -> CONSTANTS
+# =========================
+AIM_AXIS = CONFIG.get('aim_axis', 'z')  # body axis whose rotation aims
+POWER_YAW_AXIS = CONFIG.get('power_yaw_axis', 'y')  # body axis whose rotation sets power
+
+GYRO_RATE_IS_RAD_PER_S = bool(CONFIG.get('gyro_rate_is_rad_per_s', False))
+
+ACCEL_SWING_AXIS = CONFIG.get('accel_swing_axis', 'z')
+
+AIM_DEADZONE_DPS = float(CONFIG.get('aim_deadzone_dps', 1.0))
+AIM_WRAP_DEG = float(CONFIG.get('aim_wrap_deg', 180.0))
+# Aim degrees per degree of club rotation about AIM_AXIS
+AIM_GAIN = float(CONFIG.get('aim_gain', 1.0))
+
+# Displayed aim is extrapolated over the club-to-screen latency at the recent aim rate
+AIM_PREDICTION = bool(CONFIG.get('aim_prediction', True))
+AIM_RATE_TIME_CONSTANT_S = float(CONFIG.get('aim_rate_time_constant_s', 0.03))
+# Radio and network stack before the host sees a packet; the jitter buffer can't measure it
+AIM_BASE_LATENCY_S = float(CONFIG.get('aim_base_latency_s', 0.01))
+AIM_PREDICT_MAX_S = float(CONFIG.get('aim_predict_max_s', 0.15))
+AIM_PREDICT_MAX_DEG = float(CONFIG.get('aim_predict_max_deg', 12.0))  # overshoot clamp, aim degrees
+LATENCY_SMOOTHING_ALPHA = 0.1   # per frame
+
+# Baseline alphas are per step at ALPHA_REFERENCE_HZ and rescaled to the actual sample spacing
+ACCEL_BASELINE_ALPHA = float(CONFIG.get('accel_baseline_alpha', 0.10))
+MAG_BASELINE_ALPHA = float(CONFIG.get('mag_baseline_alpha', 0.10))
+ALPHA_REFERENCE_HZ = float(CONFIG.get('alpha_reference_hz', 60.0))
+
+SWING_DOWN_TRIG_AXIS_G = float(CONFIG.get('swing_down_trig_axis_g', -0.35))
+SWING_DOWN_TRIG_MAG_G  = float(CONFIG.get('swing_down_trig_mag_g', -0.25))
+SWING_END_THRESHOLD_G  = float(CONFIG.get('swing_end_threshold_g', 0.12))
+SWING_MAX_WINDOW_S     = float(CONFIG.get('swing_max_window_s', 0.50))
+
+# Impact: fire on the deceleration spike instead of waiting for the settle (kept as the fallback)
+IMPACT_DETECTION = bool(CONFIG.get('impact_detection', True))
+IMPACT_WINDOW_S = float(CONFIG.get('impact_window_s', 0.03))       # causal window the rise is measured over
+IMPACT_RISE_G = float(CONFIG.get('impact_rise_g', 0.6))            # rise within the window that counts as a spike
+IMPACT_CROSS_RISE_G = float(CONFIG.get('impact_cross_rise_g', 0.3))  # rise needed for an upward zero crossing
+IMPACT_MIN_DEPTH_G = float(CONFIG.get('impact_min_depth_g', 0.35))  # how deep the downswing must have gone
+IMPACT_MIN_ARMED_S = float(CONFIG.get('impact_min_armed_s', 0.03))
+# No arming this long after a reset or a rejected trigger, so the ringing after it can't start another swing
+SWING_HOLDOFF_S = float(CONFIG.get('swing_holdoff_s', 0.3))
+# Impact burst in the top spectral band (see spectral.py): also fires the shot, and the face
+# twist it carries flags a mis-hit (struck off the sweet spot, so the head rings about MISHIT_AXIS)
+# true, false or "auto": on only at rates whose windows put SPECTRAL_MIN_TOP_BINS bins inside the top band
+SPECTRAL_ANALYSIS = CONFIG.get('spectral_analysis', 'auto')
+SPECTRAL_MIN_TOP_BINS = int(CONFIG.get('spectral_min_top_bins', 4))
+SPECTRAL_IMPACT_G = float(CONFIG.get('spectral_impact_g', 0.3))        # RMS of |a| in the top band
+MISHIT_AXIS = CONFIG.get('mishit_axis', AIM_AXIS)
+MISHIT_TWIST_DPS_PER_G = float(CONFIG.get('mishit_twist_dps_per_g', 100.0))
+MISHIT_DELAY_S = float(CONFIG.get('mishit_delay_s', 0.025))          # burst length judged after the impact
+# Window of the rolling detector features (see swing_features)
+SWING_FEATURE_WINDOW_S = float(CONFIG.get('swing_feature_window_s', 0.5))
+
+# Swing classifier (see classifier.py): a trigger only shoots if classified as one of
+# SHOT_CLASSES with at least SWING_MIN_CONFIDENCE. Without a model every trigger shoots.
+SWING_MODEL_PATH = os.path.expanduser(CONFIG.get('swing_model_path', '~/.config/birdie/swing_model.json'))
+SHOT_CLASSES = tuple(CONFIG.get('shot_classes', ['putt', 'chip']))
+SWING_MIN_CONFIDENCE = float(CONFIG.get('swing_min_confidence', 0.6))
+
+POWER_SMOOTHING_ALPHA = float(CONFIG.get('power_smoothing_alpha', 0.25))
+SNAP_POWER_ON_SHOOT = bool(CONFIG.get('snap_power_on_shoot', True))
+
+# Angle→power mapping
+ANGLE_POWER_DEADZONE_DEG = float(CONFIG.get('angle_power_deadzone_deg', 3.0))
+ANGLE_POWER_MAX_DEG      = float(CONFIG.get('angle_power_max_deg', 60.0))
+
+# Longest gap integrated as one step by process_sample; longer gaps (link drops) are clamped
+MAX_SAMPLE_DT_S = 0.1
+
+# =========================
+#          STATE
+# =========================
+_jitter_buffers = {}    # device -> JitterBuffer, filled from the sensor thread
+_source = None          # server whose samples are buffered
+_last_arrival = None
+_last_t_us = None
+_sample_clock = 0.0     # seconds of sensor time since start_new_swing
+
+# Orientation: aim and power are both twists of one fused quaternion relative to _q_ref
+_fusion = MahonyFilter()
+_q_ref = None           # captured on the first fused sample of a swing
+
+# Aim
+aim_angle_deg = 0.0
+_aim_lock_deg = 0.0  # frozen at arm
+_aim_rate_dps = 0.0  # smoothed d(aim)/dt from the gyro
+_aim_buffer = None   # jitter buffer of the club that last moved the aim
+latency_s = 0.0      # smoothed club-to-screen latency estimate
+
+# Gyro bias per device; kept across swings and warm-started from the disk cache
+_bias_estimators = {}
+_bias_cache = None          # loaded on the first sample from a new device
+_bias_cache_enabled = True
+_last_bias_save = 0.0
+
+# Baselines
+_accel_axis_baseline = None        # baseline for chosen axis (g-units)
+_accel_mag_baseline = None         # baseline for |a| magnitude (g-units)
+
+# Swing detection
+_swing_armed = False
+_swing_start_ts = 0.0
+_holdoff_until = SWING_HOLDOFF_S    # sample clock before which the detector won't arm
+_peak_axis_hp = 0.0                 # most negative axis hp (<= 0)
+_peak_mag_hp = 0.0                  # most negative mag hp (<= 0)
+_backswing_deg = 0.0                # peak |yaw| since the club last left address
+_impact_axis = RollingWindow(IMPACT_WINDOW_S)   # hp_axis / hp_mag over the last IMPACT_WINDOW_S
+_impact_mag = RollingWindow(IMPACT_WINDOW_S)
+_features = RollingStats(SWING_FEATURE_WINDOW_S, ('hp_axis', 'hp_mag', 'gyro_dps'))
+# Order of swing_feature_vector; a model trained on a different list is not used
+FEATURE_STATS = ('mean', 'std', 'rms', 'min', 'max')
+SWING_FEATURES = tuple(
+    [f"{channel}_{stat}" for channel in _features.channels for stat in FEATURE_STATS]
+    + [f"{signal}_band{i}" for signal in ('accel', 'twist') for i in range(len(SPECTRAL_BANDS_HZ))]
+    + ['backswing_deg', 'armed_s', 'peak_axis_hp', 'peak_mag_hp', 'trigger_impact', 'trigger_settle', 'trigger_timeout'])
+last_trigger = None                 # what fired the last shot: 'impact', 'settle' or 'timeout'
+
+# Spectrum of (hp_mag, twist rate about MISHIT_AXIS) at the sample rate; runs across swings
+_spectrum = None
+_spectrum_off_rate = None           # rate "auto" last found too low for the spectrum
+_mishit_due = None                  # spectrum sample count at which the last impact is judged
+last_mishit = None                  # judgement of the last impact-fired shot; None until made
+
+# Swing classifier, loaded on the first trigger
+_swing_model = None
+_swing_model_loaded = False
+last_swing_class = None             # class and confidence of the last trigger (None without a model)
+last_swing_confidence = None
+last_swing_features = None          # swing_feature_vector of the last trigger
+
+# UI smoothing
+_smoothed_power = 0.0
+_raw_preview = 0.0
+
+# Rotation about POWER_YAW_AXIS from the swing's reference pose, degrees
+_yaw_rel_deg = 0.0
+
+# =========================
+#         HELPERS
+# =========================
+def _clamp(v, lo, hi):
+    return lo if v < lo else hi if v > hi else v
+
+def _wrap_deg(a, lim=AIM_WRAP_DEG):
+    span = 2.0 * lim
+    return ((a + lim) % span) - lim
+
+def _to_dps(rate_value):
+    """Convert gyro rate to deg/s based on GYRO_RATE_IS_RAD_PER_S."""
+    try:
+        r = float(rate_value)
+    except (TypeError, ValueError):
+        return 0.0
+    return math.degrees(r) if GYRO_RATE_IS_RAD_PER_S else r
+
+def _accel_mag(ax, ay, az):
+    return math.sqrt(ax * ax + ay * ay + az * az)
+
+def _angle_to_power(a_deg):
+    if a_deg <= ANGLE_POWER_DEADZONE_DEG: return 0.0
+    if a_deg >= ANGLE_POWER_MAX_DEG:      return 1.0
+    return (a_deg - ANGLE_POWER_DEADZONE_DEG) / max(1e-6, (ANGLE_POWER_MAX_DEG - ANGLE_POWER_DEADZONE_DEG))
+
+def _scaled_alpha(alpha, dt_s):
+    """Per-sample smoothing factor equivalent to `alpha` per step at ALPHA_REFERENCE_HZ."""
+    return 1.0 - (1.0 - alpha) ** (dt_s * ALPHA_REFERENCE_HZ)
+
+def _sample_dt(arrival, data):
+    """Seconds since the previous sample: firmware t_us when present (wraps at 2^32), else arrival time."""
+    global _last_arrival, _last_t_us
+    t_us = data.get('t_us')
+    if isinstance(t_us, int):
+        dt = ((t_us - _last_t_us) & 0xFFFFFFFF) / 1e6 if _last_t_us is not None else 0.0
+        _last_t_us = t_us
+    else:
+        dt = (arrival - _last_arrival) if _last_arrival is not None else 0.0
+    _last_arrival = arrival
+    return _clamp(dt, 0.0, MAX_SAMPLE_DT_S)
+
+def _bias_estimator(device, temperature):
+    """The device's estimator, warm-started from the cache the first time the device is seen."""
+    global _bias_cache
+    estimator = _bias_estimators.get(device)
+    if estimator is None:
+        estimator = _bias_estimators[device] = GyroBiasEstimator(device)
+        if device is not None and _bias_cache_enabled:
+            if _bias_cache is None:
+                _bias_cache = load_bias_cache()
+            entry = _bias_cache.get(device)
+            if entry is not None and estimator.warm_start(entry, temperature):
+                print(f"[BIAS] {device}: using cached gyro bias {tuple(round(b, 3) for b in estimator.bias_dps)} dps")
+    return estimator
+
+def _spectrum_for(dt_s):
+    """
+    The spectrum for the current sample rate, rebuilt when the rate changes by more than 20 %.
+    None while SPECTRAL_ANALYSIS is "auto" and the rate is too low to resolve the top band.
+    """
+    global _spectrum, _spectrum_off_rate
+    if dt_s > 0.0:
+        rate = 1.0 / dt_s
+        current = _spectrum.rate_hz if _spectrum is not None else _spectrum_off_rate
+        if current is None or abs(rate - current) > 0.2 * current:
+            bins = band_bins(rate, SPECTRAL_BANDS_HZ[-1])
+            if SPECTRAL_ANALYSIS == 'auto' and bins < SPECTRAL_MIN_TOP_BINS:
+                print(f"[SPECTRAL] {rate:.0f} Hz puts {bins} bins in the top band: spectral analysis off")
+                _spectrum, _spectrum_off_rate = None, rate
+            else:
+                _spectrum, _spectrum_off_rate = SlidingSpectrum(rate, channels=2), None
+    return _spectrum
+
+def _predicted_aim_deg(display_latency_s):
+    """
+    Aim extrapolated to when the frame reaches the screen: latency is the radio base,
+    the jitter buffer's playout lag and the caller's display latency, smoothed per frame.
+    """
+    global latency_s
+    lag = _aim_buffer.playout_lag(time.perf_counter()) if _aim_buffer is not None else 0.0
+    latency = _clamp(AIM_BASE_LATENCY_S + lag + display_latency_s, 0.0, AIM_PREDICT_MAX_S)
+    latency_s += LATENCY_SMOOTHING_ALPHA * (latency - latency_s)
+    AIM_LATENCY.set(latency_s)
+    lead = _clamp(_aim_rate_dps * latency_s, -AIM_PREDICT_MAX_DEG, AIM_PREDICT_MAX_DEG)
+    return aim_angle_deg + lead
+
+def _on_sample(sensor_data):
+    """SensorServer listener (sensor thread): buffers the sample for the game loop."""
+    device = sensor_data.get('device')
+    buffer = _jitter_buffers.get(device)
+    if buffer is None:
+        buffer = _jitter_buffers.setdefault(device, JitterBuffer(device))
+    buffer.push(sensor_data, time.perf_counter())
+
+# =========================
+#         API
+# =========================
+def start_new_swing():
+    """Reset aim and swing detector for a new putt attempt. The gyro bias carries over."""
+    global _last_arrival, _last_t_us, _sample_clock, _q_ref, aim_angle_deg, _aim_lock_deg, _aim_rate_dps
+    global _accel_axis_baseline, _accel_mag_baseline
+    global _swing_armed, _swing_start_ts, _holdoff_until, _peak_axis_hp, _peak_mag_hp, _backswing_deg
+    global _smoothed_power, _raw_preview, _yaw_rel_deg
+
+    # Motion buffered before the reset belongs to the previous attempt
+    now = time.perf_counter()
+    for buffer in list(_jitter_buffers.values()):
+        buffer.pull(now)
+    _last_arrival = None
+    _last_t_us = None
+    _sample_clock = 0.0
+
+    # Orientation re-seeds from gravity; the new pose becomes the reference
+    _fusion.reset()
+    _q_ref = None
+
+    # Aim
+    aim_angle_deg = 0.0
+    _aim_lock_deg = 0.0
+    _aim_rate_dps = 0.0
+
+    # Baselines seeded lazily on first sample
+    _accel_axis_baseline = None
+    _accel_mag_baseline = None
+
+    # Swing state
+    _swing_armed = False
+    _swing_start_ts = 0.0
+    _holdoff_until = SWING_HOLDOFF_S
+    _peak_axis_hp = 0.0
+    _peak_mag_hp = 0.0
+    _backswing_deg = 0.0
+    _impact_axis.clear()
+    _impact_mag.clear()
+    _features.clear()
+
+    # UI
+    _smoothed_power = 0.0
+    _raw_preview = 0.0
+    _yaw_rel_deg = 0.0
+
+    print("Ready: aim reset; baselines will auto-seed.")
+
+def reset_bias(use_cache=True):
+    """Forgets every device's gyro bias; with use_cache=False the disk cache is neither read nor written."""
+    global _bias_cache, _bias_cache_enabled
+    _bias_estimators.clear()
+    _bias_cache = None
+    _bias_cache_enabled = use_cache
+
+def swing_features():
+    """
+    Rolling statistics of the detector's inputs over the last SWING_FEATURE_WINDOW_S:
+    {'hp_axis' | 'hp_mag' | 'gyro_dps': {'count', 'mean', 'std', 'rms', 'min', 'max'}}.
+    gyro_dps is the bias-compensated rotation rate magnitude.
+    """
+    return _features.summary()
+
+def set_swing_model(model):
+    """Uses `model` (a classifier.SwingClassifier, or None for no gating). Returns the previous one."""
+    global _swing_model, _swing_model_loaded
+    previous = _swing_model
+    _swing_model, _swing_model_loaded = model, True
+    return previous
+
+def save_bias(path=BIAS_CACHE_PATH):
+    """Writes the bias of every device calibrated from enough samples this run to the disk cache."""
+    global _bias_cache, _last_bias_save
+    _last_bias_save = time.time()
+    measured = {d: e for d, e in _bias_estimators.items() if d is not None and e.samples >= BIAS_MAX_SAMPLES}
+    if not _bias_cache_enabled or not measured:
+        return
+    if _bias_cache is None:
+        _bias_cache = load_bias_cache(path)
+    for device, estimator in measured.items():
+        _bias_cache[device] = estimator.entry()
+    save_bias_cache(_bias_cache, path)
+
+# =========================
+#     CORE PROCESSING
+# =========================
+def _update_orientation(gx_dps, gy_dps, gz_dps, ax, ay, az, dt_s):
+    """Fuse one bias-compensated sample; aim and power yaw are read off the same quaternion."""
+    global aim_angle_deg, _q_ref, _yaw_rel_deg, _aim_rate_dps
+
+    # Deadzone: below it the club is treated as still, so only gravity corrects the pose
+    if gx_dps * gx_dps + gy_dps * gy_dps + gz_dps * gz_dps < AIM_DEADZONE_DPS * AIM_DEADZONE_DPS:
+        gx_dps = gy_dps = gz_dps = 0.0
+
+    _fusion.update(math.radians(gx_dps), math.radians(gy_dps), math.radians(gz_dps), ax, ay, az, dt_s)
+    if not _fusion.initialized:
+        return
+    q = _fusion.quaternion
+    if _q_ref is None:
+        _q_ref = q
+    aim_angle_deg = AIM_GAIN * twist_deg(q, _q_ref, AIM_AXIS)
+    if dt_s > 0.0:
+        rate = AIM_GAIN * {'x': gx_dps, 'y': gy_dps, 'z': gz_dps}.get(AIM_AXIS, 0.0)
+        _aim_rate_dps += (1.0 - math.exp(-dt_s / AIM_RATE_TIME_CONSTANT_S)) * (rate - _aim_rate_dps)
+    _yaw_rel_deg = twist_deg(q, _q_ref, POWER_YAW_AXIS)
+
+def _update_bias_and_baselines(ax, ay, az, gyro_dps, dt_s, bias):
+    """Seed and update baselines. Refine the gyro bias when steady."""
+    global _accel_axis_baseline, _accel_mag_baseline
+
+    a_axis = {'x': ax, 'y': ay, 'z': az}.get(ACCEL_SWING_AXIS, 0.0)
+    a_mag = _accel_mag(ax, ay, az)
+
+    # Seed on first sample
+    if _accel_axis_baseline is None:
+        _accel_axis_baseline = a_axis
+    if _accel_mag_baseline is None:
+        _accel_mag_baseline = a_mag
+
+    # Low-pass baselines
+    _accel_axis_baseline += _scaled_alpha(ACCEL_BASELINE_ALPHA, dt_s) * (a_axis - _accel_axis_baseline)
+    _accel_mag_baseline += _scaled_alpha(MAG_BASELINE_ALPHA, dt_s) * (a_mag - _accel_mag_baseline)
+
+    # High-pass magnitude for steadiness check
+    hp_mag = a_mag - _accel_mag_baseline
+
+    # Bias estimation when steady
+    bias.update(gyro_dps, hp_mag, dt_s)
+
+    return (a_axis - _accel_axis_baseline), hp_mag
+
+def _impact(hp_axis, hp_mag, now_s):
+    """
+    True on the impact spike: either signal rising sharply within the causal window,
+    or crossing zero upward steeply, after a deep enough downswing.
+    """
+    prev_axis, prev_mag = _impact_axis.last, _impact_mag.last
+    _impact_axis.push(now_s, hp_axis)
+    _impact_mag.push(now_s, hp_mag)
+    if not _swing_armed or now_s - _swing_start_ts < IMPACT_MIN_ARMED_S:
+        return False
+    for window, hp, prev, peak in ((_impact_axis, hp_axis, prev_axis, _peak_axis_hp),
+                                   (_impact_mag, hp_mag, prev_mag, _peak_mag_hp)):
+        if peak > -IMPACT_MIN_DEPTH_G:
+            continue
+        rise = hp - window.min
+        if rise >= IMPACT_RISE_G:
+            return True
+        if prev is not None and prev < 0.0 <= hp and rise >= IMPACT_CROSS_RISE_G:
+            return True
+    return False
+
+def _spectral_impact(now_s):
+    """True while armed, after a deep enough downswing, once the burst's top-band energy is high enough."""
+    if _spectrum is None or not _swing_armed or now_s - _swing_start_ts < IMPACT_MIN_ARMED_S:
+        return False
+    if min(_peak_axis_hp, _peak_mag_hp) > -IMPACT_MIN_DEPTH_G:
+        return False
+    return _spectrum.band_rms(0, -1) >= SPECTRAL_IMPACT_G
+
+def _update_spectrum(hp_mag, twist_dps, dt_s):
+    """Feeds the spectrum; MISHIT_DELAY_S after an impact, judges it from the burst's face twist."""
+    global _mishit_due, last_mishit
+    spectrum = _spectrum_for(dt_s)
+    if spectrum is None:
+        return
+    spectrum.push((hp_mag, twist_dps))
+    if _mishit_due is not None and spectrum.samples >= _mishit_due:
+        _mishit_due = None
+        spectrum.update()
+        accel, twist = spectrum.band_rms(0, -1), spectrum.band_rms(1, -1)
+        ratio = twist / accel if accel > 1e-9 else 0.0
+        last_mishit = ratio > MISHIT_TWIST_DPS_PER_G
+        if last_mishit:
+            print(f"[SHOT] Mis-hit: {ratio:.0f} dps/g of face twist in the impact")
+
+def swing_feature_vector(trigger, now_s):
+    """The classifier's inputs at a trigger, in SWING_FEATURES order. Built from running state in O(1)."""
+    vector = []
+    for window in _features.windows.values():
+        vector.extend((window.mean, window.std, window.rms, window.min, window.max))
+    n_bands = len(SPECTRAL_BANDS_HZ)
+    if _spectrum is not None and SPECTRAL_ANALYSIS:
+        vector.extend(_spectrum.band_rms(c, b) for c in (0, 1) for b in range(n_bands))
+    else:
+        vector.extend([0.0] * (2 * n_bands))
+    vector.extend((_backswing_deg, now_s - _swing_start_ts, _peak_axis_hp, _peak_mag_hp,
+                   float(trigger == 'impact'), float(trigger == 'settle'), float(trigger == 'timeout')))
+    return vector
+
+def _swing_classifier():
+    global _swing_model, _swing_model_loaded
+    if not _swing_model_loaded:
+        _swing_model_loaded = True
+        _swing_model = load_model(SWING_MODEL_PATH)
+        if _swing_model is not None and _swing_model.features != SWING_FEATURES:
+            print(f"[WARNING] Swing model {SWING_MODEL_PATH} was trained on other features; retrain it")
+            _swing_model = None
+    return _swing_model
+
+def _update_swing_detector(hp_axis, hp_mag, now_s):
+    """
+    Power is from the fused rotation about POWER_YAW_AXIS since the reference pose:
+    the preview bar follows it, the shot uses the top of the backswing.
+    Accel HP only arms/ends the stroke: the impact spike (or its spectral burst) ends it
+    at once, otherwise it ends when the signal settles or the window times out.
+    """
+    global _swing_armed, _swing_start_ts, _holdoff_until, _peak_axis_hp, _peak_mag_hp, _aim_lock_deg, _backswing_deg
+    global last_trigger
+    global _mishit_due, last_mishit, last_swing_class, last_swing_confidence, last_swing_features
+
+    shoot = False
+    final_power = 0.0
+
+    # Backswing extent; held once armed, since the downswing brings the club back through address
+    yaw = abs(_yaw_rel_deg)
+    if not _swing_armed:
+        _backswing_deg = 0.0 if yaw <= ANGLE_POWER_DEADZONE_DEG else max(_backswing_deg, yaw)
+
+    # Arm on downward accel deviation
+    armed = (hp_axis <= SWING_DOWN_TRIG_AXIS_G) or (hp_mag <= SWING_DOWN_TRIG_MAG_G)
+    just_armed = not _swing_armed and armed and now_s >= _holdoff_until
+    if just_armed:
+        _swing_armed = True
+        _swing_start_ts = now_s
+        _peak_axis_hp = min(0.0, hp_axis)
+        _peak_mag_hp  = min(0.0, hp_mag)
+        _aim_lock_deg = aim_angle_deg  # lock aim at arm
+
+    elif _swing_armed:
+        if hp_axis < _peak_axis_hp: _peak_axis_hp = hp_axis
+        if hp_mag  < _peak_mag_hp:  _peak_mag_hp  = hp_mag
+
+    impact = IMPACT_DETECTION and (_impact(hp_axis, hp_mag, now_s)
+                                   or (SPECTRAL_ANALYSIS and _spectral_impact(now_s)))
+    if _swing_armed and not just_armed:
+        near_base = (max(abs(hp_axis), abs(hp_mag)) <= SWING_END_THRESHOLD_G)
+        timed_out = ((now_s - _swing_start_ts) > SWING_MAX_WINDOW_S)
+        if impact or near_base or timed_out:
+            last_trigger = 'impact' if impact else 'settle' if near_base else 'timeout'
+            final_power = _angle_to_power(_backswing_deg)
+            shoot = True
+            last_swing_features = swing_feature_vector(last_trigger, now_s)
+            model = _swing_classifier()
+            if model is not None:
+                last_swing_class, last_swing_confidence = model.classify(last_swing_features)
+                if last_swing_class not in SHOT_CLASSES or last_swing_confidence < SWING_MIN_CONFIDENCE:
+                    print(f"[SWING] {last_swing_class} ({last_swing_confidence:.2f}): no shot")
+                    shoot = False
+                    final_power = 0.0
+                    # No new swing is started, so hold off here as start_new_swing does after a shot
+                    _holdoff_until = now_s + SWING_HOLDOFF_S
+            if shoot:
+                last_mishit = None
+                if impact and _spectrum is not None:
+                    _mishit_due = _spectrum.samples + max(1, round(MISHIT_DELAY_S * _spectrum.rate_hz))
+            _swing_armed = False
+            _swing_start_ts = 0.0
+            _peak_axis_hp = 0.0
+            _peak_mag_hp = 0.0
+
+    # Live preview follows current yaw angle (can go up or down)
+    raw_preview = _angle_to_power(abs(_yaw_rel_deg))
+
+    return shoot, raw_preview, final_power
+
+def _process(ax, ay, az, gyro_dps, dt_s, device, temperature):
+    """Runs one sample through fusion, baselines and the swing detector."""
+    global _sample_clock
+
+    bias = _bias_estimator(device, temperature)
+    if temperature is not None:
+        bias.temperature = temperature
+
+    _sample_clock += dt_s
+    hp_axis, hp_mag = _update_bias_and_baselines(ax, ay, az, gyro_dps, dt_s, bias)
+    bx, by, bz = bias.bias_dps
+    gx, gy, gz = gyro_dps[0] - bx, gyro_dps[1] - by, gyro_dps[2] - bz
+    _features.push(_sample_clock, (hp_axis, hp_mag, math.sqrt(gx * gx + gy * gy + gz * gz)))
+    if SPECTRAL_ANALYSIS:
+        _update_spectrum(hp_mag, {'x': gx, 'y': gy, 'z': gz}.get(MISHIT_AXIS, 0.0), dt_s)
+    _update_orientation(gx, gy, gz, ax, ay, az, dt_s)
+    return _update_swing_detector(hp_axis, hp_mag, _sample_clock)
+
+def process_sample(data, dt_s):
+    """
+    Runs one sensor packet through fusion, baselines and the swing detector.
+    `dt_s` is the time since the previous packet. Returns (shoot, raw_preview, final_power);
+    raises KeyError/TypeError/ValueError on a malformed packet.
+    """
+    accel = data['accelerometer']
+    ax, ay, az = float(accel['x']), float(accel['y']), float(accel['z'])
+    gr = data.get('gyroscope_rate')
+    if not isinstance(gr, dict):
+        # Back-compat: some payloads might use 'gyroscope'
+        gr = data['gyroscope']
+    gyro_dps = (_to_dps(gr.get('x', 0.0)), _to_dps(gr.get('y', 0.0)), _to_dps(gr.get('z', 0.0)))
+
+    temperature = data.get('temperature')
+    temperature = float(temperature) if isinstance(temperature, (int, float)) else None
+    return _process(ax, ay, az, gyro_dps, dt_s, data.get('device'), temperature)
+
+# =========================
+#        MAIN ENTRY
+# =========================
+def get_latest_shot_data(sensor_server, display_latency_s=0.0):
+    """
+    Processes every sample played out by the jitter buffers since the last call,
+    resampled to a uniform rate, so fusion and the detector see a clean stream
+    whatever the frame rate and network timing.
+    Angle from the fused orientation's rotation about AIM_AXIS, power from its
+    rotation about POWER_YAW_AXIS, both relative to the pose at the start of the swing.
+    Shot when accelerometer shows fast-down impulse that settles.
+    `display_latency_s` is how long the caller takes to get a frame on screen; the
+    display angle is extrapolated over it plus the sensor-to-host latency.
+
+    Returns:
+      {
+        "angle": radians,
+        "angle_deg": degrees,
+        "angle_display": radians,  # angle extrapolated to display time (== angle with prediction off)
+        "power": 0..1,         # preview or final (snapped on shoot)
+        "power_raw": 0..1,     # instantaneous preview
+        "shoot": bool,
+        "aim_locked": bool,    # True while downswing armed
+        "angle_locked": radians, # aim angle captured at arm
+        "mishit": bool or None,  # last impact-fired shot struck off the sweet spot; None until judged
+        "swing_class": str or None,       # classifier verdict on the last trigger (None without a model)
+        "swing_confidence": 0..1 or None,
+        "device": str or None   # club that last moved the aim
+      }
+    """
+    global _source, _smoothed_power, _raw_preview, _aim_buffer
+
+    if sensor_server is not _source:
+        if _source is not None:
+            _source.remove_listener(_on_sample)
+        sensor_server.add_listener(_on_sample)
+        _source = sensor_server
+
+    shoot = False
+    final_power = 0.0
+    now = time.perf_counter()
+    for device, buffer in list(_jitter_buffers.items()):
+        _, values = buffer.pull(now)
+        if len(values):
+            _aim_buffer = buffer
+        for ax, ay, az, gx, gy, gz in values.tolist():
+            gyro_dps = (_to_dps(gx), _to_dps(gy), _to_dps(gz))
+            fired, _raw_preview, power = _process(ax, ay, az, gyro_dps, buffer.period, device, buffer.temperature)
+            if fired and not shoot:
+                # First trigger in this batch wins; later samples only update the preview
+                shoot, final_power = True, power
+    if time.time() - _last_bias_save >= BIAS_SAVE_INTERVAL_S:
+        save_bias()
+    _features.publish(SENSOR_WINDOW, 'detector')
+
+    # Power smoothing (per frame, for the UI)
+    if shoot and SNAP_POWER_ON_SHOOT:
+        _smoothed_power = final_power  # snap to peak at the trigger frame
+    else:
+        target = final_power if shoot else _raw_preview
+        _smoothed_power += POWER_SMOOTHING_ALPHA * (target - _smoothed_power)
+
+    display_deg = _predicted_aim_deg(display_latency_s) if AIM_PREDICTION else aim_angle_deg
+    return {
+        "angle": math.radians(aim_angle_deg),
+        "angle_deg": aim_angle_deg,
+        "angle_display": math.radians(display_deg),
+        "power": _clamp(_smoothed_power, 0.0, 1.0),
+        "power_raw": _clamp(_raw_preview, 0.0, 1.0),
+        "shoot": bool(shoot),
+        "aim_locked": bool(_swing_armed),
+        "angle_locked": math.radians(_aim_lock_deg),
+        "mishit": last_mishit,
+        "swing_class": last_swing_class,
+        "swing_confidence": last_swing_confidence,
+        "device": _aim_buffer.labels[0] if _aim_buffer is not None else None
+    }
@@ -0,0 +1,37 @@
+# spatial.py
+import pygame
+
+DEFAULT_CELL_SIZE = 128
+
+
+class SpatialGrid:
+    """Uniform grid hash over static rects for fast rectangle queries."""
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}   # (cx, cy) -> list of item indices
+        self.items = []
+
+    def _cell_range(self, rect):
+        cs = self.cell_size
+        return (range(rect.left // cs, (rect.right - 1) // cs + 1),
+                range(rect.top // cs, (rect.bottom - 1) // cs + 1))
+
+    def insert(self, rect: pygame.Rect, item=None):
+        idx = len(self.items)
+        self.items.append(rect if item is None else item)
+        xs, ys = self._cell_range(rect)
+        for cx in xs:
+            for cy in ys:
+                self.cells.setdefault((cx, cy), []).append(idx)
+
+    def query(self, rect: pygame.Rect) -> list:
+        """Returns every item whose cells overlap `rect`, each once, in insertion order."""
+        xs, ys = self._cell_range(rect)
+        hits = set()
+        cells = self.cells
+        for cx in xs:
+            for cy in ys:
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    hits.update(bucket)
+        return [self.items[i] for i in sorted(hits)]
@@ -0,0 +1,105 @@
+# spectral.py
+"""
+Streaming short-time spectrum of a few sensor channels.
+
+Samples go into a ring of the last `window_n` samples per channel, written
+twice so the newest window is always one contiguous slice. Every `hop`
+samples that slice goes through one precomputed matrix that removes its
+mean, applies a periodic Hann window and takes the one-sided DFT, for all
+channels in a single product; at these window sizes that beats calling
+np.fft.rfft. The cost is fixed per hop whatever the history. Band energies
+are the mean square of the signal's content within each band (same units as
+the signal, squared): for a sine of amplitude A well inside a band they come
+to A^2 / 2.
+"""
+import math
+
+import numpy as np
+
+from .config import CONFIG
+
+SPECTRAL_WINDOW_S = float(CONFIG.get('spectral_window_s', 0.032))
+SPECTRAL_HOP_S = float(CONFIG.get('spectral_hop_s', 0.004))
+# [[lo, hi), ...] in Hz; bins above the Nyquist frequency of the stream simply don't exist
+SPECTRAL_BANDS_HZ = tuple(tuple(float(f) for f in band)
+                          for band in CONFIG.get('spectral_bands_hz', [[1.0, 10.0], [10.0, 40.0], [40.0, 500.0]]))
+MIN_WINDOW_N = 8
+
+
+def window_length(rate_hz, window_s=SPECTRAL_WINDOW_S):
+    """Samples per window at `rate_hz`."""
+    return max(MIN_WINDOW_N, int(round(window_s * rate_hz)))
+
+
+def band_bins(rate_hz, band_hz, window_s=SPECTRAL_WINDOW_S):
+    """How many DFT bins of a SlidingSpectrum at `rate_hz` fall inside `band_hz` ([lo, hi))."""
+    n = window_length(rate_hz, window_s)
+    freqs = np.fft.rfftfreq(n, 1.0 / rate_hz)
+    lo, hi = band_hz
+    return int(np.count_nonzero((freqs >= lo) & (freqs < hi)))
+
+
+class SlidingSpectrum:
+    def __init__(self, rate_hz, channels=1, bands_hz=SPECTRAL_BANDS_HZ,
+                 window_s=SPECTRAL_WINDOW_S, hop_s=SPECTRAL_HOP_S):
+        self.rate_hz = rate_hz
+        self.window_n = n = window_length(rate_hz, window_s)
+        self.hop = max(1, int(round(hop_s * rate_hz)))
+        self.bands_hz = tuple(bands_hz)
+        self.window = 0.5 - 0.5 * np.cos(2.0 * math.pi * np.arange(n) / n)
+        # frame (n,) -> one-sided spectrum (bins,) of the detrended, windowed frame
+        detrend = np.eye(n) - 1.0 / n
+        dft = np.exp(-2j * math.pi * np.outer(np.arange(n), np.arange(n // 2 + 1)) / n)
+        self._transform = detrend @ (self.window[:, None] * dft)
+
+        # Band matrix: power spectrum (bins,) -> band energies (bands,), folding in the one-sided
+        # doubling and the normalization that makes the energies mean squares
+        freqs = np.fft.rfftfreq(n, 1.0 / rate_hz)
+        weight = np.full(len(freqs), 2.0)
+        weight[0] = 1.0
+        if n % 2 == 0:
+            weight[-1] = 1.0
+        weight /= n * float(np.sum(self.window ** 2))
+        self._band_matrix = np.array([np.where((freqs >= lo) & (freqs < hi), weight, 0.0)
+                                      for lo, hi in self.bands_hz]).T
+
+        self._ring = np.zeros((channels, 2 * n))
+        self.energies = np.zeros((channels, len(self.bands_hz)))
+        self.reset()
+
+    def reset(self):
+        self._ring[:] = 0.0
+        self.energies[:] = 0.0
+        self._pos = 0
+        self._filled = 0
+        self._since_hop = 0
+        self.samples = 0      # pushed since the reset
+        self.frames = 0       # spectra computed since the reset
+
+    def push(self, values):
+        """Adds one sample per channel. Returns True when a hop completed and `energies` was updated."""
+        pos = self._pos
+        self._ring[:, pos] = self._ring[:, pos + self.window_n] = values
+        self._pos = (pos + 1) % self.window_n
+        self.samples += 1
+        if self._filled < self.window_n:
+            self._filled += 1
+        self._since_hop += 1
+        if self._since_hop < self.hop or self._filled < self.window_n:
+            return False
+        self.update()
+        return True
+
+    def update(self):
+        """Recomputes `energies` over the newest window now, off the hop schedule."""
+        self._since_hop = 0
+        frame = self._ring[:, self._pos:self._pos + self.window_n]   # oldest to newest
+        spectrum = frame @ self._transform
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        self.energies = power @ self._band_matrix
+        self.frames += 1
+        return self.energies
+
+    def band_rms(self, channel, band):
+        """Root of one band energy: the RMS amplitude of that channel's content in the band."""
+        return math.sqrt(self.energies[channel, band])
@@ -0,0 +1,216 @@
+# store.py
+import contextlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+from array import array
+
+from .config import CONFIG
+
+SHOT_DB_PATH = os.path.expanduser(CONFIG.get('shot_db_path', '~/.birdie/shots.sqlite'))
+WRITE_BATCH_SIZE = 256
+WRITE_FLUSH_INTERVAL_S = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shots (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,            -- wall-clock time the shot was fired
+    session TEXT NOT NULL,       -- one id per started game
+    player INTEGER NOT NULL,
+    hole INTEGER NOT NULL,
+    stroke INTEGER NOT NULL,
+    control_mode TEXT NOT NULL,
+    angle REAL NOT NULL,         -- radians
+    power REAL NOT NULL,         -- 0..1
+    start_x REAL, start_y REAL,
+    rest_x REAL, rest_y REAL,
+    holed INTEGER NOT NULL,
+    path BLOB,                   -- float32 x, y pairs of the ball's travel
+    device TEXT,                 -- club that fired it; NULL for keyboard and mouse shots
+    recording TEXT,              -- sensor recording of the session (birdie play --record), if any
+    recording_offset INTEGER     -- samples already in that recording when the shot fired
+);
+CREATE INDEX IF NOT EXISTS shots_player_hole ON shots (player, hole);
+CREATE INDEX IF NOT EXISTS shots_hole ON shots (hole);
+CREATE INDEX IF NOT EXISTS shots_session ON shots (session);
+
+CREATE TABLE IF NOT EXISTS holes (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    session TEXT NOT NULL,
+    player INTEGER NOT NULL,
+    hole INTEGER NOT NULL,
+    strokes INTEGER NOT NULL,
+    par INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS holes_hole_strokes ON holes (hole, strokes);
+CREATE INDEX IF NOT EXISTS holes_player ON holes (player, hole);
+"""
+
+INSERT_SHOT = """INSERT INTO shots (ts, session, player, hole, stroke, control_mode, angle, power,
+                 start_x, start_y, rest_x, rest_y, holed, path, device, recording, recording_offset)
+                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+INSERT_HOLE = """INSERT INTO holes (ts, session, player, hole, strokes, par) VALUES (?, ?, ?, ?, ?, ?)"""
+# Columns added after the first release; older databases get them on open
+ADDED_SHOT_COLUMNS = (("device", "TEXT"), ("recording", "TEXT"), ("recording_offset", "INTEGER"))
+
+_STOP = object()
+
+
+def encode_path(points):
+    """Packs [(x, y), ...] into float32 bytes."""
+    buf = array('f')
+    for x, y in points:
+        buf.append(x)
+        buf.append(y)
+    return buf.tobytes()
+
+
+def decode_path(blob):
+    buf = array('f')
+    buf.frombytes(blob or b'')
+    return list(zip(buf[0::2], buf[1::2]))
+
+
+class ShotStore:
+    """
+    Persists shots and hole scores to SQLite. Writes are queued and committed
+    in batches by a background thread (WAL mode), so callers never touch disk.
+    Queries open their own connection and can run from any thread.
+    """
+    def __init__(self, path=SHOT_DB_PATH):
+        self.path = path
+        self._queue = queue.Queue()
+        self._thread = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            have = {row[1] for row in conn.execute("PRAGMA table_info(shots)")}
+            for name, kind in ADDED_SHOT_COLUMNS:
+                if name not in have:
+                    conn.execute(f"ALTER TABLE shots ADD COLUMN {name} {kind}")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # --- Writes (non-blocking) ---
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self._thread.start()
+
+    def record_shot(self, session, player, hole, stroke, control_mode, angle, power,
+                    start_pos, rest_pos, holed, path_points, ts=None,
+                    device=None, recording=None, recording_offset=None):
+        """Queues a shot. `device`, `recording` and `recording_offset` locate its raw sensor window."""
+        self._queue.put((INSERT_SHOT, (
+            ts if ts is not None else time.time(), session, player, hole, stroke, control_mode,
+            float(angle), float(power), float(start_pos[0]), float(start_pos[1]),
+            float(rest_pos[0]), float(rest_pos[1]), int(bool(holed)), encode_path(path_points),
+            device, recording, recording_offset)))
+
+    def record_hole(self, session, player, hole, strokes, par):
+        self._queue.put((INSERT_HOLE, (time.time(), session, player, hole, strokes, par)))
+
+    def flush(self, timeout=None):
+        """Waits until everything queued so far is committed. Returns False if `timeout` ran out first."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Flushes everything queued and stops the writer."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _writer_loop(self):
+        conn = self._connect()
+        pending = []
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=WRITE_FLUSH_INTERVAL_S)
+            except queue.Empty:
+                item = None
+            # Drain whatever else is already queued into the same transaction
+            flushed = []
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                    break
+                if isinstance(item, threading.Event):
+                    flushed.append(item)    # flush(): set once what came before it is committed
+                else:
+                    pending.append(item)
+                    if len(pending) >= WRITE_BATCH_SIZE:
+                        break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            if pending:
+                try:
+                    with conn:
+                        for sql, params in pending:
+                            conn.execute(sql, params)
+                except sqlite3.Error as e:
+                    print(f"[WARNING] Could not save {len(pending)} records: {e}")
+                pending = []
+            for done in flushed:
+                done.set()
+        conn.close()
+
+    # --- Queries ---
+    def hole_leaderboard(self, hole, limit=10):
+        """Best (fewest strokes) recorded results on a hole: [(session, player, strokes, par, ts)]."""
+        with contextlib.closing(self._connect()) as conn, conn:
+            return conn.execute(
+                "SELECT session, player, strokes, par, ts FROM holes WHERE hole = ? "
+                "ORDER BY strokes ASC, ts ASC LIMIT ?", (hole, limit)).fetchall()
+
+    def player_shots(self, player, hole=None):
+        """Shots for a player (optionally one hole), oldest first, as dicts."""
+        sql = "SELECT * FROM shots WHERE player = ?"
+        params = [player]
+        if hole is not None:
+            sql += " AND hole = ?"
+            params.append(hole)
+        return self._fetch_dicts(sql + " ORDER BY ts", params)
+
+    def hole_shots(self, hole, since_id=0):
+        """Shots on a hole with id > since_id, as dicts with the path decoded."""
+        rows = self._fetch_dicts("SELECT * FROM shots WHERE hole = ? AND id > ? ORDER BY id", (hole, since_id))
+        for row in rows:
+            row["path"] = decode_path(row["path"])
+        return rows
+
+    def iter_hole_outcomes(self, hole, before_ts=None, batch_size=5000):
+        """Yields lists of (rest_x, rest_y, path blob) for a hole, for bulk readers like the heatmap."""
+        sql = "SELECT rest_x, rest_y, path FROM shots WHERE hole = ?"
+        params = [hole]
+        if before_ts is not None:
+            sql += " AND ts < ?"
+            params.append(before_ts)
+        with contextlib.closing(self._connect()) as conn, conn:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+
+    def _fetch_dicts(self, sql, params):
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(r) for r in conn.execute(sql, params).fetchall()]
@@ -0,0 +1,215 @@
+# archive.py
+"""
+Chunked columnar session archive (.brda).
+
+Layout:
+    b'BRDA' u16 version
+    chunk 0: column t | column ax | ... | column gz
+    chunk 1: ...
+    footer (JSON): columns, per-chunk offsets / sample counts / time span / min-max, swings
+    u64 footer offset, u32 footer length, b'BRDA'
+
+Each column in a chunk is the int sequence delta-encoded from zero, zigzag
+mapped and written as LEB128 varints. Times are integer microseconds since
+`t_base`; IMU axes are the sensor's int16 counts (value * scale).
+"""
+import json
+import mmap
+import struct
+
+import numpy as np
+
+MAGIC = b'BRDA'
+VERSION = 1
+HEADER = struct.Struct('<4sH')
+TRAILER = struct.Struct('<QI4s')
+
+CHUNK_SAMPLES = 4096
+
+# MPU6050 as configured by the firmware: +/-2 g (16384 LSB/g), +/-250 deg/s (131 LSB/(deg/s))
+ACCEL_SCALE = 16384.0
+GYRO_SCALE = 131.0
+COLUMNS = (('t', 1e6), ('ax', ACCEL_SCALE), ('ay', ACCEL_SCALE), ('az', ACCEL_SCALE),
+           ('gx', GYRO_SCALE), ('gy', GYRO_SCALE), ('gz', GYRO_SCALE))
+
+# Swing index: |accel| leaving 1 g by this much, merged across short gaps, padded on both sides
+SWING_ACCEL_G = 0.5
+SWING_MERGE_S = 0.3
+SWING_PAD_S = 0.5
+
+
+# =========================
+#      VARINT CODEC
+# =========================
+def encode_column(values):
+    """Delta + zigzag + varint encodes an int64 array into bytes."""
+    v = np.asarray(values, dtype=np.int64)
+    d = np.diff(v, prepend=np.int64(0))
+    z = ((d << 1) ^ (d >> 63)).astype(np.uint64)
+
+    nbytes = np.ones(len(z), dtype=np.int64)
+    for k in range(1, 10):
+        nbytes += z >= np.uint64(1 << (7 * k))
+    pos = np.concatenate(([0], np.cumsum(nbytes)[:-1]))
+    out = np.empty(int(nbytes.sum()), dtype=np.uint8)
+    for k in range(int(nbytes.max(initial=0))):
+        m = nbytes > k
+        byte = (z[m] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        byte |= np.where(nbytes[m] > k + 1, np.uint64(0x80), np.uint64(0))
+        out[pos[m] + k] = byte.astype(np.uint8)
+    return out.tobytes()
+
+
+def decode_column(buf):
+    """Inverse of encode_column; `buf` may be any bytes-like object (e.g. an mmap slice)."""
+    b = np.frombuffer(buf, dtype=np.uint8)
+    ends = np.flatnonzero(b < 0x80)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts + 1
+    z = np.zeros(len(ends), dtype=np.uint64)
+    for k in range(int(lengths.max(initial=0))):
+        m = lengths > k
+        z[m] |= (b[starts[m] + k] & np.uint8(0x7F)).astype(np.uint64) << np.uint64(7 * k)
+    d = (z >> np.uint64(1)).astype(np.int64) ^ -(z & np.uint64(1)).astype(np.int64)
+    return np.cumsum(d)
+
+
+# =========================
+#        SWINGS
+# =========================
+def detect_swings(t, accel):
+    """Returns [(t_start, t_end), ...] around spans where |accel| departs from 1 g."""
+    mag = np.sqrt((np.asarray(accel, dtype=np.float64) ** 2).sum(axis=1))
+    active = np.flatnonzero(np.abs(mag - 1.0) >= SWING_ACCEL_G)
+    if len(active) == 0:
+        return []
+    # Split where consecutive active samples are further apart than SWING_MERGE_S
+    breaks = np.flatnonzero(np.diff(t[active]) > SWING_MERGE_S)
+    first = np.concatenate(([0], breaks + 1))
+    last = np.concatenate((breaks, [len(active) - 1]))
+    return [(float(t[active[i]] - SWING_PAD_S), float(t[active[j]] + SWING_PAD_S)) for i, j in zip(first, last)]
+
+
+# =========================
+#     WRITER / READER
+# =========================
+def write_archive(path, t, rows, swings=None):
+    """
+    Writes times (epoch seconds) and an (N, 6) array of ax, ay, az, gx, gy, gz
+    to `path`. Swings default to detect_swings() over the accelerometer.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    rows = np.asarray(rows, dtype=np.float64).reshape(-1, 6)
+    if swings is None:
+        swings = detect_swings(t, rows[:, 0:3]) if len(t) else []
+    t_base = float(t[0]) if len(t) else 0.0
+
+    ints = [np.round((t - t_base) * 1e6).astype(np.int64)]
+    for k, (_, scale) in enumerate(COLUMNS[1:]):
+        ints.append(np.clip(np.round(rows[:, k] * scale), -32768, 32767).astype(np.int64))
+
+    chunks = []
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION))
+        for start in range(0, len(t), CHUNK_SAMPLES):
+            end = min(start + CHUNK_SAMPLES, len(t))
+            chunk = {"n": end - start, "t_start": int(ints[0][start]), "t_end": int(ints[0][end - 1]),
+                     "columns": []}
+            for col in ints:
+                part = col[start:end]
+                data = encode_column(part)
+                chunk["columns"].append({"offset": f.tell(), "length": len(data),
+                                         "min": int(part.min()), "max": int(part.max())})
+                f.write(data)
+            chunks.append(chunk)
+
+        footer = json.dumps({
+            "columns": [{"name": n, "scale": s} for n, s in COLUMNS],
+            "t_base": t_base,
+            "chunks": chunks,
+            "swings": [[a, b] for a, b in swings],
+        }, separators=(',', ':')).encode('utf-8')
+        footer_offset = f.tell()
+        f.write(footer)
+        f.write(TRAILER.pack(footer_offset, len(footer), MAGIC))
+
+
+class ArchiveReader:
+    """Memory-maps an archive and decodes only the chunks a read touches."""
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = HEADER.unpack_from(self._mm, 0)
+        footer_offset, footer_len, tail = TRAILER.unpack_from(self._mm, len(self._mm) - TRAILER.size)
+        if magic != MAGIC or tail != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a birdie archive")
+        footer = json.loads(self._mm[footer_offset:footer_offset + footer_len])
+        self.columns = [c["name"] for c in footer["columns"]]
+        self.scales = np.array([c["scale"] for c in footer["columns"][1:]], dtype=np.float64)
+        self.t_base = footer["t_base"]
+        self.chunks = footer["chunks"]
+        self.swings = [tuple(s) for s in footer["swings"]]
+        self._chunk_starts = np.array([c["t_start"] for c in self.chunks], dtype=np.int64)
+        self._chunk_ends = np.array([c["t_end"] for c in self.chunks], dtype=np.int64)
+
+    def __len__(self):
+        return sum(c["n"] for c in self.chunks)
+
+    @property
+    def start(self):
+        return self.t_base + (self.chunks[0]["t_start"] / 1e6 if self.chunks else 0.0)
+
+    @property
+    def end(self):
+        return self.t_base + (self.chunks[-1]["t_end"] / 1e6 if self.chunks else 0.0)
+
+    def _decode_chunk(self, chunk):
+        cols = [decode_column(self._mm[c["offset"]:c["offset"] + c["length"]]) for c in chunk["columns"]]
+        return cols[0], np.stack(cols[1:], axis=1)
+
+    def read_range(self, start=None, end=None):
+        """Returns (t epoch seconds, (N, 6) float32 ax..gz) for samples with start <= t <= end."""
+        lo = -np.inf if start is None else (start - self.t_base) * 1e6
+        hi = np.inf if end is None else (end - self.t_base) * 1e6
+        # Chunks are in time order, so the overlapping ones form a contiguous run
+        first = int(np.searchsorted(self._chunk_ends, lo, side='left'))
+        last = int(np.searchsorted(self._chunk_starts, hi, side='right'))
+        ts, rows = [], []
+        for chunk in self.chunks[first:last]:
+            t_us, raw = self._decode_chunk(chunk)
+            keep = (t_us >= lo) & (t_us <= hi)
+            ts.append(t_us[keep])
+            rows.append(raw[keep])
+        if not ts:
+            return np.empty(0), np.empty((0, 6), dtype=np.float32)
+        t_us = np.concatenate(ts)
+        raw = np.concatenate(rows)
+        return self.t_base + t_us / 1e6, (raw / self.scales).astype(np.float32)
+
+    def read_swing(self, index):
+        """Returns the samples of the index-th detected swing, see read_range."""
+        a, b = self.swings[index]
+        return self.read_range(a, b)
+
+    def read_all(self):
+        return self.read_range()
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def convert_recording(src, dst):
+    """Converts a JSON-lines recording (see recording.py) to an archive. Returns the sample count."""
+    from birdie.server.history import load_jsonl_session
+    session = load_jsonl_session(src)
+    rows = np.stack([session.channels[c] for c in ('ax', 'ay', 'az', 'gx', 'gy', 'gz')], axis=1)
+    write_archive(dst, session.t, rows)
+    return len(session.t)
@@ -0,0 +1,207 @@
+# dashboard.py
+import math
+import os
+import threading
+import time
+
+from flask import Flask, render_template, request
+from flask_socketio import SocketIO, join_room, leave_room
+
+from birdie.game.config import CONFIG
+from birdie.server.metrics import SENSOR_WINDOW
+from birdie.server.ring import SampleRing, encode_frame
+from birdie.server.rolling import RollingStats
+from birdie.server.history import SessionStore, register_history_routes
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+DASHBOARD_EMIT_HZ = float(CONFIG.get('dashboard_emit_hz', 20.0))
+DASHBOARD_SWING_ACCEL_G = float(CONFIG.get('dashboard_swing_accel_g', 0.5))   # |accel| deviation from 1 g
+DASHBOARD_SWING_GYRO_DPS = float(CONFIG.get('dashboard_swing_gyro_dps', 150.0))
+DASHBOARD_SWING_HOLD_S = float(CONFIG.get('dashboard_swing_hold_s', 1.0))
+DASHBOARD_ROLLING_WINDOW_S = float(CONFIG.get('dashboard_rolling_window_s', 2.0))
+GYRO_RATE_IS_RAD_PER_S = bool(CONFIG.get('gyro_rate_is_rad_per_s', False))
+SESSION_DIR = os.path.expanduser(CONFIG.get('session_dir', '~/birdie-sessions'))
+
+# Socket.IO rooms: per-sample JSON (default) vs. opt-in batched binary frames
+JSON_ROOM = 'json'
+BINARY_ROOM = 'binary'
+
+ROLLING_CHANNELS = ('ax', 'ay', 'az', 'gx', 'gy', 'gz', 'accel', 'gyro')
+
+
+class WindowStats:
+    """Running min/max/mean of one value over the current emit window."""
+    __slots__ = ('count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, v):
+        self.count += 1
+        self.total += v
+        if v < self.min: self.min = v
+        if v > self.max: self.max = v
+
+    def summary(self):
+        if not self.count:
+            return {"min": 0.0, "max": 0.0, "mean": 0.0}
+        return {"min": self.min, "max": self.max, "mean": self.total / self.count}
+
+
+def _number(value, default=0.0):
+    """float(value), or `default` when the club sent null or something non-numeric."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _vec(d):
+    if not isinstance(d, dict):
+        return 0.0, 0.0, 0.0
+    return float(d.get('x', 0.0)), float(d.get('y', 0.0)), float(d.get('z', 0.0))
+
+
+class DashboardBridge:
+    """
+    SensorServer listener that aggregates samples in O(1) per packet and
+    pushes one `sensor_data` / `processed_data` pair per emit tick, no matter
+    how fast the club streams or how many browsers are connected. Clients in
+    BINARY_ROOM instead get every sample since the last tick as one
+    `sample_frame` (see ring.encode_frame). Rolling statistics over the last
+    DASHBOARD_ROLLING_WINDOW_S ride along in `processed_data` and the metrics.
+    """
+    def __init__(self, socketio, emit_hz=DASHBOARD_EMIT_HZ):
+        self.socketio = socketio
+        self.emit_hz = emit_hz
+        self.binary_clients = set()
+        self.ring = SampleRing(t0=time.time())
+        self._ring_cursor = 0
+        self._lock = threading.Lock()
+        self._latest = None
+        self._accel = WindowStats()
+        self._gyro = WindowStats()
+        self.rolling = RollingStats(DASHBOARD_ROLLING_WINDOW_S, ROLLING_CHANNELS)
+        self._last_swing_time = 0.0
+        self._running = False
+
+    def __call__(self, sensor_data):
+        """Called from the SensorServer thread for every packet."""
+        try:
+            ax, ay, az = _vec(sensor_data.get('accelerometer'))
+            gx, gy, gz = _vec(sensor_data.get('gyroscope_rate', sensor_data.get('gyroscope')))
+        except (TypeError, ValueError, AttributeError):
+            return
+        if GYRO_RATE_IS_RAD_PER_S:
+            gx, gy, gz = math.degrees(gx), math.degrees(gy), math.degrees(gz)
+        accel_mag = math.sqrt(ax * ax + ay * ay + az * az)
+        gyro_mag = math.sqrt(gx * gx + gy * gy + gz * gz)
+
+        now = time.time()
+        with self._lock:
+            self._latest = (ax, ay, az, gx, gy, gz, _number(sensor_data.get('temperature')))
+            self.ring.push(now, ax, ay, az, gx, gy, gz)
+            self._accel.add(accel_mag)
+            self._gyro.add(gyro_mag)
+            self.rolling.push(now, (ax, ay, az, gx, gy, gz, accel_mag, gyro_mag))
+            if abs(accel_mag - 1.0) >= DASHBOARD_SWING_ACCEL_G or gyro_mag >= DASHBOARD_SWING_GYRO_DPS:
+                self._last_swing_time = now
+
+    def _take_window(self):
+        with self._lock:
+            latest, accel, gyro = self._latest, self._accel, self._gyro
+            self._accel, self._gyro = WindowStats(), WindowStats()
+            swing = (time.time() - self._last_swing_time) <= DASHBOARD_SWING_HOLD_S
+            rolling = self.rolling.publish(SENSOR_WINDOW, 'dashboard')
+            frame = None
+            if self.binary_clients:
+                rows, self._ring_cursor = self.ring.since(self._ring_cursor)
+                frame = encode_frame(rows, self.ring.t0)
+            else:
+                self._ring_cursor = self.ring.written
+        return latest, accel, gyro, swing, rolling, frame
+
+    def _emit_loop(self):
+        period = 1.0 / self.emit_hz
+        while self._running:
+            self.socketio.sleep(period)
+            latest, accel, gyro, swing, rolling, frame = self._take_window()
+            if latest is None or accel.count == 0:
+                continue
+            ax, ay, az, gx, gy, gz, temperature = latest
+            self.socketio.emit('sensor_data', {
+                "accelerometer": {"x": ax, "y": ay, "z": az},
+                "gyroscope": {"x": gx, "y": gy, "z": gz},
+                "temperature": temperature,
+            }, to=JSON_ROOM)
+            if frame is not None:
+                self.socketio.emit('sample_frame', frame, to=BINARY_ROOM)
+            accel_summary, gyro_summary = accel.summary(), gyro.summary()
+            self.socketio.emit('processed_data', {
+                "metrics": {
+                    "accel_magnitude": accel_summary["mean"],
+                    "gyro_magnitude": gyro_summary["mean"],
+                    "accel": accel_summary,
+                    "gyro": gyro_summary,
+                    "samples": accel.count,
+                    "window_s": period,
+                    "swing_detected": swing,
+                    "rolling": rolling,
+                    "rolling_window_s": DASHBOARD_ROLLING_WINDOW_S,
+                }
+            })
+
+    def start(self):
+        self._running = True
+        self.socketio.start_background_task(self._emit_loop)
+
+    def stop(self):
+        self._running = False
+
+
+def create_dashboard(sensor_server, emit_hz=DASHBOARD_EMIT_HZ, session_dir=SESSION_DIR, spectator_port=None):
+    """Builds the Flask app and Socket.IO server fed by `sensor_server`."""
+    app = Flask(__name__, template_folder=TEMPLATE_DIR)
+    register_history_routes(app, SessionStore(session_dir))
+    # Threading mode: samples arrive on SensorServer's native thread
+    socketio = SocketIO(app, async_mode='threading', cors_allowed_origins='*')
+
+    @app.route('/')
+    def index():
+        return render_template('dashboard.html')
+
+    bridge = DashboardBridge(socketio, emit_hz)
+
+    @socketio.on('connect')
+    def on_connect():
+        join_room(JSON_ROOM)
+
+    @socketio.on('disconnect')
+    def on_disconnect():
+        bridge.binary_clients.discard(request.sid)
+
+    @socketio.on('subscribe_binary')
+    def on_subscribe_binary():
+        leave_room(JSON_ROOM)
+        join_room(BINARY_ROOM)
+        bridge.binary_clients.add(request.sid)
+
+    @socketio.on('unsubscribe_binary')
+    def on_unsubscribe_binary():
+        leave_room(BINARY_ROOM)
+        join_room(JSON_ROOM)
+        bridge.binary_clients.discard(request.sid)
+
+    sensor_server.add_listener(bridge)
+    bridge.start()
+
+    from birdie.server.venue import register_venue
+    app.extensions['birdie_venue'] = register_venue(app, socketio, sensor_server)
+    if spectator_port:
+        from birdie.server.spectator import register_spectator
+        app.extensions['birdie_spectator'] = register_spectator(app, socketio, spectator_port)
+    return app, socketio, bridge
@@ -0,0 +1,230 @@
+# history.py
+import os
+import threading
+
+import numpy as np
+
+from birdie.server.recording import iter_recording
+
+CHANNELS = ('ax', 'ay', 'az', 'gx', 'gy', 'gz', 'accel_mag', 'gyro_mag')
+SESSION_EXTENSIONS = ('.jsonl', '.brda')
+
+# Pyramid levels shrink by PYRAMID_FACTOR; each keeps the min and max of every
+# block so spikes survive. Levels stop once they are this small.
+PYRAMID_FACTOR = 4
+PYRAMID_MIN_POINTS = 1024
+# A level is fine enough for a request when it has this many points per output pixel
+POINTS_PER_PIXEL = 4
+# Largest ?width= a range query honours; wider requests get this many points
+MAX_QUERY_WIDTH = 10000
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling. Returns the indices of the
+    `n_out` points kept, always including the first and last point.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket boundaries for the n - 2 interior points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Mean point of each bucket, used as the third triangle vertex
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = sums_x / counts
+    avg_y = sums_y / counts
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 1 < n_out - 2:
+            cx, cy = avg_x[i + 1], avg_y[i + 1]
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        ax, ay = x[a], y[a]
+        bx, by = x[lo:hi], y[lo:hi]
+        # Twice the triangle area (sign dropped); the constant factor does not change the argmax
+        area = np.abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def _minmax_decimate(x, y, factor=PYRAMID_FACTOR):
+    """Keeps the min and max sample of every 2*factor block, in time order."""
+    block = 2 * factor
+    n = (len(x) // block) * block
+    if n == 0:
+        return x, y
+    yb = y[:n].reshape(-1, block)
+    base = np.arange(0, n, block)
+    i_min = base + np.argmin(yb, axis=1)
+    i_max = base + np.argmax(yb, axis=1)
+    idx = np.sort(np.concatenate((i_min, i_max)))
+    return x[idx], y[idx]
+
+
+class Session:
+    """A recorded session held as NumPy arrays with a per-channel resolution pyramid."""
+    def __init__(self, name, t, values):
+        self.name = name
+        self.t = t                      # float64 epoch seconds
+        self.channels = values          # name -> float32 array
+        self.pyramids = {c: self._build_pyramid(v) for c, v in values.items()}
+
+    def _build_pyramid(self, y):
+        levels = [(self.t, y)]
+        while len(levels[-1][0]) > PYRAMID_MIN_POINTS:
+            lx, ly = _minmax_decimate(*levels[-1])
+            if len(lx) >= len(levels[-1][0]):
+                break
+            levels.append((lx, ly))
+        return levels
+
+    @property
+    def start(self):
+        return float(self.t[0]) if len(self.t) else 0.0
+
+    @property
+    def end(self):
+        return float(self.t[-1]) if len(self.t) else 0.0
+
+    def query(self, channel, start, end, width):
+        """Returns (t, y) for `channel` within [start, end] reduced to about `width` points."""
+        levels = self.pyramids[channel]
+        target = max(3, int(width))
+        # Coarsest level that still has enough points in range, then LTTB down to the width
+        chosen = levels[0]
+        for lx, ly in reversed(levels):
+            i, j = np.searchsorted(lx, (start, end), side='left')
+            if j - i >= target * POINTS_PER_PIXEL:
+                chosen = (lx, ly)
+                break
+        lx, ly = chosen
+        i, j = np.searchsorted(lx, (start, end), side='left')
+        j = min(len(lx), j + 1)
+        sx, sy = lx[i:j], ly[i:j]
+        keep = lttb(sx - start, sy.astype(np.float64), target)
+        return sx[keep], sy[keep]
+
+
+def session_from_rows(name, t, rows):
+    """Builds a Session from times and an (N, 6) array of ax, ay, az, gx, gy, gz."""
+    rows = np.asarray(rows, dtype=np.float32)
+    values = {c: np.ascontiguousarray(rows[:, k]) for k, c in enumerate(CHANNELS[:6])}
+    values['accel_mag'] = np.sqrt((rows[:, 0:3].astype(np.float64) ** 2).sum(axis=1)).astype(np.float32)
+    values['gyro_mag'] = np.sqrt((rows[:, 3:6].astype(np.float64) ** 2).sum(axis=1)).astype(np.float32)
+    return Session(name, np.asarray(t, dtype=np.float64), values)
+
+
+def load_jsonl_session(path):
+    times, rows = [], []
+    for t, data in iter_recording(path):
+        a = data.get('accelerometer') or {}
+        g = data.get('gyroscope_rate') or data.get('gyroscope') or {}
+        try:
+            rows.append((float(a['x']), float(a['y']), float(a['z']),
+                         float(g['x']), float(g['y']), float(g['z'])))
+        except (KeyError, TypeError, ValueError):
+            continue
+        times.append(t)
+    rows = np.array(rows, dtype=np.float32).reshape(-1, 6)
+    return session_from_rows(os.path.basename(path), times, rows)
+
+
+def load_archive_session(path):
+    from birdie.server.archive import ArchiveReader
+    with ArchiveReader(path) as reader:
+        t, rows = reader.read_all()
+    return session_from_rows(os.path.basename(path), t, rows)
+
+
+class SessionStore:
+    """Loads sessions from a directory on first use and caches them until the file changes."""
+    def __init__(self, session_dir):
+        self.session_dir = session_dir
+        self._cache = {}   # name -> (mtime, Session)
+        self._lock = threading.Lock()
+
+    def names(self):
+        if not os.path.isdir(self.session_dir):
+            return []
+        return sorted(n for n in os.listdir(self.session_dir) if n.endswith(SESSION_EXTENSIONS))
+
+    def info(self, name):
+        """
+        Listing entry for `name` from the file alone: size and modification time,
+        plus the sample count and time span when the session is already loaded.
+        """
+        path = os.path.join(self.session_dir, name)
+        stat = os.stat(path)
+        entry = {"name": name, "bytes": stat.st_size, "modified": stat.st_mtime}
+        with self._lock:
+            cached = self._cache.get(name)
+        if cached and cached[0] == stat.st_mtime:
+            session = cached[1]
+            entry.update(samples=len(session.t), start=session.start, end=session.end)
+        return entry
+
+    def get(self, name):
+        if name not in self.names():
+            raise KeyError(name)
+        path = os.path.join(self.session_dir, name)
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        loader = load_archive_session if name.endswith('.brda') else load_jsonl_session
+        session = loader(path)
+        with self._lock:
+            self._cache[name] = (mtime, session)
+        return session
+
+
+def register_history_routes(app, store):
+    """Adds the session listing and range query endpoints to a Flask app."""
+    from flask import abort, jsonify, request
+
+    @app.route('/api/sessions')
+    def list_sessions():
+        # Sessions are only parsed when queried; listing one must not load it
+        result = []
+        for name in store.names():
+            try:
+                result.append(store.info(name))
+            except OSError:
+                continue    # removed since names()
+        return jsonify(result)
+
+    @app.route('/api/sessions/<name>')
+    def query_session(name):
+        """
+        ?start=&end= are seconds from the session start (default: all),
+        ?width= is the target point count (pixels), ?channels=ax,accel_mag,...
+        """
+        try:
+            session = store.get(name)
+        except KeyError:
+            abort(404)
+        try:
+            start = session.start + float(request.args.get('start', 0.0))
+            end = session.start + float(request.args['end']) if 'end' in request.args else session.end
+            width = min(int(request.args.get('width', 1000)), MAX_QUERY_WIDTH)
+        except ValueError:
+            abort(400)
+        channels = request.args.get('channels', 'accel_mag,gyro_mag').split(',')
+        if any(c not in CHANNELS for c in channels):
+            abort(400)
+
+        result = {}
+        for channel in channels:
+            t, y = session.query(channel, start, end, width)
+            result[channel] = {"t": (t - session.start).tolist(), "y": y.tolist()}
+        return jsonify({"name": name, "start": session.start, "channels": result})
@@ -0,0 +1,243 @@
+# jitter.py
+"""
+Per-device jitter buffer: turns bursty, reordered, lossy UDP sensor packets
+into a uniformly sampled stream.
+
+Packets are placed on the sender's clock (`t_us`, unwrapped) and ordered by
+`seq`. A packet sent at t is played out at t + offset + delay, where offset
+is the smallest transit seen (clock offset plus base latency) and delay
+adapts to the recent jitter: a decaying peak of the excess transit, plus one
+source sample spacing so there is always a sample on each side to
+interpolate between. `pull` resamples everything up to the playout time onto
+a fixed grid with np.interp, so lost packets are bridged by interpolation.
+When playout reaches past the newest packet it stops there (no
+extrapolation), counts an underrun and raises the delay. A packet sent more
+than JITTER_MAX_GAP_S before the playout cursor, or stamped that much later
+than its arrival allows, means the club restarted (seq and t_us back near
+0): the buffer drops its state and starts a new stream from it.
+"""
+import bisect
+import math
+import threading
+
+import numpy as np
+
+from ..game.config import CONFIG
+from .metrics import JITTER_BUFFER_DELAY, JITTER_BUFFER_LATE, JITTER_BUFFER_LOST, JITTER_BUFFER_UNDERRUNS
+
+RESAMPLE_HZ = float(CONFIG.get('jitter_resample_hz', 100.0))
+JITTER_MIN_DELAY_S = float(CONFIG.get('jitter_min_delay_s', 0.01))
+JITTER_MAX_DELAY_S = float(CONFIG.get('jitter_max_delay_s', 0.25))
+JITTER_DECAY_S = float(CONFIG.get('jitter_decay_s', 5.0))     # how fast the delay shrinks after a burst
+JITTER_MAX_GAP_S = float(CONFIG.get('jitter_max_gap_s', 0.5))  # longer silences restart the stream
+# Sender and receiver clocks drift apart; let the transit floor creep up this much per second
+OFFSET_RELAX_PER_S = 1e-4
+
+CHANNELS = 6   # ax ay az gx gy gz
+_WRAP = 1 << 32
+_HALF_WRAP = 1 << 31
+
+
+def _unwrap(value, reference_raw, reference):
+    """Unwraps a uint32 counter within half a wrap of a reference (before or after it)."""
+    return reference + ((value - reference_raw + _HALF_WRAP) % _WRAP) - _HALF_WRAP
+
+
+def _interp(grid, data):
+    """Rows `data` (t, then one column per channel) linearly interpolated at the times `grid`."""
+    out = np.empty((len(grid), data.shape[1] - 1))
+    for c in range(out.shape[1]):
+        out[:, c] = np.interp(grid, data[:, 0], data[:, c + 1])
+    return out
+
+
+def resample(t, values, rate_hz=RESAMPLE_HZ):
+    """
+    What a JitterBuffer plays out for a stream that arrives complete and in order:
+    `values` (N, channels) sampled at sender times `t` (ascending), interpolated onto
+    the `rate_hz` grid from the first sample, restarting after gaps over JITTER_MAX_GAP_S.
+    Offline replays use it so the detector sees the rate it runs at live.
+    """
+    t = np.asarray(t, dtype=float)
+    data = np.column_stack((t, np.asarray(values, dtype=float).reshape(len(t), -1)))
+    period = 1.0 / rate_hz
+    times, out = [np.empty(0)], [np.empty((0, data.shape[1] - 1))]
+    for segment in np.split(data, np.flatnonzero(np.diff(t) > JITTER_MAX_GAP_S) + 1):
+        if not len(segment):
+            continue
+        k = int(math.floor((segment[-1, 0] - segment[0, 0]) / period + 1e-9)) + 1
+        grid = segment[0, 0] + period * np.arange(k)
+        times.append(grid)
+        out.append(_interp(grid, segment))
+    return np.concatenate(times), np.concatenate(out)
+
+
+class JitterBuffer:
+    def __init__(self, device=None, rate_hz=RESAMPLE_HZ, min_delay_s=JITTER_MIN_DELAY_S,
+                 max_delay_s=JITTER_MAX_DELAY_S):
+        self.labels = (str(device),)
+        self.period = 1.0 / rate_hz
+        self.min_delay_s = min_delay_s
+        self.max_delay_s = max_delay_s
+        self.delay_s = min_delay_s    # playout delay on top of the base transit: the buffer's added latency
+        self.underruns = 0
+        self.late = 0                 # arrived after their time was played out, or duplicates
+        self.lost = 0                 # never arrived; bridged by interpolation
+        self.invalid = 0
+        self.temperature = None
+        self.restarts = 0             # sender restarts (reboots) seen
+        self._lock = threading.Lock()
+        self._spacing = self.period   # source sample spacing, smoothed
+        self._reset_stream()
+
+    def _reset_stream(self):
+        """Forgets the current stream: the next packet is placed as if it were the first."""
+        self._seqs = []               # unwrapped seq, ascending
+        self._rows = []               # (t_src, ax, ay, az, gx, gy, gz), same order
+        self._seq_ref = None          # (raw, unwrapped) of the last packet placed
+        self._t_ref = None            # (raw t_us, unwrapped t_us) of the last packet placed
+        self._offset = None
+        self._last_arrival = None
+        self._jitter_peak = 0.0
+        self._cursor = None           # sender time of the last sample played out
+        self._stalled = False
+        self._last_seq_out = None
+
+    def _place(self, seq, t_us, arrival):
+        """
+        (unwrapped seq, sender seconds) of a packet. Each counter is unwrapped against the
+        last packet placed, so streams of any length stay within half a wrap of the reference.
+        """
+        # Without seq/t_us (older firmware) fall back to arrival order and arrival time
+        if isinstance(seq, int):
+            useq = _unwrap(seq, *self._seq_ref) if self._seq_ref is not None else 0
+            self._seq_ref = (seq, useq)
+        else:
+            useq = (self._seqs[-1] + 1) if self._seqs else 0
+        if isinstance(t_us, int):
+            ut = _unwrap(t_us, *self._t_ref) if self._t_ref is not None else 0
+            self._t_ref = (t_us, ut)
+            t_src = ut / 1e6
+        else:
+            t_src = arrival
+        return useq, t_src
+
+    def push(self, sample, arrival):
+        """Adds one packet received at `arrival` (receiver seconds). Thread-safe."""
+        try:
+            accel = sample['accelerometer']
+            gyro = sample.get('gyroscope_rate')
+            if not isinstance(gyro, dict):
+                gyro = sample['gyroscope']
+            row = [float(accel['x']), float(accel['y']), float(accel['z']),
+                   float(gyro['x']), float(gyro['y']), float(gyro['z'])]
+        except (KeyError, TypeError, ValueError, AttributeError):
+            self.invalid += 1
+            return False
+        seq, t_us = sample.get('seq'), sample.get('t_us')
+        temperature = sample.get('temperature')
+
+        with self._lock:
+            if isinstance(temperature, (int, float)):
+                self.temperature = float(temperature)
+            useq, t_src = self._place(seq, t_us, arrival)
+            played = self._cursor if self._cursor is not None else (self._rows[-1][0] if self._rows else None)
+            behind = played is not None and t_src < played - JITTER_MAX_GAP_S
+            # A counter that reset past half a wrap unwraps forward instead: sent "later" than it arrived
+            ahead = self._offset is not None and arrival - t_src < self._offset - JITTER_MAX_GAP_S
+            if behind or ahead:
+                # Far from anything a late or early packet could be: the club restarted its clock and counters
+                self.restarts += 1
+                self._reset_stream()
+                useq, t_src = self._place(seq, t_us, arrival)
+
+            transit = arrival - t_src
+            if self._offset is None:
+                self._offset = transit
+            else:
+                self._offset = min(self._offset + OFFSET_RELAX_PER_S * max(0.0, arrival - self._last_arrival),
+                                   transit)
+                # Peak-hold of the excess transit, decaying so the delay shrinks when the link calms down
+                decay = math.exp(-max(0.0, arrival - self._last_arrival) / JITTER_DECAY_S)
+                self._jitter_peak = max(transit - self._offset, self._jitter_peak * decay)
+            self._last_arrival = arrival
+            self._update_delay()
+
+            i = bisect.bisect_left(self._seqs, useq)
+            if (self._cursor is not None and t_src <= self._cursor) \
+                    or (i < len(self._seqs) and self._seqs[i] == useq):
+                self.late += 1
+                JITTER_BUFFER_LATE.inc(self.labels)
+                return False
+            if i > 0:
+                spacing = (t_src - self._rows[i - 1][0]) / (useq - self._seqs[i - 1])
+                if 0.0 < spacing < JITTER_MAX_GAP_S:
+                    self._spacing += 0.05 * (spacing - self._spacing)
+            self._seqs.insert(i, useq)
+            self._rows.insert(i, (t_src, *row))
+        return True
+
+    def _update_delay(self):
+        delay = self._jitter_peak + self._spacing
+        self.delay_s = min(self.max_delay_s, max(self.min_delay_s, delay))
+        JITTER_BUFFER_DELAY.set(self.delay_s, self.labels)
+
+    def pull(self, now):
+        """
+        Returns (times, values) of the uniform samples whose playout time has
+        come by `now` (receiver seconds): (K,) sender-clock seconds and (K, 6)
+        ax ay az gx gy gz. K may be 0.
+        """
+        with self._lock:
+            if not self._rows:
+                return np.empty(0), np.empty((0, CHANNELS))
+            playout = now - self._offset - self.delay_s
+            rows = self._rows
+            # First packet, or a long silence: (re)start at the next packet instead of interpolating across
+            i = 0 if self._cursor is None else bisect.bisect_right(rows, (self._cursor, math.inf))
+            if i < len(rows) and (self._cursor is None or rows[i][0] - self._cursor > JITTER_MAX_GAP_S):
+                self._cursor = rows[i][0] - self.period
+                self._last_seq_out = None
+
+            newest = rows[-1][0]
+            due = self._cursor + self.period
+            if due <= playout and due > newest:
+                # Due but not here yet: hold at the newest sample and, once per stall, give the link more slack
+                if not self._stalled:
+                    self._stalled = True
+                    self.underruns += 1
+                    JITTER_BUFFER_UNDERRUNS.inc(self.labels)
+                    self._jitter_peak = min(self.max_delay_s, self._jitter_peak + self.period)
+                    self._update_delay()
+            else:
+                self._stalled = False
+            end = min(playout, newest)
+            k = int(math.floor((end - self._cursor) / self.period + 1e-9))
+            if k <= 0:
+                return np.empty(0), np.empty((0, CHANNELS))
+
+            grid = self._cursor + self.period * np.arange(1, k + 1)
+            out = _interp(grid, np.array(rows))
+            self._cursor = float(grid[-1])
+
+            # Keep the last packet at or before the cursor as the left end of the next interpolation
+            keep = max(0, bisect.bisect_right(rows, (self._cursor, math.inf)) - 1)
+            for useq in self._seqs[:keep + 1]:
+                if self._last_seq_out is not None and useq > self._last_seq_out + 1:
+                    self.lost += useq - self._last_seq_out - 1
+                    JITTER_BUFFER_LOST.inc(self.labels, useq - self._last_seq_out - 1)
+                self._last_seq_out = useq if self._last_seq_out is None else max(self._last_seq_out, useq)
+            del self._seqs[:keep]
+            del self._rows[:keep]
+            return grid, out
+
+    def playout_lag(self, now):
+        """Seconds from the send time of the newest sample played out to `now`, less the base transit."""
+        with self._lock:
+            if self._cursor is None:
+                return 0.0
+            return max(0.0, now - self._offset - self._cursor)
+
+    def stats(self):
+        return {"delay_s": self.delay_s, "underruns": self.underruns, "late": self.late,
+                "lost": self.lost, "invalid": self.invalid, "restarts": self.restarts}
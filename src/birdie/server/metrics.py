@@ -0,0 +1,286 @@
+# metrics.py
+"""
+Prometheus text-format metrics for ingestion and game health.
+
+Hot paths never take a lock: each thread updates its own cells (a dict per
+metric per thread) and a scrape sums the cells of every thread. Only the
+first update from a new thread registers its cells, under a lock.
+Standard library only, so `birdie serve` stays light.
+"""
+import bisect
+import threading
+
+# Histogram buckets, in seconds unless noted
+INTERARRIVAL_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0)
+DURATION_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+STEPS_BUCKETS = (0, 1, 2, 3, 4, 5, 6, 8, 12, 16)
+
+
+def _escape(value):
+    """A label value as the text format requires: backslash, double quote and newline escaped."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + [f'{n}="{_escape(v)}"' for n, v in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(v):
+    if v == float('inf'):
+        return '+Inf'
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._all_cells = []
+        self._register_lock = threading.Lock()
+
+    def _cells(self):
+        """This thread's {label values: cell} dict."""
+        try:
+            return self._local.cells
+        except AttributeError:
+            cells = self._local.cells = {}
+            with self._register_lock:
+                self._all_cells.append(cells)
+            return cells
+
+    def _snapshot(self):
+        # dict.copy() runs without releasing the GIL, so a writer cannot change it mid-copy
+        with self._register_lock:
+            return [cells.copy() for cells in self._all_cells]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._render_samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, labels=(), amount=1):
+        cells = self._cells()
+        cells[labels] = cells.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        return sum(cells.get(labels, 0) for cells in self._snapshot())
+
+    def _render_samples(self):
+        totals = {}
+        for cells in self._snapshot():
+            for labels, v in cells.items():
+                totals[labels] = totals.get(labels, 0) + v
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+                for k, v in sorted(totals.items())]
+
+
+class Gauge(_Metric):
+    """Last value set wins; gauges are written by a single owner (e.g. the game loop)."""
+    kind = 'gauge'
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self._values = {}
+
+    def set(self, value, labels=()):
+        self._values[labels] = value
+
+    def value(self, labels=()):
+        return self._values.get(labels, 0.0)
+
+    def _render_samples(self):
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+                for k, v in sorted(self._values.copy().items())]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, labels=()):
+        cells = self._cells()
+        cell = cells.get(labels)
+        if cell is None:
+            # Per-bucket counts, then the +Inf bucket, sum and count
+            cell = cells[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def _render_samples(self):
+        totals = {}
+        for cells in self._snapshot():
+            for labels, cell in cells.items():
+                cell = list(cell)
+                if labels in totals:
+                    totals[labels] = [a + b for a, b in zip(totals[labels], cell)]
+                else:
+                    totals[labels] = cell
+        lines = []
+        for labels, cell in sorted(totals.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float('inf'),), cell):
+                cumulative += n
+                le = (('le', _format_value(float(bound))),)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(cell[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cell[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._add(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._add(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, buckets, labelnames=()):
+        return self._add(Histogram(name, help_text, buckets, labelnames))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+# --- Ingestion (SensorServer thread) ---
+PACKETS_RECEIVED = REGISTRY.counter('birdie_packets_received_total', "UDP sensor packets received", ('device',))
+PACKETS_INVALID = REGISTRY.counter('birdie_packets_invalid_total', "Packets that were not valid JSON", ('device',))
+PACKETS_DROPPED = REGISTRY.counter('birdie_packets_dropped_total', "Packets missing from the sequence", ('device',))
+PACKETS_LATE = REGISTRY.counter('birdie_packets_late_total', "Duplicate or out-of-order packets", ('device',))
+SEQ_GAPS = REGISTRY.counter('birdie_seq_gaps_total', "Sequence discontinuities (one or more lost packets)", ('device',))
+LINK_RESETS = REGISTRY.counter('birdie_link_resets_total', "Sender restarts (sequence jumped far back, e.g. a reboot)",
+                               ('device',))
+INTERARRIVAL = REGISTRY.histogram('birdie_packet_interarrival_seconds', "Time between packets from a device",
+                                  INTERARRIVAL_BUCKETS, ('device',))
+JITTER = REGISTRY.gauge('birdie_packet_jitter_seconds', "Smoothed inter-arrival jitter (RFC 3550 estimator)",
+                        ('device',))
+DECODE_TIME = REGISTRY.histogram('birdie_packet_decode_seconds', "Time to decode one packet", DURATION_BUCKETS)
+
+# --- Game loop ---
+DETECTOR_TIME = REGISTRY.histogram('birdie_detector_seconds', "Time spent in the shot detector per frame",
+                                   DURATION_BUCKETS)
+SHOTS_FIRED = REGISTRY.counter('birdie_shots_fired_total', "Shots fired in the game", ('mode',))
+FPS = REGISTRY.gauge('birdie_game_fps', "Rendered frames per second")
+AIM_LATENCY = REGISTRY.gauge('birdie_aim_latency_seconds',
+                             "Estimated club-to-screen latency the aim is extrapolated over")
+PHYSICS_STEPS = REGISTRY.histogram('birdie_physics_steps_per_frame', "Fixed physics steps run per frame",
+                                   STEPS_BUCKETS)
+
+# --- Jitter buffer (see jitter.py) ---
+JITTER_BUFFER_DELAY = REGISTRY.gauge('birdie_jitter_buffer_delay_seconds',
+                                     "Playout delay the jitter buffer adds", ('device',))
+JITTER_BUFFER_UNDERRUNS = REGISTRY.counter('birdie_jitter_buffer_underruns_total',
+                                           "Times playout caught up with the newest packet", ('device',))
+JITTER_BUFFER_LATE = REGISTRY.counter('birdie_jitter_buffer_late_total',
+                                      "Packets that arrived after their playout time, or duplicates", ('device',))
+JITTER_BUFFER_LOST = REGISTRY.counter('birdie_jitter_buffer_lost_total',
+                                      "Packets that never arrived, bridged by interpolation", ('device',))
+
+# --- Rolling sensor features (see rolling.py) ---
+SENSOR_WINDOW = REGISTRY.gauge('birdie_sensor_window', "Rolling-window statistics of sensor features",
+                               ('source', 'channel', 'stat'))
+
+
+class LinkTracker:
+    """
+    Per-device packet accounting for the SensorServer thread: sequence gaps,
+    drops, reordering, inter-arrival time and jitter. Uses the packet's `seq`
+    and `t_us` (sender clock) when the firmware provides them. A seq more
+    than MAX_REORDER behind the last one is a restarted sender, not a late
+    packet: the link is re-seeded from it. Device ids come from the packets,
+    so only the first MAX_DEVICES get their own labels; packets from any
+    others are counted as OVERFLOW_DEVICE.
+    """
+    JITTER_GAIN = 1.0 / 16.0
+    MAX_REORDER = 64
+    MAX_DEVICES = 64
+    OVERFLOW_DEVICE = 'other'
+
+    def __init__(self):
+        self._links = {}   # device -> [last_seq, last_arrival, last_t_us, jitter]
+
+    def packet(self, device, sensor_data, arrival):
+        link = self._links.get(device)
+        if link is None and len(self._links) >= self.MAX_DEVICES:
+            PACKETS_RECEIVED.inc((self.OVERFLOW_DEVICE,))
+            return
+        labels = (device,)
+        PACKETS_RECEIVED.inc(labels)
+        seq = sensor_data.get('seq')
+        t_us = sensor_data.get('t_us')
+        if link is None:
+            self._links[device] = [seq, arrival, t_us, 0.0]
+            return
+        last_seq, last_arrival, last_t_us, jitter = link
+
+        if isinstance(seq, int) and isinstance(last_seq, int):
+            gap = seq - last_seq
+            if gap < -self.MAX_REORDER:
+                LINK_RESETS.inc(labels)
+                link[:] = [seq, arrival, t_us, jitter]
+                return
+            if gap <= 0:
+                PACKETS_LATE.inc(labels)
+                return
+            if gap > 1:
+                SEQ_GAPS.inc(labels)
+                PACKETS_DROPPED.inc(labels, gap - 1)
+
+        interarrival = arrival - last_arrival
+        INTERARRIVAL.observe(interarrival, labels)
+        if isinstance(t_us, (int, float)) and isinstance(last_t_us, (int, float)):
+            # Transit-time difference: arrival spacing minus send spacing (t_us is a wrapping uint32)
+            d = interarrival - ((t_us - last_t_us) % (1 << 32)) / 1e6
+            jitter += (abs(d) - jitter) * self.JITTER_GAIN
+            JITTER.set(jitter, labels)
+        link[:] = [seq, arrival, t_us, jitter]
+
+
+def start_metrics_server(port, host='0.0.0.0', registry=REGISTRY):
+    """Serves `registry` at http://host:port/metrics from a daemon thread. Returns the HTTP server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    print(f"[METRICS] http://{host}:{port}/metrics")
+    return httpd
@@ -0,0 +1,67 @@
+# recording.py
+import json
+import socket
+import threading
+import time
+
+
+class Recorder:
+    """
+    SensorServer listener that appends every sample to a JSON-lines file:
+    {"t": <receive time, seconds>, "data": <packet as received>}
+    """
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', buffering=1 << 16)
+        self._lock = threading.Lock()
+
+    def __call__(self, sensor_data):
+        line = json.dumps({"t": time.time(), "data": sensor_data}, separators=(',', ':'))
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + '\n')
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def iter_recording(path):
+    """Yields (t, data) pairs from a JSON-lines recording, skipping damaged lines."""
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                yield float(entry["t"]), entry["data"]
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                continue
+
+
+def replay_recording(path, host='127.0.0.1', port=50000, speed=1.0):
+    """
+    Re-sends a recording as UDP packets, preserving the original spacing
+    divided by `speed`. speed <= 0 sends as fast as possible.
+    Returns the number of packets sent.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sent = 0
+    start_wall = time.perf_counter()
+    first_t = None
+    try:
+        for t, data in iter_recording(path):
+            if first_t is None:
+                first_t = t
+            if speed > 0:
+                delay = (t - first_t) / speed - (time.perf_counter() - start_wall)
+                if delay > 0:
+                    time.sleep(delay)
+            sock.sendto(json.dumps(data, separators=(',', ':')).encode('utf-8'), (host, port))
+            sent += 1
+    finally:
+        sock.close()
+    return sent
@@ -0,0 +1,54 @@
+# ring.py
+import struct
+import numpy as np
+
+# One row per sample. Times are seconds since the ring's t0 so they fit float32.
+SAMPLE_FIELDS = ('t', 'ax', 'ay', 'az', 'gx', 'gy', 'gz')
+SAMPLE_WIDTH = len(SAMPLE_FIELDS)
+
+# Binary frame: magic, version, fields per sample, sample count, t0 (epoch s),
+# followed by count * SAMPLE_WIDTH little-endian float32 values, row-major.
+FRAME_MAGIC = b'BRDS'
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct('<4sHHId')   # 20 bytes, keeps the payload 4-byte aligned
+
+
+class SampleRing:
+    """Fixed-capacity float32 ring of IMU samples with a monotonically increasing write cursor."""
+    def __init__(self, capacity=8192, t0=0.0):
+        self.capacity = capacity
+        self.t0 = t0
+        self.data = np.zeros((capacity, SAMPLE_WIDTH), dtype=np.float32)
+        self.written = 0   # total samples ever pushed
+
+    def push(self, t, ax, ay, az, gx, gy, gz):
+        self.data[self.written % self.capacity] = (t - self.t0, ax, ay, az, gx, gy, gz)
+        self.written += 1
+
+    def since(self, cursor):
+        """Returns (rows written after `cursor`, new cursor). Rows older than the capacity are lost."""
+        end = self.written
+        start = max(cursor, end - self.capacity)
+        if start >= end:
+            return self.data[:0], end
+        i, j = start % self.capacity, end % self.capacity
+        if i < j:
+            rows = self.data[i:j]
+        else:
+            rows = np.concatenate((self.data[i:], self.data[:j]))
+        return rows, end
+
+
+def encode_frame(rows, t0):
+    """Packs sample rows (N x SAMPLE_WIDTH float32) into one binary frame."""
+    rows = np.ascontiguousarray(rows, dtype='<f4')
+    return FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, SAMPLE_WIDTH, len(rows), t0) + rows.tobytes()
+
+
+def decode_frame(frame):
+    """Inverse of encode_frame: returns (rows, t0)."""
+    magic, version, width, count, t0 = FRAME_HEADER.unpack_from(frame)
+    if magic != FRAME_MAGIC or version != FRAME_VERSION:
+        raise ValueError("not a sample frame")
+    rows = np.frombuffer(frame, dtype='<f4', count=count * width, offset=FRAME_HEADER.size)
+    return rows.reshape(count, width), t0
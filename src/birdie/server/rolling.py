@@ -0,0 +1,139 @@
+# rolling.py
+"""
+Streaming statistics over a sliding time window, O(1) amortized per sample.
+
+Mean and variance are kept with Welford's update, applied in reverse when a
+sample leaves the window; min and max come from monotonic deques whose front
+is always the extreme of the window. RMS follows from the two:
+rms^2 = variance + mean^2. Nothing re-scans the window. Removing samples
+slowly accumulates rounding error, so the sums are recomputed from the window
+every RESYNC_EVICTIONS evictions (still O(1) amortized).
+Standard library only, so `birdie serve` stays light.
+"""
+import collections
+import math
+
+RESYNC_EVICTIONS = 1 << 16
+STATS = ('count', 'mean', 'std', 'rms', 'min', 'max')
+
+
+class RollingWindow:
+    """Statistics of one value over the samples of the last `window_s` seconds (by sample time)."""
+    __slots__ = ('window_s', 'count', 'mean', '_m2', '_samples', '_mins', '_maxs', '_evictions')
+
+    def __init__(self, window_s):
+        self.window_s = window_s
+        self._samples = collections.deque()   # (t, x), oldest first
+        self._mins = collections.deque()      # (t, x), x increasing: front is the minimum
+        self._maxs = collections.deque()      # (t, x), x decreasing: front is the maximum
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._evictions = 0
+        self._samples.clear()
+        self._mins.clear()
+        self._maxs.clear()
+
+    def push(self, t, x):
+        """Adds sample `x` taken at `t` (seconds, non-decreasing) and drops samples older than the window."""
+        samples, mins, maxs = self._samples, self._mins, self._maxs
+        item = (t, x)
+        samples.append(item)
+        n = self.count + 1
+        mean = self.mean
+        d = x - mean
+        mean += d / n
+        m2 = self._m2 + d * (x - mean)
+
+        while mins and mins[-1][1] >= x:
+            mins.pop()
+        mins.append(item)
+        while maxs and maxs[-1][1] <= x:
+            maxs.pop()
+        maxs.append(item)
+
+        cutoff = t - self.window_s
+        while samples[0][0] < cutoff:
+            old = samples.popleft()[1]
+            n -= 1
+            self._evictions += 1
+            d = old - mean
+            mean -= d / n
+            m2 -= d * (old - mean)
+        while mins[0][0] < cutoff:
+            mins.popleft()
+        while maxs[0][0] < cutoff:
+            maxs.popleft()
+        self.count, self.mean, self._m2 = n, mean, m2
+        if self._evictions >= RESYNC_EVICTIONS:
+            self._resync()
+
+    def _resync(self):
+        values = [x for _, x in self._samples]
+        self._evictions = 0
+        self.mean = math.fsum(values) / len(values) if values else 0.0
+        self._m2 = math.fsum((x - self.mean) ** 2 for x in values)
+
+    @property
+    def last(self):
+        """Newest sample, or None when empty."""
+        return self._samples[-1][1] if self._samples else None
+
+    @property
+    def variance(self):
+        return max(0.0, self._m2 / self.count) if self.count else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def rms(self):
+        return math.sqrt(self.variance + self.mean * self.mean)
+
+    @property
+    def min(self):
+        return self._mins[0][1] if self._mins else 0.0
+
+    @property
+    def max(self):
+        return self._maxs[0][1] if self._maxs else 0.0
+
+    def summary(self):
+        return {stat: getattr(self, stat) for stat in STATS}
+
+
+class RollingStats:
+    """A RollingWindow per named channel, all pushed together with the same timestamp."""
+    def __init__(self, window_s, channels):
+        self.window_s = window_s
+        self.channels = tuple(channels)
+        self.windows = {name: RollingWindow(window_s) for name in self.channels}
+        self._ordered = [self.windows[name] for name in self.channels]
+
+    def __getitem__(self, name):
+        return self.windows[name]
+
+    def push(self, t, values):
+        """`values` in the order of `channels`."""
+        for window, x in zip(self._ordered, values):
+            window.push(t, x)
+
+    def clear(self):
+        for window in self._ordered:
+            window.clear()
+
+    def summary(self):
+        """{channel: {stat: value}}"""
+        return {name: window.summary() for name, window in self.windows.items()}
+
+    def publish(self, gauge, source):
+        """Sets `gauge` (labels: source, channel, stat) to every channel's statistics. Returns the summary."""
+        summary = self.summary()
+        for name, stats in summary.items():
+            for stat, value in stats.items():
+                gauge.set(value, (source, name, stat))
+        return summary
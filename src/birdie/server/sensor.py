@@ -0,0 +1,145 @@
+# sensor_server_udp.py
+import socket
+import json
+import threading
+import time
+
+from birdie.server.metrics import DECODE_TIME, PACKETS_INVALID, LinkTracker
+
+# recvfrom timeout so the loop notices stop() promptly; closing the socket
+# from another thread does not interrupt a blocking recvfrom on Linux.
+RECV_TIMEOUT_S = 0.25
+# Longer device ids are cut: they end up in metric labels and log lines
+MAX_DEVICE_ID_LEN = 64
+
+class SensorServer:
+    """
+    Receives JSON sensor packets over UDP. Every sample is tagged with a
+    `device` id (the club's own, else the sender address). With `device` set
+    only that club's samples reach the listeners; `forward_to` relays every
+    accepted raw packet to another server (e.g. the venue dashboard).
+    Packets with a `type` field are control messages (see add_message_listener).
+    """
+    def __init__(self, host='0.0.0.0', port=50000, device=None, forward_to=None):
+        self.host = host
+        self.port = port
+        self.device = device
+        self.forward_to = forward_to
+        self._forward_socket = None
+        self.server_socket = None
+        self._is_running = False
+        self._server_thread = None
+        self._latest_data = None
+        self._data_lock = threading.Lock()
+        self._listeners = []
+        self._message_listeners = {}   # message type -> [callback]
+        self.links = LinkTracker()
+
+    def _server_loop(self):
+        print(f"[SERVER] UDP Server listening on {self.host}:{self.port}")
+
+        while self._is_running:
+            try:
+                # Receive data and the address it came from
+                try:
+                    data, addr = self.server_socket.recvfrom(1024)
+                except socket.timeout:
+                    continue
+                arrival = time.perf_counter()
+
+                try:
+                    sensor_data = json.loads(data.decode('utf-8'))
+                    if not isinstance(sensor_data, dict):
+                        raise ValueError("not a JSON object")
+                except ValueError:   # includes JSONDecodeError and UnicodeDecodeError
+                    PACKETS_INVALID.inc((addr[0],))
+                    print(f"[WARNING] Invalid JSON received from {addr}: {data[:80]!r}")
+                    continue
+                DECODE_TIME.observe(time.perf_counter() - arrival)
+                # Devices identify themselves in newer firmware; fall back to the sender address
+                device = sensor_data['device'] = str(sensor_data.get('device') or addr[0])[:MAX_DEVICE_ID_LEN]
+
+                kind = sensor_data.get('type')
+                if kind is not None:
+                    self._notify(self._message_listeners.get(kind, ()), sensor_data)
+                    continue
+                self.links.packet(device, sensor_data, arrival)
+                if self.device is not None and device != self.device:
+                    continue
+                if self._forward_socket is not None:
+                    # Re-encoded so the receiver sees the club's id, not this relay's address
+                    self._forward_socket.sendto(json.dumps(sensor_data).encode('utf-8'), self.forward_to)
+
+                with self._data_lock:
+                    self._latest_data = sensor_data
+                self._notify(self._listeners, sensor_data)
+                #print(f"Received from {addr}: {sensor_data}")
+
+            except Exception as e:
+                if self._is_running:
+                    print(f"[ERROR] An error occurred: {e}")
+                break
+        
+        print("[SERVER] Server loop shutting down.")
+        self.server_socket.close()
+        if self._forward_socket is not None:
+            self._forward_socket.close()
+            self._forward_socket = None
+
+    def _notify(self, callbacks, sensor_data):
+        """Calls each listener; one that raises is logged and skipped so ingestion carries on."""
+        for callback in callbacks:
+            try:
+                callback(sensor_data)
+            except Exception as e:
+                print(f"[ERROR] Listener {getattr(callback, '__qualname__', callback)} failed: {e!r}")
+
+    def start(self):
+        if self._is_running:
+            return
+        # Use SOCK_DGRAM for UDP
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.server_socket.bind((self.host, self.port))
+        self.server_socket.settimeout(RECV_TIMEOUT_S)
+        if self.forward_to:
+            self._forward_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._is_running = True
+        self._server_thread = threading.Thread(target=self._server_loop)
+        self._server_thread.start()
+        print("[SERVER] Server started.")
+
+    def stop(self):
+        if not self._is_running:
+            return
+        self._is_running = False
+        # The loop exits within RECV_TIMEOUT_S and closes the socket itself.
+        self._server_thread.join()
+        print("[SERVER] Server stopped.")
+
+    def add_listener(self, callback):
+        """Registers a callback invoked from the server thread for every new sample."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def add_message_listener(self, kind, callback):
+        """Registers a callback for control packets whose `type` field equals `kind`."""
+        self._message_listeners.setdefault(kind, []).append(callback)
+
+    def send_message(self, message):
+        """Sends a control message (a dict with a `type`) to the forward_to server, if any."""
+        sock = self._forward_socket
+        if sock is None:
+            return
+        with self._data_lock:
+            latest = self._latest_data
+        device = self.device or (latest or {}).get('device')
+        if device is None:
+            return   # no club seen yet, nothing to attribute the message to
+        sock.sendto(json.dumps(dict(message, device=device)).encode('utf-8'), self.forward_to)
+
+    def get_latest_data(self):
+        with self._data_lock:
+            return self._latest_data
\ No newline at end of file
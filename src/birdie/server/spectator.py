@@ -0,0 +1,103 @@
+# spectator.py
+"""
+Relays the game's spectator snapshots (game/broadcast.py) from UDP to
+browsers on the /spectate Socket.IO namespace, and serves the hole layouts
+they draw them on. Frames are passed through untouched; the relay only
+keeps the last keyframe and the deltas after it so a new spectator can
+catch up at once.
+"""
+import json
+import os
+import socket
+import threading
+
+from flask import abort, jsonify, render_template, request
+
+NAMESPACE = '/spectate'
+LEVELS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'game', 'levels.json')
+FRAME_KIND_OFFSET = 2   # after the b'BG' magic
+KEYFRAME = 1
+# A spectator joining late gets at most this many deltas after the keyframe
+MAX_BACKLOG = 120
+RECV_TIMEOUT_S = 0.25
+
+
+class SpectatorRelay:
+    def __init__(self, socketio, host='0.0.0.0', port=50003):
+        self.socketio = socketio
+        self.host = host
+        self.port = port
+        self.frames = 0
+        self._backlog = []     # last keyframe, then the deltas that followed it
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+
+    def _loop(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind((self.host, self.port))
+        sock.settimeout(RECV_TIMEOUT_S)
+        print(f"[SPECTATOR] Relaying game snapshots from UDP {self.host}:{self.port}")
+        while self._running:
+            try:
+                frame, _ = sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            if len(frame) <= FRAME_KIND_OFFSET or frame[:2] != b'BG':
+                continue
+            with self._lock:
+                if frame[FRAME_KIND_OFFSET] == KEYFRAME:
+                    self._backlog = [frame]
+                elif self._backlog and len(self._backlog) < MAX_BACKLOG:
+                    self._backlog.append(frame)
+            self.frames += 1
+            self.socketio.emit('snapshot', frame, namespace=NAMESPACE)
+        sock.close()
+
+    def catch_up(self, sid):
+        """Sends the latest keyframe and its deltas to one client."""
+        with self._lock:
+            backlog = list(self._backlog)
+        for frame in backlog:
+            self.socketio.emit('snapshot', frame, to=sid, namespace=NAMESPACE)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+
+
+def load_levels(path=LEVELS_PATH):
+    """The hole layouts as plain JSON (no pygame needed on the server)."""
+    try:
+        with open(path, 'r') as f:
+            return {int(k): v for k, v in json.load(f).items()}
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"[WARNING] Could not load levels for spectators: {e}")
+        return {}
+
+
+def register_spectator(app, socketio, port):
+    """Adds /spectate, /api/levels/<n> and the relay. Returns the started SpectatorRelay."""
+    relay = SpectatorRelay(socketio, port=port)
+    levels = load_levels()
+
+    @app.route('/spectate')
+    def spectate_page():
+        return render_template('spectator.html')
+
+    @app.route('/api/levels/<int:number>')
+    def level_layout(number):
+        if number not in levels:
+            abort(404)
+        return jsonify(levels[number])
+
+    @socketio.on('connect', namespace=NAMESPACE)
+    def on_connect():
+        relay.catch_up(request.sid)
+
+    relay.start()
+    return relay
@@ -0,0 +1,199 @@
+# venue.py
+"""
+Venue view over every club the server hears from, grouped into bays.
+
+Each bay is one club plus the game it drives (see `birdie play --venue`).
+Browsers on the /venue Socket.IO namespace get one multiplexed
+`venue_summary` at VENUE_SUMMARY_HZ for all bays, and the full-rate
+`sample_frame` stream (ring.encode_frame) only for the bay they watch.
+"""
+import math
+import threading
+import time
+
+from flask import render_template, request
+from flask_socketio import join_room, leave_room
+
+from birdie.game.config import CONFIG
+from birdie.server.dashboard import (DASHBOARD_EMIT_HZ, DASHBOARD_SWING_ACCEL_G, DASHBOARD_SWING_HOLD_S,
+                                     GYRO_RATE_IS_RAD_PER_S, _vec)
+from birdie.server.metrics import LinkTracker
+from birdie.server.ring import SampleRing, encode_frame
+
+NAMESPACE = '/venue'
+BAY_STATUS = 'bay_status'   # control message type sent by games
+VENUE_SUMMARY_HZ = float(CONFIG.get('venue_summary_hz', 2.0))
+# Device id (MAC or IP) -> bay name; unmapped clubs show up under their device id
+BAYS = dict(CONFIG.get('bays', {}))
+BAY_RING_CAPACITY = 4096
+
+
+def _bay_room(name):
+    return f'bay:{name}'
+
+
+class Bay:
+    """Per-bay counters for the current summary window plus the latest game status."""
+    def __init__(self, name, device):
+        self.name = name
+        self.device = device
+        self.ring = SampleRing(BAY_RING_CAPACITY, t0=time.time())
+        self.cursor = 0
+        self.packets = 0        # in the current summary window
+        self.missing = 0        # sequence numbers skipped in the current window
+        self.last_seq = None
+        self.last_seen = 0.0
+        self.last_swing_time = 0.0
+        self.peak_accel = 0.0   # |accel| peak of the current swing
+        self.swing_peak_g = 0.0 # peak of the last finished swing
+        self.status = {}        # latest bay_status from the game
+
+    def summary(self, elapsed, now):
+        total = self.packets + self.missing
+        result = {
+            "bay": self.name,
+            "device": self.device,
+            "rate_hz": self.packets / elapsed if elapsed > 0 else 0.0,
+            "loss": self.missing / total if total else 0.0,
+            "online": (now - self.last_seen) < 2.0,
+            "swinging": (now - self.last_swing_time) <= DASHBOARD_SWING_HOLD_S,
+            "swing_peak_g": self.swing_peak_g,
+            "hole": self.status.get("hole"),
+            "par": self.status.get("par"),
+            "player": self.status.get("player"),
+            "strokes": self.status.get("strokes"),
+            "last_power": self.status.get("last_power"),
+        }
+        self.packets = self.missing = 0
+        return result
+
+
+class VenueBridge:
+    """
+    SensorServer listener (samples) and message listener (bay_status) that
+    aggregates per bay under one lock and emits from a single background task.
+    """
+    def __init__(self, socketio, bays=BAYS, emit_hz=DASHBOARD_EMIT_HZ, summary_hz=VENUE_SUMMARY_HZ):
+        self.socketio = socketio
+        self.bay_names = bays
+        self.emit_hz = emit_hz
+        self.summary_hz = summary_hz
+        self.bays = {}          # device -> Bay
+        self.watchers = {}      # bay name -> set of sids
+        self._lock = threading.Lock()
+        self._running = False
+
+    def _bay(self, device):
+        bay = self.bays.get(device)
+        if bay is None:
+            bay = self.bays[device] = Bay(self.bay_names.get(device, device), device)
+        return bay
+
+    def __call__(self, sensor_data):
+        """Called from the SensorServer thread for every sample."""
+        try:
+            ax, ay, az = _vec(sensor_data.get('accelerometer'))
+            gx, gy, gz = _vec(sensor_data.get('gyroscope_rate', sensor_data.get('gyroscope')))
+        except (TypeError, ValueError, AttributeError):
+            return
+        if GYRO_RATE_IS_RAD_PER_S:
+            gx, gy, gz = math.degrees(gx), math.degrees(gy), math.degrees(gz)
+        accel_mag = math.sqrt(ax * ax + ay * ay + az * az)
+        seq = sensor_data.get('seq')
+        now = time.time()
+
+        with self._lock:
+            bay = self._bay(sensor_data.get('device'))
+            bay.packets += 1
+            bay.last_seen = now
+            if isinstance(seq, int):
+                if isinstance(bay.last_seq, int) and seq > bay.last_seq + 1:
+                    bay.missing += seq - bay.last_seq - 1
+                # Far behind the last seq is a rebooted club, not a late packet: count on from here
+                if bay.last_seq is None or seq > bay.last_seq or seq < bay.last_seq - LinkTracker.MAX_REORDER:
+                    bay.last_seq = seq
+            bay.ring.push(now, ax, ay, az, gx, gy, gz)
+            if abs(accel_mag - 1.0) >= DASHBOARD_SWING_ACCEL_G:
+                bay.last_swing_time = now
+                bay.peak_accel = max(bay.peak_accel, accel_mag)
+            elif bay.peak_accel and (now - bay.last_swing_time) > DASHBOARD_SWING_HOLD_S:
+                bay.swing_peak_g, bay.peak_accel = bay.peak_accel, 0.0
+
+    def on_bay_status(self, message):
+        """Called from the SensorServer thread for each bay_status message from a game."""
+        with self._lock:
+            self._bay(message.get('device')).status = message
+
+    def _emit_loop(self):
+        period = 1.0 / self.emit_hz
+        summary_every = max(1, round(self.emit_hz / self.summary_hz))
+        last_summary = time.time()
+        tick = 0
+        while self._running:
+            self.socketio.sleep(period)
+            tick += 1
+            frames = []
+            summary = None
+            with self._lock:
+                # Full-rate frames only for bays somebody is watching
+                for bay in self.bays.values():
+                    if self.watchers.get(bay.name):
+                        rows, bay.cursor = bay.ring.since(bay.cursor)
+                        if len(rows):
+                            frames.append((bay.name, encode_frame(rows, bay.ring.t0)))
+                    else:
+                        bay.cursor = bay.ring.written
+                if tick % summary_every == 0:
+                    now = time.time()
+                    elapsed, last_summary = now - last_summary, now
+                    summary = [bay.summary(elapsed, now) for bay in self.bays.values()]
+            for name, frame in frames:
+                self.socketio.emit('sample_frame', frame, to=_bay_room(name), namespace=NAMESPACE)
+            if summary is not None:
+                summary.sort(key=lambda b: b["bay"])
+                self.socketio.emit('venue_summary', {"t": time.time(), "bays": summary}, namespace=NAMESPACE)
+
+    def start(self):
+        self._running = True
+        self.socketio.start_background_task(self._emit_loop)
+
+    def stop(self):
+        self._running = False
+
+
+def register_venue(app, socketio, sensor_server):
+    """Adds the /venue page and Socket.IO namespace. Returns the started VenueBridge."""
+    venue = VenueBridge(socketio)
+
+    @app.route('/venue')
+    def venue_page():
+        return render_template('venue.html')
+
+    def _unwatch(sid):
+        for name, sids in venue.watchers.items():
+            if sid in sids:
+                sids.discard(sid)
+                leave_room(_bay_room(name), namespace=NAMESPACE)
+
+    @socketio.on('watch_bay', namespace=NAMESPACE)
+    def on_watch_bay(name):
+        with venue._lock:
+            _unwatch(request.sid)
+            venue.watchers.setdefault(str(name), set()).add(request.sid)
+        join_room(_bay_room(str(name)), namespace=NAMESPACE)
+
+    @socketio.on('unwatch_bay', namespace=NAMESPACE)
+    def on_unwatch_bay():
+        with venue._lock:
+            _unwatch(request.sid)
+
+    @socketio.on('disconnect', namespace=NAMESPACE)
+    def on_disconnect():
+        with venue._lock:
+            for sids in venue.watchers.values():
+                sids.discard(request.sid)
+
+    sensor_server.add_listener(venue)
+    sensor_server.add_message_listener(BAY_STATUS, venue.on_bay_status)
+    venue.start()
+    return venue
@@ -0,0 +1,154 @@
+# sweep.py
+"""
+Parameter sweep behind `birdie sweep`: grid or random search over the
+detector's config thresholds, scored on a labelled corpus (birdie.corpus).
+
+Parameter sets are spread over a pool of worker processes. A worker switches
+the detector to a set by updating CONFIG in place and reloading the modules
+that read it at import (DETECTOR_MODULES), so every key takes effect,
+including those baked into windows and filters. The corpus is converted to
+.npy once and every worker memory-maps it, so they share one copy in the page
+cache. Sets that keep recall at `min_recall` or above are compared on
+strike-to-shot latency and false shots per minute. Each set on the Pareto
+front of those two is written out as a complete config file.
+Standard library only at module level, like bench.py.
+"""
+import importlib
+import itertools
+import json
+import os
+import random
+
+DETECTOR_MODULES = ('birdie.game.fusion', 'birdie.game.bias', 'birdie.game.spectral', 'birdie.game.shot_data')
+
+# Default search space, config key -> (low, high): the thresholds that decide when a shot fires
+SWEEP_SPACE = {
+    'swing_down_trig_axis_g': (-0.6, -0.15),
+    'swing_down_trig_mag_g': (-0.5, -0.1),
+    'swing_end_threshold_g': (0.05, 0.3),
+    'swing_max_window_s': (0.3, 1.0),
+    'swing_holdoff_s': (0.1, 0.6),
+    'accel_baseline_alpha': (0.02, 0.3),
+    'mag_baseline_alpha': (0.02, 0.3),
+    'impact_window_s': (0.01, 0.06),
+    'impact_rise_g': (0.3, 1.2),
+    'impact_cross_rise_g': (0.1, 0.6),
+    'impact_min_depth_g': (0.15, 0.7),
+    'impact_min_armed_s': (0.0, 0.1),
+    'spectral_impact_g': (0.1, 0.8),
+}
+
+MAX_GRID_SETS = 10000
+
+_worker = None      # (entries as [(samples, events)], base config, early_s, late_s, use_model)
+
+
+def parse_param(text):
+    """'key=lo:hi' -> (key, (lo, hi)); 'key=a,b,...' -> (key, [a, b, ...]) with JSON values."""
+    key, sep, spec = text.partition('=')
+    if not key or not sep or not spec:
+        raise ValueError(f"expected KEY=LO:HI or KEY=A,B,... but got {text!r}")
+    if ':' in spec:
+        lo, hi = spec.split(':')
+        return key, (float(lo), float(hi))
+    return key, [json.loads(v) for v in spec.split(',')]
+
+
+def _typed(value, like):
+    """`value` as the type of the config value it replaces, rounded to 4 significant digits."""
+    if isinstance(like, int) and not isinstance(like, bool):
+        return int(round(value))
+    return float(f"{value:.4g}") if isinstance(value, float) else value
+
+
+def candidates(space, base, samples=0, steps=3, seed=0):
+    """
+    Parameter sets (dicts of overrides) to try: `samples` random draws from `space`, or its
+    full grid when samples is 0, with `steps` points across each (lo, hi) range.
+    The current config ({}) comes first.
+    """
+    sets = [{}]
+    if samples:
+        rng = random.Random(seed)
+        for _ in range(samples):
+            sets.append({key: _typed(rng.uniform(*spec) if isinstance(spec, tuple) else rng.choice(spec),
+                                     base.get(key)) for key, spec in space.items()})
+    else:
+        axes = []
+        for key, spec in space.items():
+            if isinstance(spec, tuple):
+                lo, hi = spec
+                spec = [lo + (hi - lo) * i / max(1, steps - 1) for i in range(steps)] if steps > 1 else [lo]
+            axes.append([(key, _typed(v, base.get(key))) for v in spec])
+        sets.extend(dict(combo) for combo in itertools.product(*axes))
+    return sets
+
+
+def apply_config(base, overrides):
+    """Rebinds the detector to the config `base` updated with `overrides`."""
+    from birdie.game.config import CONFIG
+    CONFIG.clear()
+    CONFIG.update(base)
+    CONFIG.update(overrides)
+    for name in DETECTOR_MODULES:
+        importlib.reload(importlib.import_module(name))
+
+
+def prepare_entries(paths, directory):
+    """Corpus entries as .npy files, converting JSON-lines recordings into `directory`."""
+    from birdie.corpus import find_entries, labels_path, recording_to_array, save_entry
+    from birdie.game.classifier import load_labels
+
+    entries = []
+    for i, path in enumerate(find_entries(paths)):
+        if not path.endswith('.npy'):
+            converted = os.path.join(directory, f"{i:04d}-{os.path.basename(path)}.npy")
+            save_entry(recording_to_array(path), load_labels(labels_path(path)), converted)
+            path = converted
+        entries.append(path)
+    return entries
+
+
+def _init_worker(entries, base, early_s, late_s, use_model):
+    global _worker
+    import numpy as np
+    from birdie.corpus import labels_path
+    from birdie.game.classifier import load_labels
+    data = [(np.load(path, mmap_mode='r'), load_labels(labels_path(path))) for path in entries]
+    _worker = (data, base, early_s, late_s, use_model)
+
+
+def _evaluate_set(overrides):
+    from birdie.corpus import score, summarize
+    data, base, early_s, late_s, use_model = _worker
+    apply_config(base, overrides)
+    if not use_model:
+        from birdie.game import shot_data
+        shot_data.set_swing_model(None)
+    return summarize([score(samples, events, early_s, late_s) for samples, events in data])
+
+
+def sweep(entries, sets, base, early_s=0.05, late_s=0.6, use_model=True, jobs=None):
+    """Summaries (corpus.summarize) of every parameter set over the .npy `entries`, in order."""
+    init = (entries, base, early_s, late_s, use_model)
+    jobs = min(len(sets), jobs or os.cpu_count() or 1)
+    if jobs <= 1:
+        _init_worker(*init)
+        try:
+            return [_evaluate_set(overrides) for overrides in sets]
+        finally:
+            apply_config(base, {})
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=init) as pool:
+        return list(pool.map(_evaluate_set, sets))
+
+
+def pareto_front(points):
+    """Indices of the (latency, false rate) points that no other point matches or beats on both, best latency first."""
+    front = []
+    for i, (lat, false) in enumerate(points):
+        dominated = any((l2 <= lat and f2 <= false) and ((l2, f2) != (lat, false) or j < i)
+                        for j, (l2, f2) in enumerate(points) if j != i)
+        if not dominated:
+            front.append(i)
+    return sorted(front, key=lambda i: points[i])
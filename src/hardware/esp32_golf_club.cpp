@@ -14,6 +14,7 @@ void calibrateGyro();
 void connectToWiFi();
 void readAccelData(float* x, float* y, float* z);
 void readGyroData(float* x, float* y, float* z);
+float readTemperature();
 void sendDataToServer(float accelX, float accelY, float accelZ, float gyroX, float gyroY, float gyroZ, float absGyroX, float absGyroY, float absGyroZ);
 
 // --- Configuration ---
@@ -34,6 +35,10 @@ float gyroXCal = 0, gyroYCal = 0, gyroZCal = 0;
 float absGyroX = 0, absGyroY = 0, absGyroZ = 0;
 unsigned long lastTime = 0;
 
+// Packet counter and device id, so the server can detect loss/reordering per club
+uint32_t packetSeq = 0;
+String deviceId;
+
 // --- Main Program ---
 void setup() {
   Serial.begin(115200);
@@ -41,6 +46,7 @@ void setup() {
 
   initializeMPU();
   connectToWiFi();
+  deviceId = WiFi.macAddress();
   calibrateGyro();
   
   lastTime = millis();
@@ -105,6 +111,11 @@ void sendDataToServer(float accelX, float accelY, float accelZ,
                       float gyroX, float gyroY, float gyroZ,
                       float absGyroX, float absGyroY, float absGyroZ) {
   JsonDocument doc;
+  doc["device"] = deviceId;
+  doc["seq"] = packetSeq++;
+  doc["t_us"] = micros();
+  float temperature = readTemperature();
+  doc["temperature"] = isnan(temperature) ? 0 : temperature;
   doc["accelerometer"]["x"] = isnan(accelX) ? 0 : accelX;
   doc["accelerometer"]["y"] = isnan(accelY) ? 0 : accelY;
   doc["accelerometer"]["z"] = isnan(accelZ) ? 0 : accelZ;
@@ -1,6 +0,0 @@
-from sensor import SensorServer
-import sys
-
-print(f"Using Python executable: {sys.executable}")
-server = SensorServer()
-server.start()
\ No newline at end of file
@@ -0,0 +1,53 @@
+# test_archive.py
+import numpy as np
+
+from birdie.server.archive import ACCEL_SCALE, ArchiveReader, decode_column, detect_swings, encode_column, write_archive
+
+
+def test_varint_codec_round_trips():
+    rng = np.random.default_rng(0)
+    values = np.concatenate(([0, -1, 1, 2 ** 40, -(2 ** 40)], rng.integers(-40000, 40000, size=5000)))
+    assert np.array_equal(decode_column(encode_column(values)), values)
+    assert decode_column(encode_column([])).size == 0
+
+
+def _session(n=10000, rate=1000.0):
+    rng = np.random.default_rng(1)
+    t = 1_700_000_000.0 + np.arange(n) / rate
+    rows = rng.normal(scale=0.02, size=(n, 6))
+    rows[:, 2] += 1.0
+    rows[5000:5100, 0] = 1.8     # one swing
+    return t, rows
+
+
+def test_archive_round_trips_within_quantization(tmp_path):
+    t, rows = _session()
+    path = str(tmp_path / 's.brda')
+    write_archive(path, t, rows)
+    with ArchiveReader(path) as reader:
+        assert len(reader) == len(t)
+        rt, rrows = reader.read_all()
+        assert np.allclose(rt, t, atol=1e-6)
+        assert np.allclose(rrows[:, :3], rows[:, :3], atol=0.5 / ACCEL_SCALE + 1e-6)
+        assert len(reader.swings) == 1
+        st, _ = reader.read_swing(0)
+        assert st[0] <= t[5000] and st[-1] >= t[5099]
+
+
+def test_read_range_spans_chunks(tmp_path):
+    t, rows = _session()
+    path = str(tmp_path / 's.brda')
+    write_archive(path, t, rows)
+    with ArchiveReader(path) as reader:
+        rt, rrows = reader.read_range(t[4000], t[8999])
+        assert len(rt) == 5000 and len(rrows) == 5000
+        assert rt[0] == t[4000]
+
+
+def test_detect_swings_merges_nearby_activity():
+    t = np.arange(3000) / 100.0
+    accel = np.tile([0.0, 0.0, 1.0], (3000, 1))
+    accel[1000:1010, 0] = 2.0
+    accel[1020:1030, 0] = 2.0    # 0.1 s later: same swing
+    accel[2500:2510, 0] = 2.0
+    assert len(detect_swings(t, accel)) == 2
@@ -0,0 +1,18 @@
+# test_camera.py
+import pygame
+
+from birdie.game.camera import Camera
+
+
+def test_follow_settles_on_its_target():
+    camera = Camera(320, 240)
+    camera.set_world(pygame.Rect(0, 0, 1600, 1200))
+    camera.snap_to((160, 120))
+    target = (1000, 800)
+    assert not camera.is_settled(target)
+    for _ in range(240 * 5):
+        camera.follow(target, 1 / 240)
+        if camera.is_settled(target):
+            break
+    assert camera.is_settled(target)
+    assert camera.view_rect.topleft == (1000 - 160, 800 - 120)
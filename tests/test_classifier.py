@@ -0,0 +1,47 @@
+# test_classifier.py
+import numpy as np
+
+from birdie.game.classifier import SwingClassifier, cross_validate, load_model, match_events, save_model, train
+
+CLASSES = ('putt', 'chip', 'practice')
+FEATURES = ('a', 'b', 'c')
+
+
+def _blobs(seed=0, per_class=40):
+    rng = np.random.default_rng(seed)
+    centres = np.array([[0.0, 0.0, 5.0], [4.0, 0.0, 5.0], [0.0, 4.0, 5.0]])
+    x = np.concatenate([c + rng.normal(scale=0.5, size=(per_class, 3)) for c in centres])
+    y = np.repeat(np.arange(len(centres)), per_class)
+    return x, y
+
+
+def test_separates_clear_clusters():
+    x, y = _blobs()
+    model = train(x, y, CLASSES, FEATURES, epochs=500)
+    assert np.mean(np.argmax(model.predict_proba(x), axis=1) == y) > 0.97
+    label, confidence = model.classify([4.0, 0.0, 5.0])
+    assert label == 'chip' and confidence > 0.8
+    assert model.trained["per_class"] == {"putt": 40, "chip": 40, "practice": 40}
+    assert cross_validate(x, y, CLASSES, FEATURES, epochs=300) > 0.9
+
+
+def test_round_trips_through_a_file(tmp_path):
+    x, y = _blobs(1)
+    model = train(x, y, CLASSES, FEATURES, epochs=100)
+    path = str(tmp_path / 'model.json')
+    save_model(model, path)
+    loaded = load_model(path)
+    assert isinstance(loaded, SwingClassifier)
+    assert np.allclose(loaded.predict_proba(x), model.predict_proba(x))
+
+
+def test_missing_or_damaged_model_loads_as_none(tmp_path):
+    assert load_model(str(tmp_path / 'none.json')) is None
+    damaged = tmp_path / 'bad.json'
+    damaged.write_text('{"classes": ["a"]')
+    assert load_model(str(damaged)) is None
+
+
+def test_match_events_pairs_each_event_once():
+    events = [(1.0, 'putt', None), (3.0, 'waggle', None)]
+    assert match_events([1.2, 1.3, 2.98, 5.0], events, 0.05, 0.6) == [0, None, 1, None]
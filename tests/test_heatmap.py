@@ -0,0 +1,58 @@
+# test_heatmap.py
+import time
+
+import numpy as np
+import pygame
+
+from birdie.game.camera import Camera
+from birdie.game.heatmap import ShotHeatmap
+from birdie.game.store import ShotStore
+
+BOUNDS = pygame.Rect(0, 0, 1600, 1200)
+
+
+def test_shots_land_in_their_cells():
+    heatmap = ShotHeatmap(BOUNDS, cell=16)
+    heatmap.add_shot((100.0, 200.0), [(0.0, 0.0), (50.0, 100.0), (100.0, 200.0)])
+    assert heatmap.shots == 1
+    assert heatmap.rest[100 // 16, 200 // 16] == 1
+    assert heatmap.path.sum() == 3
+
+
+def test_draw_scales_only_the_cells_in_view():
+    heatmap = ShotHeatmap(BOUNDS, cell=16)
+    heatmap.add_shot((800.0, 600.0), [(800.0, 600.0)])
+    camera = Camera(320, 240)
+    camera.set_world(BOUNDS)
+    camera.snap_to((808, 600))
+    screen = pygame.Surface((320, 240), pygame.SRCALPHA)
+    heatmap.draw(screen, camera)
+    cells, scaled = heatmap._scaled
+    assert heatmap._grid.get_size() == heatmap.rest.shape
+    # The view plus a one-cell margin, not the whole hole
+    assert scaled.get_size() == (cells.width * 16, cells.height * 16)
+    assert cells.width <= 320 // 16 + 3 and cells.height <= 240 // 16 + 3
+    # The resting ball shows at the centre of the screen
+    assert screen.get_at((152, 120)).a > 0
+    # Moving within the same cells reuses the scaled overlay
+    camera.offset.x += 1
+    heatmap.draw(screen, camera)
+    assert heatmap._scaled[1] is scaled
+
+
+def test_load_includes_shots_still_queued_in_the_writer(tmp_path):
+    store = ShotStore(str(tmp_path / 'shots.sqlite'))
+    store.start()
+    try:
+        for i in range(300):
+            store.record_shot('s', 0, 2, i, 'sensor', 0.0, 0.5, (0, 0), (100.0 + i, 100.0), False,
+                              [(0.0, 0.0)], ts=1.0)
+        heatmap = ShotHeatmap(BOUNDS)
+        heatmap.load(store, 2, before_ts=2.0)
+        deadline = time.time() + 10.0
+        while not heatmap.loaded and time.time() < deadline:
+            time.sleep(0.01)
+        assert heatmap.shots == 300
+        assert heatmap.rest.sum() == 300 and np.all(heatmap.rest >= 0)
+    finally:
+        store.close()
@@ -0,0 +1,35 @@
+# test_history.py
+import numpy as np
+
+from birdie.server.history import MAX_QUERY_WIDTH, lttb, session_from_rows
+
+
+def test_lttb_keeps_the_ends_and_the_spike():
+    x = np.arange(10000, dtype=float)
+    y = np.sin(x / 500.0)
+    y[4321] = 50.0
+    keep = lttb(x, y, 200)
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert 4321 in keep
+
+
+def test_lttb_passes_short_series_through():
+    x = np.arange(10, dtype=float)
+    assert np.array_equal(lttb(x, x, 50), np.arange(10))
+
+
+def test_session_query_uses_the_pyramid_and_keeps_peaks():
+    n = 200_000
+    t = 1_700_000_000.0 + np.arange(n) / 1000.0
+    rows = np.zeros((n, 6))
+    rows[:, 2] = 1.0
+    rows[123_456, 0] = 3.0
+    session = session_from_rows('s', t, rows)
+    qt, qy = session.query('ax', session.start, session.end, 500)
+    assert len(qt) <= 500
+    assert qy.max() == 3.0
+    # A width beyond the cap still comes back as a reduced series
+    qt, _ = session.query('ax', session.start, session.end, MAX_QUERY_WIDTH)
+    assert len(qt) <= MAX_QUERY_WIDTH
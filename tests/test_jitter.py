@@ -0,0 +1,135 @@
+# test_jitter.py
+import numpy as np
+
+from birdie.server.jitter import JitterBuffer, resample
+
+RATE_HZ = 100.0
+PERIOD = 1.0 / RATE_HZ
+
+
+def _packet(seq, t_us, value=None):
+    value = float(seq) if value is None else value
+    return {"seq": seq, "t_us": t_us,
+            "accelerometer": {"x": value, "y": 0.0, "z": 1.0},
+            "gyroscope_rate": {"x": 0.0, "y": 0.0, "z": 0.0}}
+
+
+def _drain(buffer, now, until, step=0.005):
+    """Pulls every `step` seconds from `now` to `until`; returns the concatenated samples."""
+    times, values = [], []
+    while now <= until:
+        t, v = buffer.pull(now)
+        times.append(t)
+        values.append(v)
+        now += step
+    return np.concatenate(times), np.concatenate(values)
+
+
+def _stream(order, arrival=lambda seq: seq * PERIOD + 0.02):
+    buffer = JitterBuffer('test', rate_hz=RATE_HZ)
+    for seq in order:
+        buffer.push(_packet(seq, seq * int(PERIOD * 1e6)), arrival(seq))
+    return buffer
+
+
+def test_reordered_packets_play_out_in_order():
+    order = [0, 1, 2, 4, 3, 5, 7, 6, 8, 9, 10]
+    buffer = _stream(order)
+    times, values = _drain(buffer, 0.0, 1.0)
+    assert np.all(np.diff(times) > 0)
+    # Each source sample carries its seq as ax, and the grid matches the source rate
+    assert np.allclose(values[:, 0], np.round(values[:, 0]))
+    assert np.all(np.diff(values[:, 0]) > 0)
+    assert buffer.late == 0 and buffer.lost == 0
+
+
+def test_lost_packets_are_interpolated_and_counted():
+    order = [s for s in range(20) if s not in (5, 6, 12)]
+    buffer = _stream(order)
+    times, values = _drain(buffer, 0.0, 1.0)
+    # The linear ramp in ax survives interpolation across the holes
+    assert np.allclose(np.diff(values[:, 0]), 1.0)
+    assert buffer.lost == 3
+
+
+def test_duplicate_and_late_packets_are_dropped():
+    buffer = JitterBuffer('test', rate_hz=RATE_HZ)
+    for seq in range(10):
+        buffer.push(_packet(seq, seq * 10000), seq * PERIOD)
+    buffer.pull(0.5)
+    assert not buffer.push(_packet(3, 30000), 0.5)
+    assert not buffer.push(_packet(9, 90000), 0.5)
+    assert buffer.late == 2
+
+
+def test_reboot_starts_a_new_stream():
+    buffer = JitterBuffer('test', rate_hz=RATE_HZ)
+    # 30 s into a session, then the club reboots: seq and t_us start again at 0
+    base_seq, base_us = 3000, 30_000_000
+    for i in range(50):
+        buffer.push(_packet(base_seq + i, base_us + i * 10000, value=1.0), 100.0 + i * PERIOD)
+    _drain(buffer, 100.0, 100.6)
+    for i in range(50):
+        assert buffer.push(_packet(i, i * 10000, value=2.0), 101.0 + i * PERIOD)
+    times, values = _drain(buffer, 101.0, 101.8)
+    assert buffer.restarts == 1
+    assert buffer.late == 0
+    assert len(values) > 30
+    assert np.all(values[:, 0] == 2.0)
+
+
+def test_resample_matches_an_ideal_link():
+    rng = np.random.default_rng(2)
+    # 1 kHz source with a little clock wobble, played out at 100 Hz
+    t_us = np.cumsum(rng.integers(950, 1050, size=2000))
+    values = rng.normal(size=(2000, 6))
+    buffer = JitterBuffer('test', rate_hz=RATE_HZ)
+    for seq, (t, row) in enumerate(zip(t_us.tolist(), values.tolist())):
+        buffer.push({"seq": seq, "t_us": t, "accelerometer": dict(zip('xyz', row[:3])),
+                     "gyroscope_rate": dict(zip('xyz', row[3:]))}, t / 1e6)
+    live_t, live = buffer.pull(10.0)
+    times, out = resample((t_us - t_us[0]) / 1e6, values, RATE_HZ)
+    assert len(times) == len(live_t)
+    assert np.allclose(times, live_t - live_t[0])
+    assert np.allclose(out, live)
+
+
+def test_resample_restarts_after_a_long_gap():
+    t = np.concatenate((np.arange(0.0, 1.0, 0.001), 3.0 + np.arange(0.0, 1.0, 0.001)))
+    times, _ = resample(t, np.zeros((len(t), 6)), RATE_HZ)
+    assert times[times >= 3.0][0] == 3.0
+    assert not np.any((times > 1.0) & (times < 3.0))
+
+
+def test_long_stream_crosses_the_counter_wraps():
+    # Over 2^32 us of sender time, starting just below the uint32 wrap: t_us wraps to 0 and the
+    # stream passes 2^31 us from its first packet, half a wrap, without restarting
+    buffer = JitterBuffer('test', rate_hz=10.0)
+    spacing_us = 400_000
+    start_us = (1 << 32) - 10 * spacing_us
+    n = (1 << 32) // spacing_us + 100
+    played = 0
+    for i in range(n):
+        t_us = (start_us + i * spacing_us) & 0xFFFFFFFF
+        arrival = i * spacing_us / 1e6
+        assert buffer.push(_packet(i & 0xFFFFFFFF, t_us), arrival)
+        if i % 50 == 0:
+            played += len(buffer.pull(arrival)[0])
+    assert buffer.restarts == 0
+    assert buffer.late == 0
+    assert played > 0.99 * (n - 1) * spacing_us / 1e6 * 10.0 - 100
+
+
+def test_reboot_past_half_a_wrap_starts_a_new_stream():
+    # A club that ran for over 36 minutes and then rebooted: its t_us drops back by more than
+    # half a wrap, so it unwraps as a jump forward in time instead of back
+    buffer = JitterBuffer('test', rate_hz=RATE_HZ)
+    base_us = 3_000_000_000
+    for i in range(50):
+        buffer.push(_packet(300_000 + i, base_us + i * 10000, value=1.0), 100.0 + i * PERIOD)
+    _drain(buffer, 100.0, 100.6)
+    for i in range(50):
+        assert buffer.push(_packet(i, i * 10000, value=2.0), 101.0 + i * PERIOD)
+    _, values = _drain(buffer, 101.0, 101.8)
+    assert buffer.restarts == 1
+    assert len(values) > 30 and np.all(values[:, 0] == 2.0)
@@ -0,0 +1,61 @@
+# test_metrics.py
+from birdie.server.metrics import (LINK_RESETS, PACKETS_DROPPED, PACKETS_LATE, PACKETS_RECEIVED, SEQ_GAPS,
+                                   LinkTracker, Registry)
+
+
+def _feed(device, seqs, period=0.01):
+    links = LinkTracker()
+    for i, seq in enumerate(seqs):
+        links.packet(device, {"seq": seq, "t_us": seq * int(period * 1e6)}, i * period)
+    return links
+
+
+def test_in_order_stream_counts_nothing():
+    _feed('ordered', range(100))
+    labels = ('ordered',)
+    assert PACKETS_RECEIVED.value(labels) == 100
+    assert PACKETS_DROPPED.value(labels) == 0
+    assert PACKETS_LATE.value(labels) == 0
+    assert LINK_RESETS.value(labels) == 0
+
+
+def test_loss_counts_the_missing_packets():
+    _feed('lossy', [0, 1, 2, 5, 6, 10])
+    labels = ('lossy',)
+    assert SEQ_GAPS.value(labels) == 2
+    assert PACKETS_DROPPED.value(labels) == 2 + 3
+
+
+def test_reordered_packet_is_late():
+    _feed('reordered', [0, 1, 3, 2, 4])
+    labels = ('reordered',)
+    assert PACKETS_LATE.value(labels) == 1
+    assert PACKETS_DROPPED.value(labels) == 1
+
+
+def test_reboot_reseeds_the_link():
+    seqs = list(range(1000, 1100)) + list(range(0, 100))
+    _feed('rebooted', seqs)
+    labels = ('rebooted',)
+    assert LINK_RESETS.value(labels) == 1
+    # Only the restart is special: the packets after it are neither late nor dropped
+    assert PACKETS_LATE.value(labels) == 0
+    assert PACKETS_DROPPED.value(labels) == 0
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    counter = registry.counter('test_total', "Test", ('device',))
+    counter.inc(('a"}\nevil 1 #\\',))
+    lines = registry.render().splitlines()
+    assert lines[-1] == 'test_total{device="a\\"}\\nevil 1 #\\\\"} 1'
+    assert not any(line.startswith('evil') for line in lines)
+
+
+def test_device_labels_are_capped():
+    links = LinkTracker()
+    for i in range(LinkTracker.MAX_DEVICES + 10):
+        links.packet(f'spoof-{i}', {"seq": 0}, 0.0)
+    assert PACKETS_RECEIVED.value((f'spoof-{LinkTracker.MAX_DEVICES - 1}',)) == 1
+    assert PACKETS_RECEIVED.value((f'spoof-{LinkTracker.MAX_DEVICES}',)) == 0
+    assert PACKETS_RECEIVED.value((LinkTracker.OVERFLOW_DEVICE,)) == 10
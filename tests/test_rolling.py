@@ -0,0 +1,57 @@
+# test_rolling.py
+import math
+import random
+
+import pytest
+
+from birdie.server import rolling
+from birdie.server.rolling import RollingStats, RollingWindow
+
+
+def _brute(samples, t, window_s):
+    values = [x for ts, x in samples if ts >= t - window_s]
+    n = len(values)
+    mean = math.fsum(values) / n
+    var = math.fsum((x - mean) ** 2 for x in values) / n
+    return {"count": n, "mean": mean, "std": math.sqrt(var),
+            "rms": math.sqrt(math.fsum(x * x for x in values) / n), "min": min(values), "max": max(values)}
+
+
+@pytest.mark.parametrize("resync", [1 << 16, 7])
+def test_matches_brute_force(monkeypatch, resync):
+    monkeypatch.setattr(rolling, 'RESYNC_EVICTIONS', resync)
+    rng = random.Random(resync)
+    window = RollingWindow(0.5)
+    samples, t = [], 0.0
+    for _ in range(3000):
+        # Irregular spacing with repeated timestamps, and an offset that makes naive sums lose precision
+        t += rng.choice((0.0, 0.001, 0.01, 0.05))
+        x = 1000.0 + rng.gauss(0.0, 1.0)
+        samples.append((t, x))
+        window.push(t, x)
+        expected = _brute(samples, t, 0.5)
+        assert window.count == expected["count"]
+        assert window.min == expected["min"] and window.max == expected["max"]
+        for stat in ('mean', 'std', 'rms'):
+            assert getattr(window, stat) == pytest.approx(expected[stat], rel=1e-6, abs=1e-6)
+
+
+def test_window_empties_to_the_newest_sample_after_a_gap():
+    window = RollingWindow(1.0)
+    for i in range(10):
+        window.push(i * 0.1, float(i))
+    window.push(10.0, -5.0)
+    assert window.count == 1
+    assert window.min == window.max == window.mean == window.last == -5.0
+    assert window.std == pytest.approx(0.0, abs=1e-6)
+
+
+def test_rolling_stats_pushes_every_channel():
+    stats = RollingStats(1.0, ('a', 'b'))
+    stats.push(0.0, (1.0, 10.0))
+    stats.push(0.5, (3.0, 30.0))
+    summary = stats.summary()
+    assert summary['a']['mean'] == 2.0
+    assert summary['b']['max'] == 30.0
+    stats.clear()
+    assert stats['a'].count == 0
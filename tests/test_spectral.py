@@ -0,0 +1,59 @@
+# test_spectral.py
+import math
+
+import numpy as np
+import pytest
+
+from birdie.game.spectral import SlidingSpectrum, band_bins
+
+BANDS = ((1.0, 10.0), (10.0, 40.0), (40.0, 500.0))
+
+
+def _run(spectrum, signal):
+    for x in signal:
+        spectrum.push(x)
+    return spectrum.energies
+
+
+@pytest.mark.parametrize("freq, band", [(80.0, 2), (160.0, 2)])
+def test_sine_energy_lands_in_its_band(freq, band):
+    rate = 1000.0
+    spectrum = SlidingSpectrum(rate, bands_hz=BANDS, window_s=0.064, hop_s=0.004)
+    t = np.arange(512) / rate
+    amplitude = 0.7
+    energies = _run(spectrum, (0.3 + amplitude * np.sin(2 * math.pi * freq * t))[:, None])
+    # A^2 / 2 in the sine's band, the DC offset removed, little leakage elsewhere
+    assert energies[0, band] == pytest.approx(amplitude ** 2 / 2, rel=0.05)
+    assert energies[0, :band].sum() < 0.05 * energies[0, band]
+    assert spectrum.band_rms(0, band) == pytest.approx(amplitude / math.sqrt(2), rel=0.03)
+
+
+def test_updates_once_per_hop_after_the_window_fills():
+    spectrum = SlidingSpectrum(1000.0, channels=2, bands_hz=BANDS, window_s=0.032, hop_s=0.004)
+    assert (spectrum.window_n, spectrum.hop) == (32, 4)
+    updates = [spectrum.push((0.0, 1.0)) for _ in range(64)]
+    assert not any(updates[:31])
+    assert sum(updates) == spectrum.frames == 1 + (64 - 32) // 4
+
+
+def test_matches_a_direct_fft():
+    rate = 500.0
+    spectrum = SlidingSpectrum(rate, bands_hz=BANDS, window_s=0.064, hop_s=0.002)
+    rng = np.random.default_rng(0)
+    signal = rng.normal(size=100)
+    energies = _run(spectrum, signal[:, None])
+    n = spectrum.window_n
+    frame = signal[-n:] - signal[-n:].mean()
+    power = np.abs(np.fft.rfft(frame * spectrum.window)) ** 2
+    freqs = np.fft.rfftfreq(n, 1.0 / rate)
+    weight = np.full(len(freqs), 2.0)
+    weight[0] = weight[-1] = 1.0
+    weight /= n * np.sum(spectrum.window ** 2)
+    expected = [np.sum((power * weight)[(freqs >= lo) & (freqs < hi)]) for lo, hi in BANDS]
+    assert np.allclose(energies[0], expected)
+
+
+def test_band_bins_follows_the_window():
+    # 100 Hz: an 8-sample window has a single bin (50 Hz) in the impact band
+    assert band_bins(100.0, BANDS[-1]) == 1
+    assert band_bins(1000.0, BANDS[-1]) == 14
@@ -0,0 +1,64 @@
+# test_store.py
+import sqlite3
+
+from birdie.game import store
+from birdie.game.store import ShotStore
+
+
+def _shot(shots, player, hole, stroke, holed=False, ts=None, **kwargs):
+    shots.record_shot('s1', player, hole, stroke, 'socket', 0.5, 0.7, (10.0, 20.0), (30.0, 40.0),
+                      holed, [(10.0, 20.0), (30.0, 40.0)], ts=ts, **kwargs)
+
+
+def test_flush_commits_every_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, 'WRITE_BATCH_SIZE', 4)
+    shots = ShotStore(str(tmp_path / 'shots.sqlite'))
+    shots.start()
+    for i in range(10):
+        _shot(shots, player=i % 2, hole=1, stroke=i, ts=1000.0 + i)
+    assert shots.flush(timeout=5.0)
+    assert len(shots.hole_shots(1)) == 10
+    shots.close()
+
+
+def test_player_and_hole_queries(tmp_path):
+    shots = ShotStore(str(tmp_path / 'shots.sqlite'))
+    shots.start()
+    _shot(shots, player=0, hole=1, stroke=1, ts=1002.0)
+    _shot(shots, player=0, hole=1, stroke=0, ts=1001.0)
+    _shot(shots, player=0, hole=2, stroke=0, ts=1003.0, holed=True,
+          device='AA:BB:CC:DD:EE:FF', recording='session.jsonl', recording_offset=1234)
+    _shot(shots, player=1, hole=1, stroke=0, ts=1004.0)
+    shots.record_hole('s1', 0, 1, 4, 3)
+    shots.record_hole('s1', 1, 1, 2, 3)
+    shots.close()
+
+    assert [s["stroke"] for s in shots.player_shots(0, hole=1)] == [0, 1]   # oldest first
+    assert len(shots.player_shots(0)) == 3
+    holed = shots.player_shots(0, hole=2)[0]
+    assert holed["holed"] == 1
+    assert (holed["device"], holed["recording"], holed["recording_offset"]) == \
+        ('AA:BB:CC:DD:EE:FF', 'session.jsonl', 1234)
+
+    rows = shots.hole_shots(1)
+    assert [r["player"] for r in rows] == [0, 0, 1]
+    assert rows[0]["path"] == [(10.0, 20.0), (30.0, 40.0)]
+    assert rows[0]["device"] is None
+    assert [r["id"] for r in shots.hole_shots(1, since_id=rows[1]["id"])] == [rows[2]["id"]]
+
+    assert [(player, strokes) for _, player, strokes, _, _ in shots.hole_leaderboard(1)] == [(1, 2), (0, 4)]
+
+
+def test_older_database_gains_the_new_columns(tmp_path):
+    path = str(tmp_path / 'shots.sqlite')
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE shots (id INTEGER PRIMARY KEY, ts REAL NOT NULL, session TEXT NOT NULL, "
+                     "player INTEGER NOT NULL, hole INTEGER NOT NULL, stroke INTEGER NOT NULL, "
+                     "control_mode TEXT NOT NULL, angle REAL NOT NULL, power REAL NOT NULL, "
+                     "start_x REAL, start_y REAL, rest_x REAL, rest_y REAL, holed INTEGER NOT NULL, path BLOB)")
+    conn.close()
+    shots = ShotStore(path)
+    shots.start()
+    _shot(shots, player=0, hole=1, stroke=0, device='club')
+    shots.close()
+    assert shots.player_shots(0)[0]["device"] == 'club'
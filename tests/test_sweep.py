@@ -0,0 +1,23 @@
+# test_sweep.py
+from birdie.corpus import summarize
+from birdie.sweep import pareto_front
+
+
+def _result(latencies_s, false=0):
+    return {"samples": 1000, "duration_s": 60.0, "elapsed_s": 0.1, "strikes": len(latencies_s),
+            "hits": len(latencies_s), "false": false, "unmatched": 0, "labels": {"putt": len(latencies_s)},
+            "fired": {"putt": len(latencies_s)}, "latencies_s": latencies_s, "power_errors": []}
+
+
+def test_early_shots_count_as_timing_error():
+    s = summarize([_result([-0.02, -0.02, -0.02, 0.0])])
+    assert s['early'] == 3
+    assert s['latency_ms']['median'] < 0
+    assert s['timing_error_ms']['median'] == 20.0
+
+
+def test_pareto_front_does_not_prefer_firing_before_contact():
+    on_time = summarize([_result([0.0] * 10)])
+    early = summarize([_result([-0.02] * 10)])
+    points = [(s['timing_error_ms']['p90'], s['false_per_min']) for s in (on_time, early)]
+    assert pareto_front(points) == [0]
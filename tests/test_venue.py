@@ -0,0 +1,23 @@
+# test_venue.py
+from birdie.server.venue import VenueBridge
+
+
+def _sample(seq):
+    return {"device": "club", "seq": seq, "accelerometer": {"x": 0.0, "y": 0.0, "z": 1.0},
+            "gyroscope_rate": {"x": 0.0, "y": 0.0, "z": 0.0}}
+
+
+def _loss(seqs):
+    bridge = VenueBridge(socketio=None, bays={})
+    for seq in seqs:
+        bridge(_sample(seq))
+    return bridge.bays['club'].summary(1.0, 0.0)['loss']
+
+
+def test_loss_counts_skipped_sequence_numbers():
+    assert _loss([0, 1, 2, 5, 6, 7, 8, 9]) == 2 / 10
+
+
+def test_loss_after_a_reboot_counts_from_the_new_sequence():
+    # The club reboots after seq 5000 and then loses every other packet
+    assert _loss(list(range(4990, 5001)) + list(range(0, 100, 2))) == 49 / (61 + 49)